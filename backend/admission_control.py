@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청 속도 제한 / 우선순위 기반 수락 제어 (ASGI 미들웨어)
+
+- 라우트 분류: ingest (저장/일괄 저장/복습 항목 등록, 낮은 우선순위) / read (검색·추천 등 학생 요청)
+- 클라이언트(등록된 X-API-Key, 아니면 IP) × 분류별 토큰 버킷 → 초과 시 429 + Retry-After
+- 과부하 시 ingest 먼저 차단: 처리 중인 ingest 수나 전체 처리 중 요청 수가 상한을 넘으면
+  ingest 는 429 로 돌려보내고 read 는 계속 받음 (대량 임포트 중에도 검색 지연 유지)
+- ingest 는 본문 크기(Content-Length)에 비례해 토큰을 더 씀 (큰 배치 1건 ≈ 작은 요청 여러 건)
+
+임포터 쪽은 scripts/import_runner.py 의 post_with_retry 가 Retry-After 만큼 기다렸다 재시도합니다.
+
+환경 변수:
+    LEARNING_ADMISSION_ENABLED      0 이면 비활성화 (기본 1)
+    LEARNING_READ_RATE / _BURST     read 초당 토큰 / 버킷 크기 (기본 50 / 100)
+    LEARNING_INGEST_RATE / _BURST   ingest 초당 토큰 / 버킷 크기 (기본 10 / 20)
+    LEARNING_MAX_INGEST_IN_FLIGHT   동시에 처리할 ingest 요청 수 (기본 4)
+    LEARNING_OVERLOAD_IN_FLIGHT     전체 처리 중 요청이 이 이상이면 ingest 차단 (기본 64)
+    LEARNING_API_KEYS               클라이언트 구분에 쓸 X-API-Key 목록 (쉼표 구분, 목록에 없는 키는 IP 로 구분)
+"""
+
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from metrics import counter
+
+logger = logging.getLogger(__name__)
+
+ROUTE_READ = "read"
+ROUTE_INGEST = "ingest"
+
+ADMISSION_ENABLED = os.getenv("LEARNING_ADMISSION_ENABLED", "1") != "0"
+READ_RATE = float(os.getenv("LEARNING_READ_RATE", "50"))
+READ_BURST = float(os.getenv("LEARNING_READ_BURST", "100"))
+INGEST_RATE = float(os.getenv("LEARNING_INGEST_RATE", "10"))
+INGEST_BURST = float(os.getenv("LEARNING_INGEST_BURST", "20"))
+MAX_INGEST_IN_FLIGHT = int(os.getenv("LEARNING_MAX_INGEST_IN_FLIGHT", "4"))
+OVERLOAD_IN_FLIGHT = int(os.getenv("LEARNING_OVERLOAD_IN_FLIGHT", "64"))
+# ingest 는 이 크기마다 토큰 1개 추가
+INGEST_COST_BYTES = 256 * 1024
+# 과부하로 차단할 때 알려줄 대기 시간 (초)
+OVERLOAD_RETRY_AFTER = 1
+# 토큰 버킷을 유지할 최대 클라이언트 수 (오래 안 쓴 것부터 제거)
+MAX_TRACKED_CLIENTS = 10000
+# 임의의 키로 새 버킷을 받거나 다른 클라이언트 버킷을 밀어내지 못하도록 등록된 키만 인정
+API_KEYS = frozenset(key.strip() for key in os.getenv("LEARNING_API_KEYS", "").split(",") if key.strip())
+
+INGEST_PATHS = ("/api/v1/learning/store", "/api/v1/learning/reviews/items")
+EXEMPT_PATHS = ("/metrics", "/api/v1/debug/", "/docs", "/openapi.json")
+
+ADMISSION_REJECTED = counter(
+    "learning_admission_rejected_total", "수락 제어로 거절한 요청 수 (rate: 토큰 부족, overload: 과부하 차단)",
+    ("route_class", "reason"))
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """요청 분류 (None: 제한 대상 아님)"""
+    if path == "/" or path.startswith(EXEMPT_PATHS):
+        return None
+    if method == "POST" and path.startswith(INGEST_PATHS):
+        return ROUTE_INGEST
+    return ROUTE_READ
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, cost: float, now: float) -> float:
+        """토큰을 쓰고 0 반환, 부족하면 쓰지 않고 기다려야 할 초 반환"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        cost = min(cost, self.burst)
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+class AdmissionController:
+    """클라이언트별 토큰 버킷 + 분류별 처리 중 요청 수 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, read_rate: float = READ_RATE, read_burst: float = READ_BURST,
+                 ingest_rate: float = INGEST_RATE, ingest_burst: float = INGEST_BURST,
+                 max_ingest_in_flight: int = MAX_INGEST_IN_FLIGHT, overload_in_flight: int = OVERLOAD_IN_FLIGHT):
+        self.limits = {ROUTE_READ: (read_rate, read_burst), ROUTE_INGEST: (ingest_rate, ingest_burst)}
+        self.max_ingest_in_flight = max_ingest_in_flight
+        self.overload_in_flight = overload_in_flight
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.in_flight = {ROUTE_READ: 0, ROUTE_INGEST: 0}
+        self.admitted = {ROUTE_READ: 0, ROUTE_INGEST: 0}
+        self.rejected = {(ROUTE_READ, "rate"): 0, (ROUTE_INGEST, "rate"): 0, (ROUTE_INGEST, "overload"): 0}
+
+    def _bucket(self, client: str, kind: str, now: float) -> TokenBucket:
+        key = (client, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*self.limits[kind], now)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def admit(self, client: str, kind: str, cost: float = 1.0,
+              now: Optional[float] = None) -> Tuple[bool, int, str]:
+        """(수락 여부, Retry-After 초, 거절 사유)"""
+        now = time.monotonic() if now is None else now
+        if kind == ROUTE_INGEST:
+            # 우선순위: 처리 중 요청이 많으면 토큰과 상관없이 ingest 부터 차단
+            if (self.in_flight[ROUTE_INGEST] >= self.max_ingest_in_flight
+                    or sum(self.in_flight.values()) >= self.overload_in_flight):
+                return self._reject(kind, "overload", OVERLOAD_RETRY_AFTER)
+        wait = self._bucket(client, kind, now).take(cost, now)
+        if wait > 0:
+            return self._reject(kind, "rate", max(1, math.ceil(wait)))
+        self.in_flight[kind] += 1
+        self.admitted[kind] += 1
+        return True, 0, ""
+
+    def _reject(self, kind: str, reason: str, retry_after: int) -> Tuple[bool, int, str]:
+        self.rejected[(kind, reason)] = self.rejected.get((kind, reason), 0) + 1
+        ADMISSION_REJECTED.inc(1, kind, reason)
+        return False, retry_after, reason
+
+    def release(self, kind: str):
+        self.in_flight[kind] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": dict(self.in_flight),
+            "admitted": dict(self.admitted),
+            "rejected": {f"{kind}.{reason}": count for (kind, reason), count in self.rejected.items()},
+            "trackedClients": len(self._buckets),
+            "limits": {kind: {"rate": rate, "burst": burst} for kind, (rate, burst) in self.limits.items()},
+            "maxIngestInFlight": self.max_ingest_in_flight,
+            "overloadInFlight": self.overload_in_flight,
+        }
+
+def _client_id(scope, api_keys: frozenset = API_KEYS) -> str:
+    if api_keys:
+        for key, value in scope.get("headers", []):
+            if key == b"x-api-key" and value:
+                api_key = value.decode("latin-1")
+                if api_key in api_keys:
+                    return "key:" + api_key
+                break
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+def _content_length(scope) -> int:
+    for key, value in scope.get("headers", []):
+        if key == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return 0
+    return 0
+
+class AdmissionControlMiddleware:
+    """요청 수락 제어 (순수 ASGI, 거절은 앱에 들어가기 전에 429)"""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None, enabled: bool = ADMISSION_ENABLED):
+        self.app = app
+        self.controller = controller if controller is not None else AdmissionController()
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        kind = route_class(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        if not self.enabled or kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        cost = 1.0
+        if kind == ROUTE_INGEST:
+            cost += _content_length(scope) // INGEST_COST_BYTES
+        client = _client_id(scope)
+        admitted, retry_after, reason = self.controller.admit(client, kind, cost)
+        if not admitted:
+            await self._reject(send, retry_after, reason)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(kind)
+
+    @staticmethod
+    async def _reject(send, retry_after: int, reason: str):
+        detail = "요청이 너무 많습니다." if reason == "rate" else "서버가 바쁩니다. 저장 요청은 잠시 후 다시 시도하세요."
+        body = json.dumps({"detail": detail, "reason": reason, "retryAfter": retry_after}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
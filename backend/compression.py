@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+응답 압축 미들웨어 (순수 ASGI)
+
+검색/EBS 응답처럼 한글 본문이 많은 JSON을 VPS → Vercel 구간에서 압축해 보냅니다.
+starlette의 GZipMiddleware 대신 직접 구현한 이유:
+
+- Accept-Encoding 협상: zstd > br > gzip (설치된 라이브러리만, q=0 존중)
+- 임계값(LEARNING_COMPRESSION_MIN_SIZE, 기본 1024바이트) 미만은 그대로 전송
+- 캐시 가능한 응답(ETag 또는 public/max-age)은 압축 결과를 LRU 캐시에 보관
+- NDJSON(application/x-ndjson) 응답은 청크마다 flush 하며 스트리밍 압축
+- 이미 Content-Encoding 이 있는 응답(StaticResponse 등)은 건드리지 않음
+
+zstandard / brotli 패키지는 선택 사항이며, 없으면 gzip만 사용합니다.
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("LEARNING_COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 동적 응답용 (정적 응답은 최고 품질로 미리 압축)
+ZSTD_LEVEL = 3
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+# 스트리밍이 아닌 응답도 이 크기를 넘게 버퍼링되면 스트리밍 압축으로 전환
+STREAM_SWITCH_BYTES = 1024 * 1024
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DYNAMIC_PREFERENCE = ("zstd", "br", "gzip", "identity")
+
+def available_encodings() -> List[str]:
+    encodings = ["gzip", "identity"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding → {인코딩: q값} ("*"는 명시되지 않은 인코딩에 적용)"""
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+def negotiate_encoding(header: Optional[str], available: List[str],
+                       preference: Tuple[str, ...] = DYNAMIC_PREFERENCE) -> str:
+    """사용 가능한 인코딩 중 클라이언트가 받는 가장 선호되는 인코딩"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*")
+    for encoding in preference:
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, wildcard if wildcard is not None else (1.0 if encoding == "identity" else 0.0))
+        if q > 0:
+            return encoding
+    return "identity"
+
+class StreamCompressor:
+    """인코딩별 스트리밍 압축기 (compress: 청크마다 flush, finish: 마무리)"""
+
+    def __init__(self, encoding: str, gzip_level: int = GZIP_LEVEL,
+                 brotli_quality: int = BROTLI_QUALITY, zstd_level: int = ZSTD_LEVEL):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        else:
+            raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        if self.encoding == "gzip":
+            out = self._obj.compress(data)
+            return out + self._obj.flush(zlib.Z_SYNC_FLUSH) if flush else out
+        if self.encoding == "br":
+            out = self._obj.process(data)
+            return out + self._obj.flush() if flush else out
+        out = self._obj.compress(data)
+        return out + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+def compress_bytes(data: bytes, encoding: str, **levels) -> bytes:
+    compressor = StreamCompressor(encoding, **levels)
+    return compressor.compress(data, flush=False) + compressor.finish()
+
+class CompressedCache:
+    """(인코딩, 본문 키) → 압축 바이트 LRU (스레드 안전)"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Tuple[str, str], data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+def _is_cacheable(status: int, headers: List[Tuple[bytes, bytes]]) -> bool:
+    if status != 200:
+        return False
+    cache_control = (_header(headers, b"cache-control") or "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return _header(headers, b"etag") is not None or "max-age" in cache_control or "public" in cache_control
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    # 인코딩이 다르면 다른 표현이므로 강한 ETag도 달라야 함
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+class CompressionMiddleware:
+    """응답 압축 ASGI 미들웨어"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, gzip_level: int = GZIP_LEVEL,
+                 brotli_quality: int = BROTLI_QUALITY, zstd_level: int = ZSTD_LEVEL,
+                 cache: Optional[CompressedCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip_level": gzip_level, "brotli_quality": brotli_quality, "zstd_level": zstd_level}
+        self.encodings = available_encodings()
+        self.cache = cache if cache is not None else CompressedCache()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+class _CompressingResponder:
+    """응답 1건의 send 래퍼"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Dict[str, Any]] = None
+        self.mode: Optional[str] = None  # "passthrough" / "buffer" / "stream"
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def send(self, message: Dict[str, Any]):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = message.get("headers", [])
+            content_type = (_header(headers, b"content-type") or "").lower()
+            if _header(headers, b"content-encoding") is not None or message["status"] in (204, 304):
+                self.mode = "passthrough"
+                await self._send(message)
+            elif content_type.startswith(NDJSON_MEDIA_TYPE):
+                self.mode = "stream"
+            else:
+                self.mode = "buffer"
+            return
+
+        if message["type"] != "http.response.body" or self.mode == "passthrough":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode == "buffer":
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if more_body and self.buffered < STREAM_SWITCH_BYTES:
+                return
+            if not more_body:
+                await self._send_buffered()
+                return
+            # 큰 스트리밍 응답: 지금까지 버퍼링한 내용부터 스트리밍 압축
+            self.mode = "stream"
+            body, self.buffer = b"".join(self.buffer), []
+
+        if self.compressor is None:
+            await self._start_compressed(streaming=True)
+            self.compressor = StreamCompressor(self.encoding, **self.middleware.levels)
+        data = self.compressor.compress(body, flush=True) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_buffered(self):
+        body = b"".join(self.buffer)
+        self.buffer = []
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        headers = self.start.get("headers", [])
+        cache_key = None
+        if _is_cacheable(self.start["status"], headers):
+            etag = _header(headers, b"etag")
+            cache_key = (self.encoding, etag or hashlib.blake2b(body, digest_size=16).hexdigest())
+            compressed = self.middleware.cache.get(cache_key)
+        else:
+            compressed = None
+
+        if compressed is None:
+            compressed = compress_bytes(body, self.encoding, **self.middleware.levels)
+            if cache_key is not None:
+                self.middleware.cache.put(cache_key, compressed)
+
+        if len(compressed) >= len(body):
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        await self._start_compressed(streaming=False, length=len(compressed))
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _start_compressed(self, streaming: bool, length: Optional[int] = None):
+        headers = []
+        vary_values = []
+        for key, value in self.start.get("headers", []):
+            name = key.lower()
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary_values.append(value.decode("latin-1"))
+                continue
+            if name == b"etag":
+                value = _encoded_etag(value.decode("latin-1"), self.encoding).encode("latin-1")
+            headers.append((key, value))
+
+        if not any("accept-encoding" in v.lower() for v in vary_values):
+            vary_values.append("Accept-Encoding")
+        headers.append((b"vary", ", ".join(vary_values).encode("latin-1")))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if not streaming and length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+
+        await self._send({**self.start, "headers": headers})
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 압축 바이너리 포맷 (.mkmc)
+
+들여쓰기 JSON 대신 한 파일에 전체 코퍼스를 담는 열(column) 기반 포맷입니다.
+mmap으로 열어 복사 없이(zero-copy) 읽습니다.
+
+레이아웃 (리틀 엔디언, 각 섹션 8바이트 정렬):
+    header    HEADER 구조체
+    offsets   uint64 × (count + 1)   레코드 시작 위치 (records 섹션 기준)
+    vectors   float32 × count × 4    vector_4d (S, L, K, M), 없으면 NaN
+    codes     uint16 × count × 2     subject 코드, difficulty 코드
+    meta      UTF-8 JSON             코드 사전 등
+    records   compact UTF-8 JSON     레코드 본문 (ensure_ascii=False)
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"MKMC"
+FORMAT_VERSION = 2
+# 코드 열 typecode (uint16)
+CODE_TYPECODE = "H"
+MAX_CODES = 0xFFFF
+VECTOR_FIELDS = ("S", "L", "K", "M")
+# magic, version, flags, count, dim, offsets_pos, vectors_pos, codes_pos, meta_pos, meta_len, records_pos
+HEADER = struct.Struct("<4sHHIIQQQQQQ")
+PACKED_SUFFIX = ".mkmc"
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+def _dump_record(item: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(item)
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _load_record(raw) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw).decode("utf-8"))
+
+def _vector_values(item: Dict[str, Any]) -> List[float]:
+    vector = item.get("vector_4d")
+    if not isinstance(vector, dict):
+        return [math.nan] * len(VECTOR_FIELDS)
+    values = []
+    for field in VECTOR_FIELDS:
+        try:
+            values.append(float(vector.get(field)))
+        except (TypeError, ValueError):
+            values.append(math.nan)
+    return values
+
+def write_packed_content(items: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """
+    학습 콘텐츠를 .mkmc 파일로 저장 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+    Args:
+        items: 학습 콘텐츠 dict 이터러블 (한 번만 순회)
+        output_path: 출력 경로
+
+    Returns:
+        저장한 레코드 수
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    offsets = array("Q", [0])
+    vectors = array("f")
+    subject_codes = array(CODE_TYPECODE)
+    difficulty_codes = array(CODE_TYPECODE)
+    code_tables: Dict[str, List[str]] = {"subjects": [], "difficulties": []}
+    code_index: Dict[str, Dict[str, int]] = {table: {} for table in code_tables}
+
+    def code_for(table: str, value: Any) -> int:
+        value = str(value or "")
+        codes = code_index[table]
+        code = codes.get(value)
+        if code is None:
+            if len(codes) >= MAX_CODES:
+                raise ValueError(f"{table} 값 종류가 너무 많습니다 (최대 {MAX_CODES}개)")
+            code = codes[value] = len(codes)
+            code_tables[table].append(value)
+        return code
+
+    # 레코드 본문은 크기를 모르므로 임시 파일에 먼저 스트리밍
+    with tempfile.TemporaryFile(dir=output_path.parent) as records_file:
+        position = 0
+        for item in items:
+            raw = _dump_record(item)
+            records_file.write(raw)
+            position += len(raw)
+            offsets.append(position)
+            vectors.extend(_vector_values(item))
+            subject_codes.append(code_for("subjects", item.get("subject")))
+            difficulty_codes.append(code_for("difficulties", item.get("difficulty")))
+
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            vectors.byteswap()
+            subject_codes.byteswap()
+            difficulty_codes.byteswap()
+
+        count = len(subject_codes)
+        meta = json.dumps(code_tables, ensure_ascii=False).encode("utf-8")
+
+        offsets_pos = _align(HEADER.size)
+        vectors_pos = _align(offsets_pos + len(offsets) * 8)
+        codes_pos = _align(vectors_pos + len(vectors) * 4)
+        meta_pos = _align(codes_pos + count * 2 * subject_codes.itemsize)
+        records_pos = _align(meta_pos + len(meta))
+
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            def write_at(pos: int, data: bytes):
+                f.write(b"\0" * (pos - f.tell()))
+                f.write(data)
+
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, len(VECTOR_FIELDS),
+                                offsets_pos, vectors_pos, codes_pos, meta_pos, len(meta), records_pos))
+            write_at(offsets_pos, offsets.tobytes())
+            write_at(vectors_pos, vectors.tobytes())
+            write_at(codes_pos, subject_codes.tobytes() + difficulty_codes.tobytes())
+            write_at(meta_pos, meta)
+            write_at(records_pos, b"")
+            records_file.seek(0)
+            while True:
+                chunk = records_file.read(1 << 20)
+                if not chunk:
+                    break
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+
+    return count
+
+class PackedContentReader:
+    """
+    .mkmc 파일 리더 (mmap 기반, 레코드는 접근할 때만 디코딩)
+
+    vectors / subject_codes / difficulty_codes 는 mmap을 그대로 가리키는 memoryview 입니다.
+    """
+
+    def __init__(self, path: Path):
+        if sys.byteorder != "little":
+            raise ValueError("PackedContentReader는 리틀 엔디언 환경만 지원합니다.")
+
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _flags, self.count, self.dim, offsets_pos, self._vectors_pos,
+         codes_pos, meta_pos, meta_len, self._records_pos) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 콘텐츠 파일입니다: {self.path}")
+
+        view = memoryview(self._mm)
+        self._offsets = view[offsets_pos:offsets_pos + (self.count + 1) * 8].cast("Q")
+        vector_bytes = view[self._vectors_pos:self._vectors_pos + self.count * self.dim * 4]
+        self.vectors = vector_bytes.cast("f", (self.count, self.dim)) if self.count else vector_bytes.cast("f")
+        code_bytes = self.count * array(CODE_TYPECODE).itemsize
+        self.subject_codes = view[codes_pos:codes_pos + code_bytes].cast(CODE_TYPECODE)
+        self.difficulty_codes = view[codes_pos + code_bytes:codes_pos + code_bytes * 2].cast(CODE_TYPECODE)
+        self.meta = json.loads(bytes(view[meta_pos:meta_pos + meta_len]).decode("utf-8"))
+        self._view = view
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "PackedContentReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._records_pos + self._offsets[index], self._records_pos + self._offsets[index + 1]
+
+    def raw(self, index: int) -> memoryview:
+        """레코드 원본 JSON 바이트 (복사 없음)"""
+        start, end = self._span(index)
+        return self._view[start:end]
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return _load_record(self.raw(index))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.count):
+            yield self[index]
+
+    def find(self, needle: str, rows: Optional[Iterable[int]] = None) -> Iterator[int]:
+        """
+        원본 바이트에서 부분 문자열이 들어있는 레코드 번호 반환 (디코딩 없이 mmap.find 사용)
+
+        JSON 키 이름 등 본문 외 영역도 매칭되므로, 호출 측에서 디코딩 후 최종 확인해야 합니다.
+        """
+        pattern = needle.encode("utf-8")
+        for index in (range(self.count) if rows is None else rows):
+            start, end = self._span(index)
+            if self._mm.find(pattern, start, end) != -1:
+                yield index
+
+    def rows_with_subject(self, subject: str) -> List[int]:
+        subjects = self.meta.get("subjects", [])
+        if subject not in subjects:
+            return []
+        code = subjects.index(subject)
+        return [i for i, value in enumerate(self.subject_codes) if value == code]
+
+    def vector_array(self):
+        """vector_4d 열을 numpy 배열로 (복사 없음, numpy 없으면 memoryview)"""
+        if np is None:
+            return self.vectors
+        return np.frombuffer(self._mm, dtype="<f4", count=self.count * self.dim,
+                             offset=self._vectors_pos).reshape(self.count, self.dim)
+
+    def close(self):
+        for name in ("vectors", "subject_codes", "difficulty_codes", "_offsets", "_view"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # numpy 배열 등 외부에서 아직 참조 중이면 GC 시 해제
+            pass
+        self._file.close()
+
+def read_json_content(path: Path) -> List[Dict[str, Any]]:
+    """JSON 콘텐츠 파일 로드 (리스트 파일 또는 단일 레코드 파일)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 저장소 WAL (Write-Ahead Log)
+
+레코드를 먼저 로그에 추가하고 fsync 한 뒤 개별 JSON 파일로 반영합니다.
+여러 레코드를 한 번에 추가하면 fsync 1회로 함께 커밋됩니다 (group commit).
+
+레코드 형식 (한 줄에 1개):
+    <crc32 8자리 hex> <compact JSON>\n
+
+마지막 줄이 잘려 있거나 CRC가 맞지 않으면 그 지점에서 재생을 멈춥니다
+(쓰기 도중 중단된 꼬리 레코드는 커밋되지 않은 것으로 간주).
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, List, Any, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ContentWriteAheadLog:
+    """추가 전용 로그 파일 (단일 writer 스레드에서만 사용)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        data = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return b"%08x " % zlib.crc32(data) + data + b"\n"
+
+    def append(self, records: List[Dict[str, Any]]):
+        """레코드 묶음 추가 후 fsync 1회 (반환 시점에 디스크에 커밋됨, 실패하면 추가 전 길이로 되돌림)"""
+        position = self._file.tell()
+        try:
+            self._file.write(b"".join(self._encode(record) for record in records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception:
+            # 잘린 레코드가 남으면 재생이 거기서 멈춰 이후 커밋까지 잃으므로 잘라냄
+            try:
+                self._file.truncate(position)
+                self._file.seek(position)
+            except OSError as e:
+                logger.error(f"WAL 되돌리기 실패 ({self.path}): {e}")
+            raise
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """커밋된 레코드 순회 (손상된 꼬리 레코드 이후는 무시)"""
+        with open(self.path, "rb") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+                    logger.warning(f"WAL 꼬리 레코드 손상 ({self.path}:{line_no}), 이후 레코드 무시")
+                    return
+                data = line[9:-1]
+                try:
+                    valid = int(line[:8], 16) == zlib.crc32(data)
+                except ValueError:
+                    valid = False
+                if not valid:
+                    logger.warning(f"WAL CRC 불일치 ({self.path}:{line_no}), 이후 레코드 무시")
+                    return
+                yield json.loads(data.decode("utf-8"))
+
+    def reset(self):
+        """체크포인트 이후 로그 비우기"""
+        self._file.truncate(0)
+        self._file.seek(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
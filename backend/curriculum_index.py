@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+커리큘럼 맵 인덱스
+
+curriculum_map.json 을 한 번만 읽어 ID 기반 조회 테이블을 만듭니다.
+(주제→단원→학년, 주제→선수 주제, 키워드→주제)
+
+API 서버와 scripts/ 양쪽에서 공유하며, 파일이 바뀌지 않는 한
+같은 인덱스 인스턴스를 재사용하므로 요청마다 JSON 파싱 비용이 없습니다.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 학년 순서 (선수 주제 계산용)
+GRADE_ORDER = ["초6", "중1", "중2", "중3", "고1", "고2", "고3"]
+
+# 선수 주제 이름 매칭 최소 길이 ("함수" 같은 짧은 이름이 모든 주제에 걸리는 것 방지)
+MIN_PREREQUISITE_NAME_LENGTH = 3
+
+# 숫자 학년 → 학년 라벨 (클라이언트는 중학교 1~3학년을 1~3으로 보냄, 학제 순서 7~12도 허용)
+NUMERIC_GRADES = {1: "중1", 2: "중2", 3: "중3", 6: "초6", 7: "중1", 8: "중2", 9: "중3", 10: "고1", 11: "고2", 12: "고3"}
+
+def normalize_grade(grade: Any) -> Optional[str]:
+    """학년 표기 통일 ("중2", 2, "2", "2학년" → "중2" / 알 수 없으면 None)"""
+    if isinstance(grade, bool) or grade is None:
+        return None
+    if isinstance(grade, int):
+        return NUMERIC_GRADES.get(grade)
+    text = str(grade).strip().replace(" ", "")
+    if text in GRADE_ORDER:
+        return text
+    if text.endswith("학년"):
+        text = text[:-2]
+    if text.isdigit():
+        return NUMERIC_GRADES.get(int(text))
+    return None
+
+def _grade_rank(grade: str) -> int:
+    return GRADE_ORDER.index(grade) if grade in GRADE_ORDER else len(GRADE_ORDER)
+
+class CurriculumIndex:
+    """커리큘럼 맵 ID 기반 조회 인덱스"""
+
+    def __init__(self, curriculum_map: Dict[str, Any]):
+        self.curriculum_map = curriculum_map
+        # grade_id("math.중2") → 학년 레코드
+        self.grades: Dict[str, Dict[str, Any]] = {}
+        # unit_id("math.중2.u03") → 단원 레코드
+        self.units: Dict[str, Dict[str, Any]] = {}
+        # topic_id("math.중2.u03.t02") → 주제 레코드
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self.topic_unit: Dict[str, str] = {}
+        self.unit_grade: Dict[str, str] = {}
+        self.prerequisites: Dict[str, List[str]] = {}
+        self.keyword_topics: Dict[str, List[str]] = {}
+        # (subject, 단원명) → unit_id 리스트 (여러 학년에 같은 단원명 존재)
+        self.unit_names: Dict[Tuple[str, str], List[str]] = {}
+        self._build()
+
+    @classmethod
+    def from_file(cls, map_path: Path) -> "CurriculumIndex":
+        with open(map_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _build(self):
+        for subject, grades in self.curriculum_map.get("subjects", {}).items():
+            for grade, grade_data in grades.items():
+                grade_id = f"{subject}.{grade}"
+                unit_ids = []
+                for unit_no, unit in enumerate(grade_data.get("units", []), start=1):
+                    unit_id = f"{grade_id}.u{unit_no:02d}"
+                    unit_name = unit.get("unit", "")
+                    topic_ids = []
+                    for topic_no, topic_name in enumerate(unit.get("topics", []), start=1):
+                        topic_id = f"{unit_id}.t{topic_no:02d}"
+                        self.topics[topic_id] = {
+                            "id": topic_id,
+                            "topic": topic_name,
+                            "unitId": unit_id,
+                            "order": topic_no,
+                        }
+                        self.topic_unit[topic_id] = unit_id
+                        topic_ids.append(topic_id)
+                        self._add_keywords(topic_id, topic_name, unit_name)
+
+                    self.units[unit_id] = {
+                        "id": unit_id,
+                        "unit": unit_name,
+                        "subject": subject,
+                        "grade": grade,
+                        "gradeId": grade_id,
+                        "order": unit_no,
+                        "topicIds": topic_ids,
+                    }
+                    self.unit_grade[unit_id] = grade_id
+                    self.unit_names.setdefault((subject, unit_name), []).append(unit_id)
+                    unit_ids.append(unit_id)
+
+                self.grades[grade_id] = {
+                    "id": grade_id,
+                    "subject": subject,
+                    "grade": grade,
+                    "unitIds": unit_ids,
+                }
+
+        self._build_prerequisites()
+        logger.info(f"커리큘럼 인덱스 구축: 학년 {len(self.grades)}개, 단원 {len(self.units)}개, 주제 {len(self.topics)}개")
+
+    def _add_keywords(self, topic_id: str, topic_name: str, unit_name: str):
+        keywords = {topic_name.lower(), unit_name.lower()}
+        for name in (topic_name, unit_name):
+            keywords.update(token.lower() for token in name.split() if len(token) >= 2)
+        for keyword in keywords:
+            if keyword:
+                self.keyword_topics.setdefault(keyword, []).append(topic_id)
+
+    def _build_prerequisites(self):
+        """
+        선수 주제 계산 (커리큘럼 맵에 명시 데이터가 없으므로 구조에서 유도)
+
+        - 같은 단원의 직전 주제
+        - 이전 학년 중 가장 가까운 학년의 같은 이름 주제/단원,
+          또는 이름이 현재 주제명에 포함된 주제 (예: 중3 "이차방정식" → 고1 "이차방정식과 이차함수")
+        """
+        # (subject, 이름) → [(학년 순위, topic_id)]
+        by_name: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        for topic_id, topic in self.topics.items():
+            unit = self.units[topic["unitId"]]
+            by_name.setdefault((unit["subject"], topic["topic"]), []).append((_grade_rank(unit["grade"]), topic_id))
+
+        for topic_id, topic in self.topics.items():
+            unit = self.units[topic["unitId"]]
+            subject = unit["subject"]
+            rank = _grade_rank(unit["grade"])
+            prerequisites: List[str] = []
+
+            if topic["order"] > 1:
+                prerequisites.append(unit["topicIds"][topic["order"] - 2])
+
+            best_rank = -1
+            earlier: List[str] = []
+            for (name_subject, name), candidates in by_name.items():
+                if name_subject != subject or len(name) < MIN_PREREQUISITE_NAME_LENGTH:
+                    continue
+                if name != topic["topic"] and name != unit["unit"] and name not in topic["topic"]:
+                    continue
+                for candidate_rank, candidate_id in candidates:
+                    if candidate_rank >= rank:
+                        continue
+                    if candidate_rank > best_rank:
+                        best_rank, earlier = candidate_rank, [candidate_id]
+                    elif candidate_rank == best_rank and candidate_id not in earlier:
+                        earlier.append(candidate_id)
+
+            self.prerequisites[topic_id] = prerequisites + earlier
+
+    # ---- 조회 API (모두 dict 조회, O(1)) ----
+
+    def grade_units(self, subject: str, grade: str) -> List[Dict[str, Any]]:
+        """원본 커리큘럼 맵 형식의 단원 리스트 (과목/학년 없으면 빈 리스트)"""
+        return self.curriculum_map.get("subjects", {}).get(subject, {}).get(grade, {}).get("units", [])
+
+    def grade_tree(self, subject: str, grade: str) -> Optional[Dict[str, Any]]:
+        """학년의 단원/주제 트리 (ID 포함)"""
+        grade_record = self.grades.get(f"{subject}.{grade}")
+        if not grade_record:
+            return None
+        return {
+            **grade_record,
+            "units": [
+                {**self.units[unit_id], "topics": [self.topics[t] for t in self.units[unit_id]["topicIds"]]}
+                for unit_id in grade_record["unitIds"]
+            ],
+        }
+
+    def topic_detail(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        """주제 + 소속 단원/학년 + 선수 주제"""
+        topic = self.topics.get(topic_id)
+        if not topic:
+            return None
+        unit = self.units[self.topic_unit[topic_id]]
+        return {
+            **topic,
+            "unit": unit["unit"],
+            "subject": unit["subject"],
+            "grade": unit["grade"],
+            "gradeId": unit["gradeId"],
+            "prerequisites": [self.topics[p] for p in self.prerequisites.get(topic_id, [])],
+        }
+
+    def topics_for_keyword(self, keyword: str) -> List[str]:
+        return self.keyword_topics.get(keyword.strip().lower(), [])
+
+    def find_units(self, subject: str, unit_name: str) -> List[str]:
+        return self.unit_names.get((subject, unit_name), [])
+
+    def summary(self) -> Dict[str, Any]:
+        subjects: Dict[str, List[str]] = {}
+        for grade_record in self.grades.values():
+            subjects.setdefault(grade_record["subject"], []).append(grade_record["grade"])
+        return {
+            "version": self.curriculum_map.get("version"),
+            "createdAt": self.curriculum_map.get("createdAt"),
+            "source": self.curriculum_map.get("source"),
+            "statistics": self.curriculum_map.get("statistics", {}),
+            "subjects": subjects,
+        }
+
+# 경로별 인덱스 캐시: path → ((mtime_ns, size), index)
+_index_cache: Dict[str, Tuple[Tuple[int, int], CurriculumIndex]] = {}
+_index_lock = threading.Lock()
+
+def get_curriculum_index(map_path: Path) -> Optional[CurriculumIndex]:
+    """
+    커리큘럼 인덱스 조회 (파일이 바뀌었을 때만 다시 파싱)
+
+    Returns:
+        인덱스 (파일이 없으면 None)
+    """
+    try:
+        stat = map_path.stat()
+    except FileNotFoundError:
+        return None
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(map_path.resolve())
+    cached = _index_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        index = CurriculumIndex.from_file(map_path)
+        _index_cache[key] = (signature, index)
+        return index
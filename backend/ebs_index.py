@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EBS 콘텐츠 보조 인덱스 ((학년, 과목, 단원) → 순서 있는 섹션 목록)
+
+/api/v1/learning/ebs 가 저장소 전체를 훑지 않도록, 저장 시점에
+ebsCurriculum/grade/chapter/section 필드로 인덱스를 갱신합니다.
+
+- 단원 조회: 단원 번호 또는 단원명 → dict 조회 O(1)
+- 섹션은 (섹션 번호, 제목) 순으로 정렬 유지 (bisect 삽입)
+- 구조화 필드가 없는 예전 임포트 데이터는 ebsCurriculum("EBS 중1 math")과
+  topic("중1 소인수분해 - 소인수분해의 활용")에서 학년/단원/섹션 제목을 추출
+"""
+
+import bisect
+import re
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+import logging
+
+from curriculum_index import normalize_grade
+
+logger = logging.getLogger(__name__)
+
+EBS_CURRICULUM_PREFIX = "EBS "
+# 번호 없는 단원/섹션은 번호 있는 것 뒤에 제목 순으로
+UNNUMBERED = 1 << 30
+
+_LEGACY_TOPIC = re.compile(r"^(?P<grade>\S+)\s+(?P<chapter>.+?)\s+-\s+(?P<section>.+)$")
+
+def _number(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+def ebs_location(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """EBS 콘텐츠의 (학년, 과목, 단원, 섹션) 위치 / EBS 콘텐츠가 아니면 None"""
+    curriculum = str(item.get("ebsCurriculum") or "")
+    if not curriculum.startswith(EBS_CURRICULUM_PREFIX):
+        return None
+    subject = item.get("subject")
+    parts = curriculum[len(EBS_CURRICULUM_PREFIX):].split()
+    grade = normalize_grade(item.get("grade")) or (normalize_grade(parts[0]) if parts else None)
+    if not subject or not grade:
+        return None
+
+    chapter_title = item.get("chapterTitle")
+    section_title = item.get("sectionTitle")
+    if not chapter_title:
+        match = _LEGACY_TOPIC.match(str(item.get("topic", "")))
+        if match and normalize_grade(match.group("grade")) == grade:
+            chapter_title = match.group("chapter")
+            section_title = section_title or match.group("section")
+
+    return {
+        "grade": grade,
+        "subject": subject,
+        "chapter": _number(item.get("chapter")),
+        "chapterTitle": chapter_title or "",
+        "section": _number(item.get("section")),
+        "sectionTitle": section_title or item.get("topic", ""),
+    }
+
+class _Chapter:
+    def __init__(self, number: Optional[int], title: str):
+        self.number = number
+        self.title = title
+        # [(정렬 키, content_id)] - 항상 정렬 상태
+        self.entries: List[Tuple[Tuple[int, str, str], str]] = []
+
+    @property
+    def sort_key(self) -> Tuple[int, str]:
+        return (self.number if self.number is not None else UNNUMBERED, self.title)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"chapter": self.number, "title": self.title, "sections": len(self.entries)}
+
+class EbsContentIndex:
+    """(학년, 과목, 단원) 보조 인덱스"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = threading.Event()
+        self._queue_lock = threading.Lock()
+        self._queued: List[Dict[str, Any]] = []
+        self._reset()
+
+    def _reset(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        # content_id → (학년/과목 키, 단원 키, 정렬 항목)
+        self._placement: Dict[str, Tuple[Tuple[str, str], str, Tuple[Tuple[int, str, str], str]]] = {}
+        # (학년, 과목) → {단원 키: 단원}
+        self._chapters: Dict[Tuple[str, str], Dict[str, _Chapter]] = {}
+        # (학년, 과목) → 단원 순서 (단원 키 리스트, 변경 시에만 다시 정렬)
+        self._chapter_order: Dict[Tuple[str, str], List[str]] = {}
+        # (학년, 과목, 번호 또는 제목) → 단원 키
+        self._aliases: Dict[Tuple[str, str, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ---- 갱신 ----
+
+    def rebuild(self, items: Iterable[Dict[str, Any]]):
+        """저장소 전체로 인덱스 구축 (구축 중 들어온 upsert는 끝난 뒤 이어서 반영)"""
+        with self._lock:
+            self._reset()
+            for item in items:
+                self._upsert(item)
+            with self._queue_lock:
+                for item in self._queued:
+                    self._upsert(item)
+                self._queued = []
+                self.ready.set()
+        logger.info(f"✅ EBS 인덱스 구축: {len(self.items)}개, 학년/과목 {len(self._chapters)}개")
+
+    def upsert(self, item: Dict[str, Any]):
+        with self._queue_lock:
+            if not self.ready.is_set():
+                self._queued.append(item)
+                return
+        with self._lock:
+            self._upsert(item)
+
+    def queued(self) -> int:
+        """구축이 끝나기 전 대기 중인 upsert 수"""
+        with self._queue_lock:
+            return len(self._queued)
+
+    def _upsert(self, item: Dict[str, Any]):
+        content_id = item.get("id")
+        if not content_id:
+            return
+        location = ebs_location(item)
+        self._remove(content_id)
+        if location is None:
+            return
+
+        group = (location["grade"], location["subject"])
+        chapters = self._chapters.setdefault(group, {})
+        if location["chapter"] is not None:
+            chapter_key = str(location["chapter"])
+        else:
+            # 번호 없는 예전 데이터는 같은 제목의 번호 있는 단원에 합침
+            chapter_key = self._aliases.get(
+                (*group, location["chapterTitle"].strip().lower()), f"t:{location['chapterTitle']}"
+            )
+        chapter = chapters.get(chapter_key)
+        if chapter is None:
+            chapter = chapters[chapter_key] = _Chapter(location["chapter"], location["chapterTitle"])
+            self._chapter_order.pop(group, None)
+        elif location["chapterTitle"] and chapter.title != location["chapterTitle"]:
+            chapter.title = location["chapterTitle"]
+            self._chapter_order.pop(group, None)
+        self._add_aliases(group, chapter_key, chapter)
+
+        section = location["section"]
+        entry = ((section if section is not None else UNNUMBERED, location["sectionTitle"], content_id), content_id)
+        bisect.insort(chapter.entries, entry)
+        self._placement[content_id] = (group, chapter_key, entry)
+        self.items[content_id] = item
+
+    def _add_aliases(self, group: Tuple[str, str], chapter_key: str, chapter: _Chapter):
+        grade, subject = group
+        if chapter.number is not None:
+            self._aliases[(grade, subject, str(chapter.number))] = chapter_key
+        if chapter.title:
+            self._aliases[(grade, subject, chapter.title.strip().lower())] = chapter_key
+
+    def _remove(self, content_id: str):
+        placement = self._placement.pop(content_id, None)
+        if placement is None:
+            return
+        group, chapter_key, entry = placement
+        chapter = self._chapters[group][chapter_key]
+        index = bisect.bisect_left(chapter.entries, entry)
+        if index < len(chapter.entries) and chapter.entries[index] == entry:
+            del chapter.entries[index]
+        if not chapter.entries:
+            del self._chapters[group][chapter_key]
+            self._chapter_order.pop(group, None)
+            grade, subject = group
+            for alias in (str(chapter.number), chapter.title.strip().lower()):
+                if self._aliases.get((grade, subject, alias)) == chapter_key:
+                    del self._aliases[(grade, subject, alias)]
+        self.items.pop(content_id, None)
+
+    # ---- 조회 ----
+
+    def _ordered_chapters(self, group: Tuple[str, str]) -> List[_Chapter]:
+        chapters = self._chapters.get(group, {})
+        order = self._chapter_order.get(group)
+        if order is None:
+            order = sorted(chapters, key=lambda key: chapters[key].sort_key)
+            self._chapter_order[group] = order
+        return [chapters[key] for key in order]
+
+    def chapters(self, grade: Any, subject: str) -> List[Dict[str, Any]]:
+        """학년/과목의 단원 목록 (단원 순서)"""
+        label = normalize_grade(grade)
+        with self._lock:
+            return [chapter.describe() for chapter in self._ordered_chapters((label, subject))]
+
+    def sections(self, grade: Any, subject: str, chapter: Optional[str] = None,
+                 offset: int = 0, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """
+        단원(번호 또는 제목)의 섹션을 순서대로 offset/limit 만큼
+
+        chapter 가 없으면 학년/과목 전체를 단원 → 섹션 순으로. 없는 단원이면 None.
+        """
+        label = normalize_grade(grade)
+        group = (label, subject)
+        with self._lock:
+            if chapter is not None:
+                chapter_key = self._aliases.get((label, subject, chapter.strip().lower()))
+                if chapter_key is None:
+                    return None
+                selected = [self._chapters[group][chapter_key]]
+            else:
+                selected = self._ordered_chapters(group)
+
+            total = sum(len(c.entries) for c in selected)
+            page: List[Dict[str, Any]] = []
+            skip = offset
+            for current in selected:
+                if len(page) >= limit:
+                    break
+                if skip >= len(current.entries):
+                    skip -= len(current.entries)
+                    continue
+                for _, content_id in current.entries[skip:skip + limit - len(page)]:
+                    page.append(self.items[content_id])
+                skip = 0
+
+            return {
+                "grade": label,
+                "subject": subject,
+                "chapter": selected[0].describe() if chapter is not None else None,
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "hasMore": offset + len(page) < total,
+                "contents": page,
+            }
@@ -7,21 +7,70 @@ VPS 기반 학습 정보 시스템 API 서버
 EBS 교과과정 기반 영어/수학 대량 데이터 제공
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.responses import StreamingResponse, Response, PlainTextResponse, JSONResponse
+from pydantic import ValidationError
+from typing import Optional, Dict, Any
 import json
 import os
-import hashlib
+import hmac
+import asyncio
+import threading
 from pathlib import Path
 from datetime import datetime
 import logging
 
+from curriculum_index import get_curriculum_index, normalize_grade
+from static_responses import StaticResponse
+from compression import CompressionMiddleware, CompressedCache, NDJSON_MEDIA_TYPE
+import metrics
+from metrics import MetricsMiddleware, Timer, SERIALIZATION_SECONDS, STORE_WRITES
+from learning_models import (
+    LearningContentItem, StoreBatchRequest, StoreResponse, StoreBatchResponse,
+    LearningSearchRequest, LearningSearchResponse, PersonalizedRecommendationRequest,
+    ReviewRecordRequest, ReviewItemRequest, ReviewState, ReviewDueResponse
+)
+from review_scheduler import ReviewScheduler, SnapshotWriter
+from recommendation_engine import RecommendationEngine
+from ebs_index import EbsContentIndex, ebs_location
+from single_flight import SingleFlight
+from admission_control import AdmissionControlMiddleware, AdmissionController
+from sampling_profiler import run_profile, collapsed_text, ProfilerBusy, DEFAULT_HZ, MAX_HZ, MAX_SECONDS
+from learning_content_store import (
+    create_content_store, LEARNING_CONTENT_STORAGE,
+    STATUS_CREATED, STATUS_UPDATED, STATUS_UNCHANGED
+)
+
+try:
+    # orjson이 있으면 응답 직렬화/대용량 요청 파싱에 사용
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="MKM Study Learning Content API", version="1.0.0")
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """_dumps 로 직렬화하는 JSON 응답 (fastapi 의 ORJSONResponse 는 폐기 예정이라 직접 구현)"""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+app = FastAPI(title="MKM Study Learning Content API", version="1.0.0", default_response_class=FastJSONResponse)
+
+# 클라이언트별 속도 제한 + 과부하 시 저장(ingest) 요청부터 429
+# (가장 안쪽 → 거절 응답에도 CORS 헤더가 붙고 메트릭에 집계됨)
+_admission = AdmissionController()
+app.add_middleware(AdmissionControlMiddleware, controller=_admission)
 
 # CORS 설정
 app.add_middleware(
@@ -32,10 +81,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (zstd/br/gzip 협상, LEARNING_COMPRESSION_MIN_SIZE 미만은 그대로)
+_compressed_cache = CompressedCache()
+app.add_middleware(CompressionMiddleware, cache=_compressed_cache)
+
+# 요청 지연 메트릭 (가장 바깥 → 압축/전송 시간까지 포함)
+app.add_middleware(MetricsMiddleware)
+
 # 학습 콘텐츠 저장 경로 (VPS)
-LEARNING_CONTENT_DIR = Path("/var/www/mkm-study/learning-content")
+LEARNING_CONTENT_DIR = LEARNING_CONTENT_STORAGE
 LEARNING_CONTENT_DIR.mkdir(parents=True, exist_ok=True)
 
+# 학습 콘텐츠 저장소 백엔드 (file: JSON 파일, sqlite: SQLite + FTS5)
+LEARNING_STORE_BACKEND = os.getenv("LEARNING_STORE_BACKEND", "file")
+
+# 운영 진단용 프로파일러 토큰 (비어 있으면 /api/v1/debug/* 비활성화)
+LEARNING_API_DEBUG_TOKEN = os.getenv("LEARNING_API_DEBUG_TOKEN", "")
+
+# 커리큘럼 맵 경로 (scripts/build_curriculum_map.py 결과물)
+CURRICULUM_MAP_PATH = Path(os.getenv("CURRICULUM_MAP_PATH", str(LEARNING_CONTENT_DIR / "curriculum" / "curriculum_map.json")))
+
 # 체질별 학습 스타일 데이터
 CONSTITUTION_LEARNING_STYLES = {
     "태양인": {
@@ -142,119 +207,213 @@ BRAIN_SCIENCE_TECHNIQUES = {
     }
 }
 
-# Pydantic 모델
-class Vector4D(BaseModel):
-    S: float
-    L: float
-    K: float
-    M: float
-
-class LearningSearchRequest(BaseModel):
-    query: str
-    subject: Optional[str] = None
-    constitution: Optional[str] = None
-    vector_4d: Optional[Vector4D] = None
-    limit: int = 10
-
-class PersonalizedRecommendationRequest(BaseModel):
-    constitution: str
-    vector_4d: Vector4D
-    subject: str
-
 @app.get("/")
 async def root():
     return {"message": "MKM Study Learning Content API", "version": "1.0.0"}
 
+# 고정 카탈로그 응답 (시작 시 한 번 직렬화/압축, ETag + 304)
+_CONSTITUTION_RESPONSES = {
+    name: StaticResponse(style) for name, style in CONSTITUTION_LEARNING_STYLES.items()
+}
+_MEMORY_TECHNIQUES_RESPONSE = StaticResponse({"techniques": list(BRAIN_SCIENCE_TECHNIQUES.values())})
+
 @app.get("/api/v1/learning/constitution/{constitution}")
-async def get_constitution_learning_style(constitution: str):
+async def get_constitution_learning_style(constitution: str, request: Request):
     """체질별 학습 스타일 조회"""
-    if constitution not in CONSTITUTION_LEARNING_STYLES:
+    if constitution not in _CONSTITUTION_RESPONSES:
         raise HTTPException(status_code=404, detail=f"체질 '{constitution}'을 찾을 수 없습니다.")
     
-    return CONSTITUTION_LEARNING_STYLES[constitution]
+    return _CONSTITUTION_RESPONSES[constitution].respond(request)
 
-# 학습 콘텐츠 저장소 (실제로는 File-Based Memory System 사용)
-LEARNING_CONTENT_STORAGE = Path("/var/www/mkm-study/learning-content")
-LEARNING_CONTENT_STORAGE.mkdir(parents=True, exist_ok=True)
+def _require_curriculum_index():
+    index = get_curriculum_index(CURRICULUM_MAP_PATH)
+    if index is None:
+        raise HTTPException(status_code=404, detail="커리큘럼 맵이 없습니다. build_curriculum_map.py를 먼저 실행하세요.")
+    return index
 
-class LearningContentStore:
-    """학습 콘텐츠 저장소 (File-Based)"""
+@app.get("/api/v1/learning/curriculum")
+async def get_curriculum(
+    subject: Optional[str] = Query(None, description="과목 (math 또는 english)"),
+    grade: Optional[str] = Query(None, description="학년 (중1, 중2, 중3, 고1, 고2)"),
+    keyword: Optional[str] = Query(None, description="키워드로 주제 조회")
+):
+    """커리큘럼 맵 조회 (메모리 인덱스, 파일 변경 시에만 재로드)"""
+    index = _require_curriculum_index()
+    
+    if keyword:
+        return {
+            "keyword": keyword,
+            "topics": [index.topic_detail(topic_id) for topic_id in index.topics_for_keyword(keyword)]
+        }
     
-    def __init__(self):
-        self.storage_dir = LEARNING_CONTENT_STORAGE
-        self.storage_dir.mkdir(parents=True, exist_ok=True)
+    if subject and grade:
+        tree = index.grade_tree(subject, grade)
+        if not tree:
+            raise HTTPException(status_code=404, detail=f"커리큘럼을 찾을 수 없습니다: {subject} {grade}")
+        return tree
     
-    def store(self, content_data: Dict[str, Any]) -> str:
-        """학습 콘텐츠 저장"""
-        content_id = hashlib.md5(
-            f"{content_data.get('topic', '')}_{content_data.get('subject', '')}_{datetime.now().isoformat()}".encode()
-        ).hexdigest()
-        
-        content_data["id"] = content_id
-        content_data["createdAt"] = datetime.now().isoformat()
-        content_data["updatedAt"] = datetime.now().isoformat()
-        
-        # JSON 파일로 저장
-        file_path = self.storage_dir / f"{content_id}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(content_data, f, ensure_ascii=False, indent=2)
-        
-        return content_id
+    if subject:
+        grade_ids = [g for g in index.grades.values() if g["subject"] == subject]
+        if not grade_ids:
+            raise HTTPException(status_code=404, detail=f"과목 '{subject}'을 찾을 수 없습니다.")
+        return {"subject": subject, "grades": [index.grade_tree(subject, g["grade"]) for g in grade_ids]}
     
-    def search(self, query: str, subject: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """학습 콘텐츠 검색 (간단한 텍스트 매칭)"""
-        results = []
-        
-        # 모든 JSON 파일 검색
-        for json_file in self.storage_dir.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    content = json.load(f)
-                
-                # 간단한 텍스트 매칭 (실제로는 벡터 검색 사용)
-                if query.lower() in content.get('topic', '').lower() or \
-                   query.lower() in content.get('content', '').lower():
-                    
-                    if subject and content.get('subject') != subject:
-                        continue
-                    
-                    results.append(content)
-            except Exception as e:
-                logger.warning(f"파일 읽기 실패 ({json_file}): {e}")
-                continue
-        
-        # 관련도 순으로 정렬 (간단한 점수 계산)
-        results.sort(key=lambda x: (
-            query.lower() in x.get('topic', '').lower(),
-            len(x.get('content', ''))
-        ), reverse=True)
-        
-        return results[:limit]
-
-# 전역 저장소 인스턴스
-_content_store = LearningContentStore()
-
-@app.post("/api/v1/learning/store")
-async def store_learning_content(content_data: Dict[str, Any]):
+    return index.summary()
+
+@app.get("/api/v1/learning/curriculum/topics/{topic_id}")
+async def get_curriculum_topic(topic_id: str):
+    """주제 상세 조회 (소속 단원/학년, 선수 주제 포함)"""
+    index = _require_curriculum_index()
+    detail = index.topic_detail(topic_id)
+    if not detail:
+        raise HTTPException(status_code=404, detail=f"주제 '{topic_id}'을 찾을 수 없습니다.")
+    return detail
+
+# 전역 저장소 인스턴스 (LEARNING_STORE_BACKEND: file 또는 sqlite)
+_content_store = create_content_store(LEARNING_STORE_BACKEND, LEARNING_CONTENT_DIR)
+
+# 복습 스케줄러 (스냅샷에서 복원, 변경 시 주기적으로 저장)
+REVIEW_SNAPSHOT_PATH = Path(os.getenv("LEARNING_REVIEW_SNAPSHOT", str(LEARNING_CONTENT_DIR / "reviews" / "review_state.bin")))
+_review_scheduler = ReviewScheduler()
+if _review_scheduler.load_snapshot(REVIEW_SNAPSHOT_PATH):
+    logger.info(f"✅ 복습 스냅샷 복원: {len(_review_scheduler)}개 상태")
+_review_snapshots = SnapshotWriter(_review_scheduler, REVIEW_SNAPSHOT_PATH)
+
+# 맞춤 추천 색인 / EBS (학년, 과목, 단원) 인덱스
+# 저장소 전체를 백그라운드에서 한 번 읽어 구축하고(파일 저장소의 본문 해시 인덱스도 같은 순회로),
+# 이후에는 저장 API에서 증분 갱신
+_recommender = RecommendationEngine(lambda: get_curriculum_index(CURRICULUM_MAP_PATH))
+_ebs_index = EbsContentIndex()
+
+def _build_indexes():
+    ebs_items = []
+
+    def items():
+        for item in _content_store.scan_items():
+            if ebs_location(item) is not None:
+                ebs_items.append(item)
+            yield item
+
+    _recommender.rebuild(items())
+    _ebs_index.rebuild(ebs_items)
+
+threading.Thread(target=_build_indexes, name="content-indexes", daemon=True).start()
+
+# 수집 시점에 읽는 대기열/캐시 게이지
+metrics.gauge("learning_store_pending_writes", "커밋 대기 중인 저장 요청 수",
+              callback=lambda: {(): _content_store.pending_writes()})
+metrics.gauge("learning_index_queued_upserts", "보조 인덱스 구축 중 대기 중인 upsert 수", ("index",),
+              callback=lambda: {("recommendation",): _recommender.queued(), ("ebs",): _ebs_index.queued()})
+metrics.gauge("learning_admission_in_flight", "분류별 처리 중인 요청 수", ("route_class",),
+              callback=lambda: {(kind,): count for kind, count in _admission.in_flight.items()})
+metrics.gauge("learning_compression_cache_lookups", "압축 응답 캐시 조회 수 (누적)", ("result",),
+              callback=lambda: {("hit",): _compressed_cache.hits, ("miss",): _compressed_cache.misses})
+
+_event_loop_monitor: Optional[asyncio.Task] = None
+
+# 동시에 들어온 같은 검색은 저장소 스캔 1회로 합침 (스캔은 스레드에서 → 이벤트 루프를 막지 않음)
+_search_flight = SingleFlight("search")
+
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    """이벤트 루프 지연 측정 시작"""
+    global _event_loop_monitor
+    _event_loop_monitor = asyncio.create_task(metrics.monitor_event_loop())
+
+def _index_stored(data: Dict[str, Any], content_id: str):
+    """새로 저장/변경된 콘텐츠를 보조 인덱스에 반영"""
+    item = {**data, "id": content_id}
+    _recommender.upsert(item)
+    _ebs_index.upsert(item)
+
+@app.on_event("shutdown")
+def close_content_store():
+    """대기 중인 저장 요청 커밋 후 WAL 체크포인트, 복습 스냅샷 저장"""
+    if _event_loop_monitor is not None:
+        _event_loop_monitor.cancel()
+    _content_store.close()
+    _review_snapshots.close()
+
+@app.post("/api/v1/learning/store", response_model=StoreResponse)
+async def store_learning_content(content: LearningContentItem):
     """학습 콘텐츠 저장"""
     try:
-        content_id = _content_store.store(content_data)
-        logger.info(f"학습 콘텐츠 저장 완료: {content_id}")
-        return {"success": True, "content_id": content_id}
+        data = content.to_store()
+        content_id, status = await asyncio.wrap_future(_content_store.submit(data))
+        STORE_WRITES.inc(1, status)
+        if status != STATUS_UNCHANGED:
+            _index_stored(data, content_id)
+        logger.info(f"학습 콘텐츠 저장 완료: {content_id} ({status})")
+        return {"success": True, "content_id": content_id, "status": status}
     except Exception as e:
         logger.error(f"학습 콘텐츠 저장 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/learning/search")
-async def search_learning_content(request: LearningSearchRequest):
-    """학습 콘텐츠 검색 (체질별 맞춤)"""
+@app.post(
+    "/api/v1/learning/store/batch",
+    response_model=StoreBatchResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {
+        "schema": StoreBatchRequest.model_json_schema()
+    }}}}
+)
+async def store_learning_content_batch(request: Request):
+    """
+    학습 콘텐츠 일괄 저장 (임포터용, {"items": [...]})
+
+    대용량 본문을 orjson으로 직접 파싱하고, 항목별로 검증해 잘못된 항목만 errors에 담습니다.
+    """
+    try:
+        items = StoreBatchRequest.model_validate(_loads(await request.body())).items
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"items 리스트가 필요합니다: {e}")
+
+    content_ids = []
+    statuses = {STATUS_CREATED: 0, STATUS_UPDATED: 0, STATUS_UNCHANGED: 0}
+    errors = []
+    # 모두 제출한 뒤 한꺼번에 대기 → 같은 WAL 커밋(fsync)에 묶임
+    pending = []
+    for index, raw_item in enumerate(items):
+        try:
+            content = LearningContentItem.model_validate(raw_item)
+        except ValidationError as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        data = content.to_store()
+        pending.append((index, data, asyncio.wrap_future(_content_store.submit(data))))
+
+    for index, data, future in pending:
+        try:
+            content_id, status = await future
+            content_ids.append(content_id)
+            statuses[status] += 1
+            STORE_WRITES.inc(1, status)
+            if status != STATUS_UNCHANGED:
+                _index_stored(data, content_id)
+        except Exception as e:
+            logger.error(f"학습 콘텐츠 저장 실패: {e}")
+            errors.append({"index": index, "error": str(e)})
+
+    logger.info(f"학습 콘텐츠 일괄 저장 완료: {len(content_ids)}/{len(items)}개 {statuses}")
+    return FastJSONResponse({
+        "success": not errors,
+        "stored": len(content_ids),
+        "content_ids": content_ids,
+        "statuses": statuses,
+        "errors": errors
+    })
+
+@app.post("/api/v1/learning/search", response_model=LearningSearchResponse)
+async def search_learning_content(request: LearningSearchRequest, http_request: Request):
+    """학습 콘텐츠 검색 (체질별 맞춤)
+
+    Accept: application/x-ndjson 이면 결과를 한 줄에 하나씩 스트리밍합니다.
+    """
     logger.info(f"학습 콘텐츠 검색: query={request.query}, subject={request.subject}, constitution={request.constitution}")
     
-    # File-Based Memory System에서 검색
-    results = _content_store.search(
-        query=request.query,
-        subject=request.subject,
-        limit=request.limit
+    # File-Based Memory System에서 검색 (같은 검색이 진행 중이면 그 결과를 함께 사용)
+    results = await _search_flight.do(
+        (request.query, request.subject, request.limit),
+        lambda: asyncio.to_thread(_content_store.search, query=request.query, subject=request.subject, limit=request.limit)
     )
     
     # 체질별 필터링 (있는 경우)
@@ -262,79 +421,171 @@ async def search_learning_content(request: LearningSearchRequest):
         # 체질별 맞춤 로직 (향후 구현)
         pass
     
-    return {"results": results}
+    if NDJSON_MEDIA_TYPE in http_request.headers.get("accept", ""):
+        # 클라이언트가 첫 결과부터 렌더링할 수 있도록 줄 단위 스트리밍 (압축도 줄 단위 flush)
+        return StreamingResponse((_dumps(item) + b"\n" for item in results), media_type=NDJSON_MEDIA_TYPE)
+
+    # 검색 결과는 저장소에서 읽은 JSON 그대로이므로 검증/jsonable_encoder 없이 바로 직렬화
+    with Timer(SERIALIZATION_SECONDS, "search"):
+        return FastJSONResponse({"results": results})
 
 @app.get("/api/v1/learning/memory-techniques")
-async def get_memory_techniques(subject: Optional[str] = None):
+async def get_memory_techniques(request: Request, subject: Optional[str] = None):
     """최신 암기 기법 조회"""
-    techniques = list(BRAIN_SCIENCE_TECHNIQUES.values())
-    
     if subject:
         # 과목별 맞춤 기법 필터링 (향후 구현)
         pass
     
-    return {"techniques": techniques}
+    return _MEMORY_TECHNIQUES_RESPONSE.respond(request)
 
 @app.get("/api/v1/learning/ebs")
 async def get_ebs_content(
-    grade: int = Query(..., description="학년"),
+    grade: str = Query(..., description="학년 (중2 또는 숫자 2)"),
     subject: str = Query(..., description="과목 (math 또는 english)"),
-    chapter: Optional[str] = None
+    chapter: Optional[str] = Query(None, description="단원 번호 또는 단원명"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
 ):
-    """EBS 교과과정 기반 학습 콘텐츠 조회"""
-    # TODO: 실제 EBS 데이터베이스 연동
-    # 현재는 더미 데이터 반환
-    
+    """EBS 교과과정 기반 학습 콘텐츠 조회 (단원 → 섹션 순, 페이지 단위)"""
     logger.info(f"EBS 콘텐츠 조회: grade={grade}, subject={subject}, chapter={chapter}")
     
-    # 더미 데이터
-    contents = [
-        {
-            "id": f"ebs_{subject}_{grade}_001",
-            "subject": subject,
-            "topic": f"{grade}학년 {subject} 1단원",
-            "content": f"{grade}학년 {subject} 교과과정 내용...",
-            "difficulty": "medium",
-            "ebsCurriculum": f"EBS {grade}학년 {subject}",
-            "createdAt": datetime.now().isoformat(),
-            "updatedAt": datetime.now().isoformat()
-        }
-    ]
+    if normalize_grade(grade) is None:
+        raise HTTPException(status_code=400, detail=f"학년 '{grade}'을 알 수 없습니다.")
+    if not _ebs_index.ready.is_set():
+        raise HTTPException(status_code=503, detail="EBS 인덱스를 구축하는 중입니다.", headers={"Retry-After": "5"})
     
-    return {"contents": contents}
+    page = _ebs_index.sections(grade, subject, chapter, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail=f"단원 '{chapter}'을 찾을 수 없습니다.")
+    return page
+
+@app.get("/api/v1/learning/ebs/chapters")
+async def get_ebs_chapters(
+    grade: str = Query(..., description="학년 (중2 또는 숫자 2)"),
+    subject: str = Query(..., description="과목 (math 또는 english)")
+):
+    """EBS 학년/과목의 단원 목록 (섹션 수 포함)"""
+    if normalize_grade(grade) is None:
+        raise HTTPException(status_code=400, detail=f"학년 '{grade}'을 알 수 없습니다.")
+    if not _ebs_index.ready.is_set():
+        raise HTTPException(status_code=503, detail="EBS 인덱스를 구축하는 중입니다.", headers={"Retry-After": "5"})
+    return {"grade": normalize_grade(grade), "subject": subject, "chapters": _ebs_index.chapters(grade, subject)}
 
 @app.post("/api/v1/learning/personalized")
 async def get_personalized_recommendation(request: PersonalizedRecommendationRequest):
-    """체질별 맞춤 학습 추천"""
-    # TODO: 4D 벡터 기반 맞춤 추천 알고리즘 구현
-    # 현재는 체질별 기본 추천 반환
-    
-    logger.info(f"맞춤 추천: constitution={request.constitution}, subject={request.subject}, vector_4d={request.vector_4d}")
+    """체질별 맞춤 학습 추천 (4D 벡터 + 체질 선호 + 과목 + 커리큘럼 위치 점수)"""
+    logger.info(f"맞춤 추천: constitution={request.constitution}, subject={request.subject}, grade={request.grade}, unit={request.unit}")
     
     # 체질별 학습 스타일 조회
     style = CONSTITUTION_LEARNING_STYLES.get(request.constitution)
     if not style:
         raise HTTPException(status_code=404, detail=f"체질 '{request.constitution}'을 찾을 수 없습니다.")
+    if not _recommender.ready.is_set():
+        raise HTTPException(status_code=503, detail="추천 색인을 구축하는 중입니다.", headers={"Retry-After": "5"})
     
-    # 더미 추천 데이터
+    ranked = _recommender.recommend(
+        request.constitution,
+        request.subject,
+        request.vector_4d.model_dump(),
+        grade=request.grade,
+        unit=request.unit,
+        limit=request.limit
+    )
     recommendations = [
-        {
-            "id": f"personalized_{request.constitution}_{request.subject}_001",
-            "subject": request.subject,
-            "topic": f"{request.constitution} 맞춤 {request.subject} 학습",
-            "content": f"{style['preferredMethod']}을 활용한 {request.subject} 학습 콘텐츠...",
-            "difficulty": "medium",
-            "constitution": request.constitution,
-            "memoryTechnique": style["memoryTechnique"],
-            "brainScience": "spaced_repetition",
-            "ebsCurriculum": f"EBS {request.subject}",
-            "createdAt": datetime.now().isoformat(),
-            "updatedAt": datetime.now().isoformat()
-        }
+        {**item, "memoryTechnique": style["memoryTechnique"], "brainScience": "spaced_repetition"}
+        for item in ranked
     ]
     
     return {"recommendations": recommendations}
 
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+@app.post("/api/v1/learning/reviews/items", response_model=ReviewState)
+async def add_review_item(request: ReviewItemRequest):
+    """학습한 문항을 복습 스케줄에 등록 (1일 후 첫 복습)"""
+    return _review_scheduler.add_item(request.studentId, request.itemId, _timestamp(request.learnedAt))
+
+@app.post("/api/v1/learning/reviews/record", response_model=ReviewState)
+async def record_review(request: ReviewRecordRequest):
+    """복습 결과 기록 (맞히면 1→3→7→14→30일, 틀리면 1일로)"""
+    return _review_scheduler.record_review(
+        request.studentId, request.itemId, request.correct, _timestamp(request.reviewedAt)
+    )
+
+@app.get("/api/v1/learning/reviews/stats")
+async def get_review_stats():
+    """복습 스케줄러 상태 수/힙 크기"""
+    return _review_scheduler.stats()
+
+@app.get("/api/v1/learning/reviews/{student_id}/due", response_model=ReviewDueResponse)
+async def get_due_reviews(
+    student_id: str,
+    limit: int = Query(20, ge=1, le=500),
+    include_upcoming: bool = Query(False, description="아직 복습 시각이 안 된 문항도 due 순으로 포함")
+):
+    """다음 복습 문항 (due 순, 학생별 힙에서 O(limit log n))"""
+    items = _review_scheduler.due_items(student_id, limit=limit + 1, include_upcoming=include_upcoming)
+    return {"studentId": student_id, "items": items[:limit], "hasMore": len(items) > limit}
+
+def _require_debug_token(request: Request):
+    if not LEARNING_API_DEBUG_TOKEN:
+        # 토큰이 없으면 엔드포인트가 없는 것처럼 응답
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("x-debug-token", "")
+    if not hmac.compare_digest(supplied.encode("utf-8"), LEARNING_API_DEBUG_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="디버그 토큰이 올바르지 않습니다.")
+
+@app.get("/api/v1/debug/profile", include_in_schema=False)
+async def debug_profile(
+    request: Request,
+    seconds: float = Query(5.0, gt=0, le=MAX_SECONDS, description="샘플링 시간 (초)"),
+    hz: int = Query(DEFAULT_HZ, ge=1, le=MAX_HZ, description="초당 샘플 수"),
+    allocations: bool = Query(False, description="같은 구간의 tracemalloc 할당 상위 목록 포함"),
+    top: int = Query(20, ge=1, le=200, description="할당 상위 개수"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$")
+):
+    """
+    실행 중인 프로세스 샘플링 프로파일 (X-Debug-Token 헤더 필요)
+
+    format=collapsed: flamegraph.pl/speedscope 용 collapsed stack 텍스트
+    format=json 또는 allocations=true: 샘플 정보 + collapsed 텍스트 + 할당 상위 목록
+    """
+    _require_debug_token(request)
+    try:
+        # 샘플링은 별도 스레드에서 → 그동안 이벤트 루프는 평소처럼 요청을 처리하며 샘플에 잡힘
+        result = await asyncio.to_thread(run_profile, seconds, hz, allocations, top)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    cpu = result["cpu"]
+    if format == "collapsed" and not allocations:
+        return PlainTextResponse(collapsed_text(cpu["stacks"]))
+    return {
+        "samples": cpu["samples"],
+        "hz": cpu["hz"],
+        "seconds": cpu["seconds"],
+        "collapsed": collapsed_text(cpu["stacks"]),
+        "allocations": result.get("allocations"),
+    }
+
+@app.get("/api/v1/learning/stats")
+async def get_learning_stats():
+    """저장소/인덱스/검색 합치기 상태"""
+    return {
+        "store": {"backend": LEARNING_STORE_BACKEND, "pendingWrites": _content_store.pending_writes()},
+        "search": {"singleFlight": _search_flight.stats()},
+        "admission": _admission.stats(),
+        "recommendation": _recommender.stats(),
+        "ebs": {"ready": _ebs_index.ready.is_set(), "items": len(_ebs_index)},
+        "reviews": _review_scheduler.stats(),
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/")
 async def root():
     """API 서버 상태 확인"""
@@ -345,9 +596,16 @@ async def root():
         "endpoints": {
             "curriculum": "/api/v1/learning/curriculum",
             "store": "/api/v1/learning/store",
+            "store_batch": "/api/v1/learning/store/batch",
             "search": "/api/v1/learning/search",
             "constitution": "/api/v1/learning/constitution/{constitution}",
-            "memory_techniques": "/api/v1/learning/memory-techniques"
+            "memory_techniques": "/api/v1/learning/memory-techniques",
+            "ebs": "/api/v1/learning/ebs",
+            "ebs_chapters": "/api/v1/learning/ebs/chapters",
+            "reviews_due": "/api/v1/learning/reviews/{student_id}/due",
+            "reviews_record": "/api/v1/learning/reviews/record",
+            "stats": "/api/v1/learning/stats",
+            "metrics": "/metrics"
         }
     }
 
@@ -355,7 +613,7 @@ if __name__ == "__main__":
     import uvicorn
     # 포트 충돌 방지: Sentinel API(8003)와 분리하여 8004 포트 사용
     PORT = int(os.getenv("LEARNING_API_PORT", "8004"))
-    print(f"Starting FastAPI server at http://0.0.0.0:{PORT}")
+    print(f"Starting FastAPI server at http://0.0.0.0:{PORT} (store backend: {LEARNING_STORE_BACKEND})")
     print(f"API Documentation: http://0.0.0.0:{PORT}/docs")
     uvicorn.run(app, host="0.0.0.0", port=PORT)
 
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 저장소 (File-Based)
+
+API 서버(learning_content_api.py)와 scripts/ 도구가 함께 사용하는 저장소 모듈입니다.
+FastAPI 의존성 없이 import 할 수 있습니다.
+"""
+
+import json
+import os
+import hashlib
+import queue
+import threading
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from concurrent.futures import Future
+import logging
+
+from content_format import PackedContentReader, write_packed_content
+from content_wal import ContentWriteAheadLog
+from metrics import Timer, SEARCH_STAGE_SECONDS, SEARCH_ITEMS_SCANNED, SEARCH_BYTES_READ, SEARCH_QUERIES, SEARCH_RESULTS
+
+logger = logging.getLogger(__name__)
+
+# 학습 콘텐츠 저장소 (실제로는 File-Based Memory System 사용)
+LEARNING_CONTENT_STORAGE = Path(os.getenv("LEARNING_CONTENT_DIR", "/var/www/mkm-study/learning-content"))
+
+# WAL / group commit 설정
+WAL_DIRNAME = ".wal"
+GROUP_COMMIT_MAX_RECORDS = int(os.getenv("LEARNING_STORE_GROUP_COMMIT", "512"))
+WAL_CHECKPOINT_BYTES = int(os.getenv("LEARNING_STORE_WAL_CHECKPOINT_BYTES", str(16 * 1024 * 1024)))
+WAL_CHECKPOINT_INTERVAL = 1.0  # writer가 이 시간(초) 동안 한가하면 체크포인트
+
+# 해시 대상에서 제외하는 필드 (저장 시점마다 달라지는 값)
+VOLATILE_FIELDS = ("id", "createdAt", "updatedAt")
+
+# upsert 결과 상태
+STATUS_CREATED = "created"
+STATUS_UPDATED = "updated"
+STATUS_UNCHANGED = "unchanged"
+
+def normalize_text(value: Any) -> str:
+    """해시용 정규화 (NFC, 공백 축약, 소문자)"""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFC", value if isinstance(value, str) else str(value))
+    return " ".join(text.split()).lower()
+
+def content_id_for(content_data: Dict[str, Any]) -> str:
+    """subject/topic/content 정규화 해시 기반 결정적 ID (재임포트해도 같은 ID)"""
+    key = "\x1f".join(normalize_text(content_data.get(field)) for field in ("subject", "topic", "content"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+def content_digest(content_data: Dict[str, Any]) -> str:
+    """변경 감지용 본문 해시 (id/createdAt/updatedAt 제외)"""
+    body = {k: v for k, v in content_data.items() if k not in VOLATILE_FIELDS}
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+# 검색 필터로 쓸 수 있는 필드 (SQLite 백엔드는 인덱스 컬럼)
+FILTER_FIELDS = ("grade", "difficulty", "constitution")
+
+class ContentStoreBase:
+    """
+    학습 콘텐츠 저장소 공통 인터페이스
+    
+    백엔드는 submit / iter_items / search / pending_writes / close 를 구현합니다.
+    """
+    
+    def submit(self, content_data: Dict[str, Any]) -> Future:
+        raise NotImplementedError
+    
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def scan_items(self) -> Iterator[Dict[str, Any]]:
+        """시작 시 인덱스 구축용 전체 순회 (백엔드가 같은 순회로 내부 인덱스도 채울 수 있음)"""
+        return self.iter_items()
+    
+    def search(self, query: str, subject: Optional[str] = None, limit: int = 10,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def pending_writes(self) -> int:
+        return 0
+    
+    def close(self):
+        pass
+    
+    def upsert(self, content_data: Dict[str, Any]) -> Tuple[str, str]:
+        """학습 콘텐츠 저장 후 커밋까지 대기 → (content_id, 상태)"""
+        return self.submit(content_data).result()
+    
+    def store(self, content_data: Dict[str, Any]) -> str:
+        """학습 콘텐츠 저장"""
+        return self.upsert(content_data)[0]
+    
+    @staticmethod
+    def _matches_filters(content: Dict[str, Any], filters: Optional[Dict[str, str]]) -> bool:
+        return not filters or all(str(content.get(field) or "") == value for field, value in filters.items())
+    
+    @staticmethod
+    def _rank(results: List[Dict[str, Any]], query: str, limit: int) -> List[Dict[str, Any]]:
+        # 관련도 순으로 정렬 (간단한 점수 계산)
+        results.sort(key=lambda x: (
+            query.lower() in x.get('topic', '').lower(),
+            len(x.get('content', ''))
+        ), reverse=True)
+        
+        return results[:limit]
+    
+    def export_packed(self, output_path: Path) -> int:
+        """전체 콘텐츠를 .mkmc 압축 포맷으로 내보내기"""
+        count = write_packed_content(self.iter_items(), output_path)
+        logger.info(f"압축 포맷 내보내기 완료: {count}개 → {output_path}")
+        return count
+    
+    @staticmethod
+    def open_packed(packed_path: Path) -> PackedContentReader:
+        """.mkmc 파일을 mmap으로 열기"""
+        return PackedContentReader(packed_path)
+    
+    @classmethod
+    def search_packed(cls, reader: PackedContentReader, query: str, subject: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        .mkmc 코퍼스 검색 (search()와 같은 매칭/정렬 규칙)
+        
+        subject 코드 열로 먼저 거르고, 원본 바이트에서 질의어가 있는 레코드만 디코딩합니다.
+        """
+        rows = reader.rows_with_subject(subject) if subject else None
+        if query.lower() == query.upper() and json.dumps(query, ensure_ascii=False)[1:-1] == query:
+            # 대소문자/이스케이프 문자가 없는 질의(한글, 숫자 등)는 원본 바이트 검색으로 후보를 거름
+            candidates = reader.find(query, rows)
+        else:
+            candidates = rows if rows is not None else range(len(reader))
+        
+        results = []
+        for index in candidates:
+            content = reader[index]
+            if query.lower() in content.get('topic', '').lower() or \
+               query.lower() in content.get('content', '').lower():
+                results.append(content)
+        
+        return cls._rank(results, query, limit)
+
+class LearningContentStore(ContentStoreBase):
+    """
+    학습 콘텐츠 저장소 (File-Based)
+    
+    쓰기는 WAL + group commit 으로 처리합니다.
+    submit()한 레코드는 writer 스레드가 모아서 변경 여부를 판단하고 WAL에 fsync 1회로 커밋한 뒤
+    개별 JSON 파일로 반영(임시 파일 + os.replace)하고, 주기적으로 체크포인트합니다.
+    시작 시 WAL에 남은 레코드를 다시 반영하고 쓰다 만 임시 파일을 지웁니다.
+    """
+    
+    def __init__(self, storage_dir: Optional[Path] = None):
+        self.storage_dir = Path(storage_dir) if storage_dir else LEARNING_CONTENT_STORAGE
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        # 저장된 콘텐츠 id → 본문 해시 (writer 스레드만 사용)
+        # 시작 시 인덱스 구축 순회(scan_items)에서 함께 구성하고, 그 전에 저장 요청이 오면
+        # writer 스레드가 그 순회를 기다리거나 직접 디렉토리를 읽어 구성 (요청 경로에서는 읽지 않음)
+        self._known: Optional[Dict[str, str]] = None
+        self._known_scanning = False
+        self._lock = threading.Lock()
+        self._known_ready = threading.Condition(self._lock)
+        
+        self._wal = ContentWriteAheadLog(self.storage_dir / WAL_DIRNAME / "content.wal")
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # 마지막 체크포인트 이후 반영한 파일 (체크포인트 때 개별 fsync)
+        self._dirty_paths: List[Path] = []
+        # WAL에는 커밋됐지만 파일 반영에 실패한 레코드가 있음 (체크포인트 때 WAL 재생)
+        self._replay_pending = False
+        self._closed = False
+        self._recover()
+    
+    # ---- 복구 / 체크포인트 ----
+    
+    def _recover(self):
+        for tmp_path in self.storage_dir.glob(".*.json.tmp"):
+            tmp_path.unlink()
+            logger.info(f"쓰다 만 임시 파일 삭제: {tmp_path.name}")
+        
+        replayed = self._replay_wal()
+        if replayed:
+            logger.info(f"WAL 복구: {replayed}개 레코드 반영")
+        if replayed or self._wal.size():
+            self._checkpoint()
+    
+    def _replay_wal(self) -> int:
+        replayed = 0
+        for record in self._wal.replay():
+            self._dirty_paths.append(self._write(record))
+            replayed += 1
+        return replayed
+    
+    def _checkpoint(self):
+        """반영된 파일과 디렉토리 항목(os.replace)을 디스크에 내린 뒤 WAL 비우기
+
+        os.sync() 는 호스트 전체를 내리므로 쓰지 않고 이 저장소가 바꾼 파일만 fsync 합니다.
+        파일 반영에 실패한 레코드가 있으면 WAL을 다시 반영한 뒤 비웁니다 (실패하면 예외, WAL 유지).
+        """
+        if self._replay_pending:
+            self._replay_wal()
+        for path in dict.fromkeys(self._dirty_paths):
+            try:
+                with open(path, 'rb') as f:
+                    os.fsync(f.fileno())
+            except FileNotFoundError:
+                pass
+        self._fsync_dir()
+        self._dirty_paths = []
+        self._wal.reset()
+        self._replay_pending = False
+    
+    def _fsync_dir(self):
+        # 디렉토리 fsync 를 지원하지 않는 플랫폼(Windows)은 건너뜀
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.storage_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    # ---- writer 스레드 ----
+    
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="content-store-writer", daemon=True)
+            self._writer.start()
+    
+    def _writer_loop(self):
+        """
+        묶음 커밋 + 주기적 체크포인트
+
+        커밋이 실패하면 그 묶음의 요청만 실패시키고, 체크포인트가 실패하면 WAL을 남겨 둔 채
+        다음 주기에 다시 시도합니다. 루프가 끝나면 남은 요청도 모두 실패로 완료합니다
+        (API는 Future를 타임아웃 없이 기다리므로 완료되지 않으면 요청이 멈춤).
+        """
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=WAL_CHECKPOINT_INTERVAL)
+                except queue.Empty:
+                    if self._wal.size():
+                        self._try_checkpoint()
+                    continue
+                
+                batch = [first]
+                while len(batch) < GROUP_COMMIT_MAX_RECORDS:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                stop = None in batch
+                entries = [entry for entry in batch if entry is not None]
+                if entries:
+                    try:
+                        self._commit(entries)
+                    except Exception as e:
+                        logger.error(f"학습 콘텐츠 커밋 실패: {e}")
+                        self._fail(entries, e)
+                if stop or self._wal.size() >= WAL_CHECKPOINT_BYTES:
+                    self._try_checkpoint()
+                if stop:
+                    return
+        finally:
+            with self._lock:
+                pending = []
+                while True:
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if entry is not None:
+                        pending.append(entry)
+                # 비정상 종료였다면 다음 submit 에서 writer 를 다시 시작
+                self._writer = None
+            self._fail(pending, RuntimeError("학습 콘텐츠 writer 스레드가 종료되었습니다."))
+    
+    def _try_checkpoint(self):
+        try:
+            self._checkpoint()
+        except Exception as e:
+            logger.error(f"WAL 체크포인트 실패 (다음 주기에 재시도): {e}")
+    
+    @staticmethod
+    def _fail(entries: List[Tuple[Dict[str, Any], Future]], error: BaseException):
+        for _, future in entries:
+            if not future.done():
+                future.set_exception(error)
+    
+    def _commit(self, entries: List[Tuple[Dict[str, Any], Future]]):
+        """
+        레코드 묶음의 변경 여부를 판단해 바뀐 것만 WAL에 커밋(fsync 1회)하고 JSON 파일로 반영
+
+        WAL 커밋 전 오류는 예외로 올려 묶음 전체를 실패시킵니다. WAL 커밋 후에는 이미 내구성이
+        보장되므로 파일 반영이 실패해도 성공으로 완료하고, 체크포인트 때 WAL 재생으로 반영합니다.
+        """
+        known = self._known_digests()
+        # 같은 묶음 안의 같은 콘텐츠는 앞 레코드 기준으로 판단 (커밋 성공 후 known 에 반영)
+        digests: Dict[str, str] = {}
+        created_at: Dict[str, str] = {}
+        changed: List[Tuple[Dict[str, Any], str, Future]] = []
+        for content_data, future in entries:
+            content_id = content_id_for(content_data)
+            digest = content_digest(content_data)
+            previous = digests.get(content_id, known.get(content_id))
+            if previous == digest:
+                future.set_result((content_id, STATUS_UNCHANGED))
+                continue
+            digests[content_id] = digest
+            
+            # 최초 createdAt 유지 (같은 묶음 안의 같은 ID는 앞 레코드 값 사용)
+            now = datetime.now().isoformat()
+            if content_id not in created_at:
+                created_at[content_id] = (self._created_at(content_id) if previous else None) or now
+            content_data["id"] = content_id
+            content_data["createdAt"] = created_at[content_id]
+            content_data["updatedAt"] = now
+            changed.append((content_data, STATUS_UPDATED if previous else STATUS_CREATED, future))
+        if not changed:
+            return
+        
+        self._wal.append([content_data for content_data, _, _ in changed])
+        known.update(digests)
+        try:
+            for content_data, _, _ in changed:
+                self._dirty_paths.append(self._write(content_data))
+        except Exception as e:
+            logger.error(f"학습 콘텐츠 파일 반영 실패 (WAL 커밋됨, 체크포인트 때 재생): {e}")
+            self._replay_pending = True
+        
+        for content_data, status, future in changed:
+            future.set_result((content_data["id"], status))
+    
+    def _write(self, content_data: Dict[str, Any]) -> Path:
+        # 같은 ID 파일을 덮어쓰므로 임시 파일에 쓴 뒤 교체 (내구성은 WAL이 보장)
+        file_path = self.storage_dir / f"{content_data['id']}.json"
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(content_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, file_path)
+        return file_path
+    
+    def _known_digests(self) -> Dict[str, str]:
+        """writer 스레드 전용: 구성 중인 순회가 있으면 기다리고, 없으면 직접 구성"""
+        with self._known_ready:
+            while self._known is None and self._known_scanning:
+                self._known_ready.wait()
+            if self._known is not None:
+                return self._known
+        for _ in self.scan_items():
+            pass
+        return self._known
+    
+    def scan_items(self) -> Iterator[Dict[str, Any]]:
+        """전체 순회하면서 본문 해시 인덱스도 구성 (이미 구성됐거나 구성 중이면 그냥 순회)"""
+        with self._lock:
+            owner = self._known is None and not self._known_scanning
+            if owner:
+                self._known_scanning = True
+        if not owner:
+            yield from self.iter_items()
+            return
+        
+        known: Optional[Dict[str, str]] = {}
+        try:
+            for content in self.iter_items():
+                if content.get("id"):
+                    known[content["id"]] = content_digest(content)
+                yield content
+        except BaseException:
+            # 끝까지 읽지 못했으면 구성하지 않음 (writer 스레드가 다시 구성)
+            known = None
+            raise
+        finally:
+            with self._known_ready:
+                if known is not None:
+                    self._known = known
+                    logger.info(f"저장소 해시 인덱스 구성: {len(known)}개")
+                self._known_scanning = False
+                self._known_ready.notify_all()
+    
+    def _created_at(self, content_id: str) -> Optional[str]:
+        try:
+            with open(self.storage_dir / f"{content_id}.json", 'r', encoding='utf-8') as f:
+                return json.load(f).get("createdAt")
+        except (OSError, ValueError):
+            return None
+    
+    # ---- 저장 API ----
+    
+    def submit(self, content_data: Dict[str, Any]) -> Future:
+        """
+        학습 콘텐츠 저장 요청 (같은 콘텐츠는 같은 ID로 덮어씀)
+        
+        이벤트 루프에서 호출해도 되도록 큐에 넣기만 하고, 변경 여부는 writer 스레드가 판단합니다.
+        
+        Returns:
+            (content_id, 상태) 를 결과로 갖는 Future - 상태는 created / updated / unchanged.
+            WAL 커밋이 끝나면 완료되며, unchanged 는 쓰기 없이 완료됩니다.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("저장소가 닫혔습니다.")
+            self._ensure_writer()
+            self._queue.put((content_data, future))
+        return future
+    
+    def pending_writes(self) -> int:
+        """커밋 대기 중인 레코드 수"""
+        return self._queue.qsize()
+    
+    def close(self):
+        """대기 중인 쓰기를 모두 커밋하고 체크포인트"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        elif self._wal.size():
+            self._checkpoint()
+        self._wal.close()
+    
+    def _iter_files(self) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """(콘텐츠, 파일 바이트 수) 순회 (읽기 실패 파일은 건너뜀)"""
+        for json_file in self.storage_dir.glob("*.json"):
+            try:
+                raw = json_file.read_bytes()
+                yield json.loads(raw), len(raw)
+            except Exception as e:
+                logger.warning(f"파일 읽기 실패 ({json_file}): {e}")
+                continue
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """저장된 모든 학습 콘텐츠 순회 (읽기 실패 파일은 건너뜀)"""
+        for content, _ in self._iter_files():
+            yield content
+    
+    def search(self, query: str, subject: Optional[str] = None, limit: int = 10,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """학습 콘텐츠 검색 (간단한 텍스트 매칭)"""
+        results = []
+        scanned = 0
+        bytes_read = 0
+        
+        # 모든 JSON 파일 검색
+        with Timer(SEARCH_STAGE_SECONDS, "file", "scan"):
+            for content, size in self._iter_files():
+                scanned += 1
+                bytes_read += size
+                # 간단한 텍스트 매칭 (실제로는 벡터 검색 사용)
+                if query.lower() in content.get('topic', '').lower() or \
+                   query.lower() in content.get('content', '').lower():
+                    
+                    if subject and content.get('subject') != subject:
+                        continue
+                    if not self._matches_filters(content, filters):
+                        continue
+                    
+                    results.append(content)
+        
+        with Timer(SEARCH_STAGE_SECONDS, "file", "rank"):
+            ranked = self._rank(results, query, limit)
+        SEARCH_QUERIES.inc(1, "file", "scan")
+        SEARCH_ITEMS_SCANNED.inc(scanned, "file")
+        SEARCH_BYTES_READ.inc(bytes_read, "file")
+        SEARCH_RESULTS.inc(len(ranked), "file")
+        return ranked
+
+def create_content_store(backend: Optional[str] = None, storage_dir: Optional[Path] = None) -> ContentStoreBase:
+    """
+    저장소 백엔드 생성
+    
+    Args:
+        backend: "file" (기본, JSON 파일) 또는 "sqlite" (SQLite + FTS5).
+                 None이면 LEARNING_STORE_BACKEND 환경 변수 사용
+        storage_dir: 저장 디렉토리 (SQLite는 이 디렉토리의 learning_content.db)
+    """
+    backend = (backend or os.getenv("LEARNING_STORE_BACKEND") or "file").lower()
+    if backend == "file":
+        return LearningContentStore(storage_dir)
+    if backend == "sqlite":
+        from sqlite_content_store import SqliteContentStore
+        return SqliteContentStore(storage_dir=storage_dir)
+    raise ValueError(f"알 수 없는 저장소 백엔드: {backend} (file 또는 sqlite)")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 API 요청/응답 모델 (pydantic v2)
+
+임포터마다 필드 구성이 조금씩 달라(question/answer, teacher, url 등)
+알려진 필드만 타입을 정하고 나머지는 그대로 보존합니다 (extra="allow").
+"""
+
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+class Vector4D(BaseModel):
+    S: float
+    L: float
+    K: float
+    M: float
+
+class LearningContentItem(BaseModel):
+    """학습 콘텐츠 항목"""
+    model_config = ConfigDict(extra="allow")
+
+    id: Optional[str] = None
+    subject: str = ""
+    topic: str = ""
+    content: str = ""
+    difficulty: Optional[str] = None
+    grade: Optional[Union[str, int]] = None
+    ebsCurriculum: Optional[str] = None
+    # EBS 교과과정 위치 (EBS 인덱스 키)
+    chapter: Optional[Union[int, str]] = None
+    chapterTitle: Optional[str] = None
+    section: Optional[Union[int, str]] = None
+    sectionTitle: Optional[str] = None
+    keyTopics: List[str] = Field(default_factory=list)
+    # 생성기는 빈 dict를 보내기도 하므로 Vector4D 대신 느슨한 dict
+    vector_4d: Optional[Dict[str, float]] = None
+    constitution: Optional[str] = None
+    source: Optional[str] = None
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+    @field_validator("subject", "topic", "content", mode="before")
+    @classmethod
+    def _text(cls, value: Any) -> str:
+        # 원본 데이터의 숫자/None 필드도 문자열로 받음
+        return "" if value is None else value if isinstance(value, str) else str(value)
+
+    @field_validator("difficulty", "ebsCurriculum", "constitution", "source", mode="before")
+    @classmethod
+    def _optional_text(cls, value: Any) -> Optional[str]:
+        return value if value is None or isinstance(value, str) else str(value)
+
+    @field_validator("keyTopics", mode="before")
+    @classmethod
+    def _key_topics(cls, value: Any) -> List[Any]:
+        # XML/CSV 원본은 "키워드1, 키워드2" 같은 문자열로 오기도 함
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [token.strip() for token in value.split(",") if token.strip()]
+        return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+
+    @model_validator(mode="after")
+    def _has_body(self) -> "LearningContentItem":
+        # 필드가 모두 기본값이라 {"bad": 1} 같은 요청도 통과하던 것 방지
+        if not self.content.strip() and not (self.subject.strip() and self.topic.strip()):
+            raise ValueError("content 또는 subject + topic 이 필요합니다.")
+        return self
+
+    def to_store(self) -> Dict[str, Any]:
+        """저장소에 넘길 dict (요청에 없던 기본값 필드는 추가하지 않음)"""
+        return self.model_dump(exclude_unset=True)
+
+class StoreBatchRequest(BaseModel):
+    # 항목 검증은 엔드포인트에서 건별로 (잘못된 항목 하나로 묶음 전체가 실패하지 않도록)
+    items: List[Any]
+
+class StoreResponse(BaseModel):
+    success: bool
+    content_id: str
+    status: str
+
+class StoreBatchResponse(BaseModel):
+    success: bool
+    stored: int
+    content_ids: List[str]
+    statuses: Dict[str, int]
+    errors: List[Dict[str, Any]]
+
+class LearningSearchRequest(BaseModel):
+    query: str
+    subject: Optional[str] = None
+    constitution: Optional[str] = None
+    vector_4d: Optional[Vector4D] = None
+    limit: int = 10
+
+class LearningSearchResponse(BaseModel):
+    results: List[LearningContentItem]
+
+class PersonalizedRecommendationRequest(BaseModel):
+    constitution: str
+    vector_4d: Vector4D
+    subject: str
+    # 학생의 커리큘럼 위치 (예: grade="중2", unit="일차함수")
+    grade: Optional[Union[str, int]] = None
+    unit: Optional[str] = None
+    limit: int = Field(10, ge=1, le=100)
+
+class ReviewRecordRequest(BaseModel):
+    studentId: str = Field(min_length=1)
+    itemId: str = Field(min_length=1)
+    correct: bool
+    # 생략하면 서버 시각 (오프라인 기록 동기화 시 클라이언트 시각 전달)
+    reviewedAt: Optional[datetime] = None
+
+class ReviewItemRequest(BaseModel):
+    studentId: str = Field(min_length=1)
+    itemId: str = Field(min_length=1)
+    learnedAt: Optional[datetime] = None
+
+class ReviewState(BaseModel):
+    studentId: str
+    itemId: str
+    step: int
+    intervalDays: int
+    mastered: bool
+    dueAt: Optional[str] = None
+    overdueSeconds: int
+    lastReviewAt: str
+    reviewCount: int
+    lapses: int
+
+class ReviewDueResponse(BaseModel):
+    studentId: str
+    items: List[ReviewState]
+    hasMore: bool
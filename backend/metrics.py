@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus 텍스트 형식 메트릭 (외부 라이브러리 없이)
+
+- 라우트별 요청 지연 히스토그램 (ASGI 미들웨어, 라우트 템플릿 기준 라벨)
+- 검색 내부: 단계별 시간(scan/query/decode/rank), 스캔한 항목 수, 읽은 바이트, 인덱스 경로, 응답 직렬화 시간
+- 이벤트 루프 지연, 저장소 쓰기 대기열/색인 대기열 깊이 (수집 시점에 콜백으로 읽는 게이지)
+
+/metrics 에서 render() 결과를 text/plain; version=0.0.4 로 내보냅니다.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Callable, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 요청 지연 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# 이벤트 루프 지연 버킷 (초)
+LAG_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+EVENT_LOOP_PROBE_INTERVAL = 0.25
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_labels_text(self.label_names, key)} {_format_value(v)}" for key, v in values]
+
+class Gauge(_Metric):
+    """set() 으로 값을 두거나, callback 이 있으면 수집 시점에 {라벨 튜플: 값} 을 읽음"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                values = list(self.callback().items())
+            except Exception as e:
+                logger.warning(f"메트릭 수집 실패 ({self.name}): {e}")
+                return []
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        return [f"{self.name}{_labels_text(self.label_names, key)} {_format_value(v)}" for key, v in values]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 → [버킷별 개수..., 합계, 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+        bounds = ['le="%s"' % _format_value(bound) for bound in self.buckets]
+        inf_bound = 'le="+Inf"'
+        lines = []
+        for key, state in values:
+            cumulative = 0.0
+            for bound, count in zip(bounds, state[:len(self.buckets)]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels_text(self.label_names, key, bound)} {_format_value(cumulative)}")
+            # 마지막 경계보다 큰 값은 버킷에 들어가지 않으므로 +Inf 는 전체 개수
+            lines.append(f"{self.name}_bucket{_labels_text(self.label_names, key, inf_bound)} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_sum{_labels_text(self.label_names, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_labels_text(self.label_names, key)} {_format_value(state[-1])}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+def counter(name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labels))
+
+def gauge(name: str, documentation: str, labels: Sequence[str] = (),
+          callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labels, callback))
+
+def histogram(name: str, documentation: str, labels: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labels, buckets))
+
+def render() -> str:
+    return REGISTRY.render()
+
+# ---- 공용 메트릭 ----
+
+HTTP_REQUEST_SECONDS = histogram(
+    "learning_http_request_duration_seconds", "요청 처리 시간 (응답 본문 전송 완료까지)", ("method", "route", "status"))
+HTTP_IN_PROGRESS = gauge("learning_http_requests_in_progress", "처리 중인 요청 수", ("method",))
+
+SEARCH_STAGE_SECONDS = histogram(
+    "learning_search_stage_seconds", "검색 단계별 시간 (scan/query/decode/rank)", ("backend", "stage"))
+SEARCH_ITEMS_SCANNED = counter(
+    "learning_search_items_scanned_total", "검색 중 읽은 콘텐츠 수 (file: 파일, sqlite: 후보 행)", ("backend",))
+SEARCH_BYTES_READ = counter("learning_search_bytes_read_total", "검색 중 읽은 콘텐츠 바이트", ("backend",))
+SEARCH_QUERIES = counter(
+    "learning_search_queries_total", "검색 경로별 질의 수 (fts: 인덱스, like/scan: 전체 훑기)", ("backend", "path"))
+SEARCH_RESULTS = counter("learning_search_results_total", "검색 결과로 돌려준 콘텐츠 수", ("backend",))
+SERIALIZATION_SECONDS = histogram("learning_serialization_seconds", "응답 직렬화 시간", ("route",))
+
+SINGLE_FLIGHT_EXECUTIONS = counter("learning_single_flight_executions_total", "합치기 그룹에서 실제로 실행한 수", ("name",))
+SINGLE_FLIGHT_COALESCED = counter(
+    "learning_single_flight_coalesced_total", "진행 중인 같은 요청에 합쳐진 수 (실행 안 함)", ("name",))
+
+STORE_WRITES = counter("learning_store_writes_total", "저장 결과별 콘텐츠 수", ("status",))
+
+EVENT_LOOP_LAG = histogram("learning_event_loop_lag_seconds", "이벤트 루프 지연 (예정 대비 늦게 깨어난 시간)", buckets=LAG_BUCKETS)
+EVENT_LOOP_LAG_LAST = gauge("learning_event_loop_lag_last_seconds", "마지막으로 측정한 이벤트 루프 지연")
+
+class Timer:
+    """with Timer(histogram, *labels): ... → 경과 시간을 observe"""
+
+    def __init__(self, metric: Histogram, *labels: str):
+        self.metric = metric
+        self.labels = labels
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        self.metric.observe(self.elapsed, *self.labels)
+
+class MetricsMiddleware:
+    """라우트별 요청 지연/진행 중 요청 수 (순수 ASGI, 라우트 템플릿을 라벨로 → 경로 파라미터로 라벨이 늘지 않음)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(1, method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.inc(-1, method)
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method, route_label, status)
+
+async def monitor_event_loop(interval: float = EVENT_LOOP_PROBE_INTERVAL):
+    """주기적으로 잠들었다 깨어나며 예정보다 늦은 만큼을 이벤트 루프 지연으로 기록"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+체질별 맞춤 학습 추천 엔진 (/api/v1/learning/personalized)
+
+저장소 콘텐츠를 numpy 열(column) 배열로 색인해 두고, 요청마다 후보 전체를 벡터 연산으로 점수화합니다.
+
+점수 = 0.45 × 4D 벡터 코사인 유사도
+     + 0.30 × 체질 사전점수 (체질 태그 일치, 선호 난이도, 집중 세션 길이에 맞는 분량)
+     + 0.25 × 커리큘럼 위치 (학년/단원이 학생 위치에 가까울수록, 약간 앞선 내용 우대)
+
+- 체질 사전점수는 요청과 무관하므로 색인 시 체질별로 미리 계산해 둠
+- 후보 풀: (체질, 과목)별 행 번호 배열 - 다른 체질 전용 콘텐츠는 제외
+- 저장 API에서 upsert 할 때마다 해당 행/풀만 갱신 (풀 병합은 다음 조회 시 한 번에)
+"""
+
+import math
+import re
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Callable, Tuple
+import logging
+
+import numpy as np
+
+from curriculum_index import GRADE_ORDER, CurriculumIndex, normalize_grade
+
+logger = logging.getLogger(__name__)
+
+VECTOR_FIELDS = ("S", "L", "K", "M")
+
+WEIGHT_SIMILARITY = 0.45
+WEIGHT_CONSTITUTION = 0.30
+WEIGHT_CURRICULUM = 0.25
+
+# 체질 태그가 없는 공용 콘텐츠의 일치 점수 (전용 콘텐츠 1.0)
+SHARED_CONTENT_MATCH = 0.5
+# 학생 위치보다 이 만큼(학년 단위) 앞선 내용을 가장 우대, 표준편차
+CURRICULUM_LEAD = 0.15
+CURRICULUM_SIGMA = 0.75
+# 세션 1분당 적당한 본문 길이 (글자)
+CHARS_PER_SESSION_MINUTE = 40
+PREVIEW_CHARS = 300
+
+# CONSTITUTION_LEARNING_STYLES 의 설명을 점수용 수치로 옮긴 것
+# (preferredMethod → 난이도 선호, focusPattern → 세션 길이)
+CONSTITUTION_PRIORS = {
+    "태양인": {"difficulty": {"easy": 0.6, "medium": 1.0, "hard": 0.7}, "sessionMinutes": 25},
+    "태음인": {"difficulty": {"easy": 1.0, "medium": 0.8, "hard": 0.4}, "sessionMinutes": 50},
+    "소양인": {"difficulty": {"easy": 0.5, "medium": 1.0, "hard": 0.8}, "sessionMinutes": 30},
+    "소음인": {"difficulty": {"easy": 0.4, "medium": 0.7, "hard": 1.0}, "sessionMinutes": 90},
+}
+CONSTITUTIONS = tuple(CONSTITUTION_PRIORS)
+
+_TOKEN_SPLIT = re.compile(r"[\s\-·,/()]+")
+
+def grade_position(grade: Any) -> Optional[float]:
+    """학년 → 커리큘럼 순서 (GRADE_ORDER 인덱스, 모르면 None)"""
+    label = normalize_grade(grade)
+    return float(GRADE_ORDER.index(label)) if label is not None else None
+
+def _vector(value: Any) -> Optional[List[float]]:
+    if not isinstance(value, dict):
+        return None
+    try:
+        return [float(value[field]) for field in VECTOR_FIELDS]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class RecommendationEngine:
+    """numpy 열 배열 기반 추천 색인"""
+
+    # _allocate 가 만드는 색인 상태 (rebuild 때 통째로 교체)
+    _INDEX_FIELDS = ("count", "ids", "rows", "summaries", "subjects", "vectors", "has_vector", "positions",
+                     "priors", "pools", "_pool_pending", "_row_pools", "_stale_pools")
+
+    def __init__(self, curriculum: Optional[Callable[[], Optional[CurriculumIndex]]] = None,
+                 initial_capacity: int = 1024):
+        self._curriculum = curriculum or (lambda: None)
+        self._lock = threading.Lock()
+        self.ready = threading.Event()
+        # 색인 구축 중 들어온 upsert (구축이 끝나면 이어서 반영)
+        self._queue_lock = threading.Lock()
+        self._queued: List[Dict[str, Any]] = []
+        self._allocate(initial_capacity)
+
+    def _allocate(self, capacity: int):
+        self.count = 0
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.summaries: List[Dict[str, Any]] = []
+        self.subjects: Dict[str, int] = {}
+        self.vectors = np.zeros((capacity, len(VECTOR_FIELDS)), dtype=np.float32)
+        self.has_vector = np.zeros(capacity, dtype=bool)
+        self.positions = np.full(capacity, np.nan, dtype=np.float32)
+        # 체질별 사전점수 [체질, 행]
+        self.priors = np.zeros((len(CONSTITUTIONS), capacity), dtype=np.float32)
+        # (체질 번호, 과목 번호) → 행 번호 배열 / 아직 병합하지 않은 추가 행
+        self.pools: Dict[Tuple[int, int], np.ndarray] = {}
+        self._pool_pending: Dict[Tuple[int, int], List[int]] = {}
+        # 행 번호 → 현재 속한 풀 키들 (과목/체질 변경 시 옛 풀에서 빼기 위해)
+        self._row_pools: List[List[Tuple[int, int]]] = []
+        self._stale_pools = set()
+
+    def _grow(self):
+        capacity = self.vectors.shape[0] * 2
+        self.vectors = np.resize(self.vectors, (capacity, len(VECTOR_FIELDS)))
+        self.has_vector = np.resize(self.has_vector, capacity)
+        positions = np.full(capacity, np.nan, dtype=np.float32)
+        positions[:self.count] = self.positions[:self.count]
+        self.positions = positions
+        priors = np.zeros((len(CONSTITUTIONS), capacity), dtype=np.float32)
+        priors[:, :self.count] = self.priors[:, :self.count]
+        self.priors = priors
+
+    # ---- 색인 ----
+
+    def rebuild(self, items: Iterable[Dict[str, Any]]):
+        """
+        저장소 전체로 색인 구축 (시작 시 백그라운드 스레드에서 1회)
+
+        저장소 스캔은 잠금 밖에서 별도 색인에 쌓고, 잠금은 배열 교체와 대기열 반영 동안만 잡습니다.
+        """
+        fresh = RecommendationEngine(self._curriculum)
+        for item in items:
+            fresh._upsert(item)
+        with self._lock:
+            for name in self._INDEX_FIELDS:
+                setattr(self, name, getattr(fresh, name))
+            with self._queue_lock:
+                for item in self._queued:
+                    self._upsert(item)
+                self._queued = []
+                self.ready.set()
+        logger.info(f"✅ 추천 색인 구축: {self.count}개")
+
+    def upsert(self, item: Dict[str, Any]):
+        """저장된 콘텐츠 1건 반영 (같은 id면 덮어씀, 구축 중이면 대기열에)"""
+        with self._queue_lock:
+            if not self.ready.is_set():
+                self._queued.append(item)
+                return
+        with self._lock:
+            self._upsert(item)
+
+    def _upsert(self, item: Dict[str, Any]):
+        content_id = item.get("id")
+        subject = item.get("subject")
+        if not content_id or not subject:
+            return
+
+        row = self.rows.get(content_id)
+        if row is None:
+            if self.count == self.vectors.shape[0]:
+                self._grow()
+            row = self.count
+            self.count += 1
+            self.rows[content_id] = row
+            self.ids.append(content_id)
+            self.summaries.append({})
+            self._row_pools.append([])
+
+        vector = _vector(item.get("vector_4d"))
+        self.has_vector[row] = vector is not None
+        self.vectors[row] = vector if vector is not None else 0.0
+        position = self._curriculum_position(item)
+        self.positions[row] = np.nan if position is None else position
+
+        content = str(item.get("content") or "")
+        item_constitution = item.get("constitution")
+        difficulty = item.get("difficulty")
+        for c, name in enumerate(CONSTITUTIONS):
+            self.priors[c, row] = self._prior(name, item_constitution, difficulty, len(content))
+
+        self.summaries[row] = {
+            "id": content_id,
+            "subject": subject,
+            "topic": item.get("topic", ""),
+            "preview": content[:PREVIEW_CHARS],
+            "difficulty": difficulty,
+            "grade": item.get("grade"),
+            "ebsCurriculum": item.get("ebsCurriculum"),
+            "keyTopics": item.get("keyTopics", []),
+            "constitution": item_constitution,
+        }
+
+        subject_code = self.subjects.setdefault(subject, len(self.subjects))
+        pools = [
+            (c, subject_code) for c, name in enumerate(CONSTITUTIONS)
+            if not item_constitution or item_constitution == name
+        ]
+        if pools != self._row_pools[row]:
+            # 과목/체질이 바뀌면 옛 풀은 다음 조회 때 다시 만듦
+            self._stale_pools.update(key for key in self._row_pools[row] if key not in pools)
+            for key in pools:
+                if key not in self._row_pools[row]:
+                    self._pool_pending.setdefault(key, []).append(row)
+            self._row_pools[row] = pools
+
+    @staticmethod
+    def _prior(constitution: str, item_constitution: Optional[str], difficulty: Optional[str], length: int) -> float:
+        profile = CONSTITUTION_PRIORS[constitution]
+        if item_constitution == constitution:
+            match = 1.0
+        elif not item_constitution:
+            match = SHARED_CONTENT_MATCH
+        else:
+            match = 0.0
+        difficulty_fit = profile["difficulty"].get(difficulty, 0.7)
+        # 분량이 세션 길이에 맞을수록 1 (두 배/절반이면 0.5)
+        target = profile["sessionMinutes"] * CHARS_PER_SESSION_MINUTE
+        length_fit = 2.0 ** -abs(math.log2(max(length, 1) / target)) if length else 0.5
+        return 0.5 * match + 0.3 * difficulty_fit + 0.2 * length_fit
+
+    def _curriculum_position(self, item: Dict[str, Any]) -> Optional[float]:
+        """학년 순서 + 단원 위치(0~1) / 학년을 모르면 None"""
+        position = grade_position(item.get("grade"))
+        if position is None:
+            return None
+        index = self._curriculum()
+        unit_fraction = self._unit_fraction(index, item) if index is not None else None
+        return position + (unit_fraction if unit_fraction is not None else 0.5)
+
+    @staticmethod
+    def _unit_fraction(index: CurriculumIndex, item: Dict[str, Any]) -> Optional[float]:
+        grade_id = f"{item.get('subject')}.{normalize_grade(item.get('grade'))}"
+        grade_record = index.grades.get(grade_id)
+        if not grade_record or not grade_record["unitIds"]:
+            return None
+        keywords = [str(k) for k in item.get("keyTopics") or []]
+        keywords += [t for t in _TOKEN_SPLIT.split(str(item.get("topic", ""))) if len(t) >= 2]
+        for keyword in keywords:
+            for topic_id in index.topics_for_keyword(keyword):
+                unit_id = index.topic_unit[topic_id]
+                if index.unit_grade[unit_id] == grade_id:
+                    return (index.units[unit_id]["order"] - 0.5) / len(grade_record["unitIds"])
+        return None
+
+    def _student_position(self, subject: str, grade: Any, unit: Optional[str]) -> Optional[float]:
+        position = grade_position(grade)
+        if position is None:
+            return None
+        index = self._curriculum()
+        if unit and index is not None:
+            grade_record = index.grades.get(f"{subject}.{normalize_grade(grade)}")
+            for unit_id in index.find_units(subject, unit):
+                if grade_record and index.unit_grade[unit_id] == grade_record["id"]:
+                    return position + (index.units[unit_id]["order"] - 0.5) / len(grade_record["unitIds"])
+        return position + 0.5
+
+    def _pool(self, key: Tuple[int, int]) -> np.ndarray:
+        if key in self._stale_pools:
+            rows = [row for row in range(self.count) if key in self._row_pools[row]]
+            self.pools[key] = np.array(rows, dtype=np.int64)
+            self._stale_pools.discard(key)
+            self._pool_pending.pop(key, None)
+        pending = self._pool_pending.pop(key, None)
+        if pending:
+            base = self.pools.get(key, np.empty(0, dtype=np.int64))
+            self.pools[key] = np.concatenate([base, np.array(pending, dtype=np.int64)])
+        return self.pools.get(key, np.empty(0, dtype=np.int64))
+
+    # ---- 추천 ----
+
+    def recommend(self, constitution: str, subject: str, vector_4d: Dict[str, float],
+                  grade: Any = None, unit: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """점수 상위 limit개 (점수 내림차순, score/scores 포함) - 색인 구축 전에는 호출하지 말 것"""
+        if constitution not in CONSTITUTION_PRIORS:
+            raise KeyError(constitution)
+        c = CONSTITUTIONS.index(constitution)
+
+        with self._lock:
+            subject_code = self.subjects.get(subject)
+            if subject_code is None or limit <= 0:
+                return []
+            rows = self._pool((c, subject_code))
+            if rows.size == 0:
+                return []
+
+            # 4D 벡터 코사인 유사도 (벡터 없는 콘텐츠는 중립 0.5)
+            query = np.array(_vector(vector_4d) or [0.25] * len(VECTOR_FIELDS), dtype=np.float32)
+            vectors = self.vectors[rows]
+            norms = np.linalg.norm(vectors, axis=1) * (float(np.linalg.norm(query)) or 1.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                similarity = np.where(
+                    self.has_vector[rows] & (norms > 0), (vectors @ query) / norms, 0.5
+                ).astype(np.float32)
+
+            prior = self.priors[c, rows]
+
+            student = self._student_position(subject, grade, unit)
+            positions = self.positions[rows]
+            if student is None:
+                curriculum = np.full(rows.size, 0.5, dtype=np.float32)
+            else:
+                distance = positions - (student + CURRICULUM_LEAD)
+                curriculum = np.where(
+                    np.isnan(positions), 0.3, np.exp(-0.5 * (distance / CURRICULUM_SIGMA) ** 2)
+                ).astype(np.float32)
+
+            scores = WEIGHT_SIMILARITY * similarity + WEIGHT_CONSTITUTION * prior + WEIGHT_CURRICULUM * curriculum
+            top = min(limit, rows.size)
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+
+            results = []
+            for i in best:
+                results.append({
+                    **self.summaries[rows[i]],
+                    "score": round(float(scores[i]), 4),
+                    "scores": {
+                        "similarity": round(float(similarity[i]), 4),
+                        "constitution": round(float(prior[i]), 4),
+                        "curriculum": round(float(curriculum[i]), 4),
+                    },
+                })
+            return results
+
+    def queued(self) -> int:
+        """구축이 끝나기 전 대기 중인 upsert 수"""
+        with self._queue_lock:
+            return len(self._queued)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.ready.is_set():
+            return {"ready": False, "queued": len(self._queued)}
+        with self._lock:
+            return {
+                "ready": self.ready.is_set(),
+                "items": self.count,
+                "subjects": list(self.subjects),
+                "pools": {
+                    f"{CONSTITUTIONS[c]}.{subject}": int(self._pool((c, code)).size)
+                    for subject, code in self.subjects.items() for c in range(len(CONSTITUTIONS))
+                },
+            }
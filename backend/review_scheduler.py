@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+간격 반복 복습 스케줄러 (서버 측)
+
+BRAIN_SCIENCE_TECHNIQUES["spaced_repetition"] 의 1/3/7/14/30일 단계를 실제로 스케줄링합니다.
+브라우저 localStorage(wrongAnswerNotebook.ts) 대신 서버에 두어 기기 간에 공유됩니다.
+
+한 노드에서 수백만 개의 (학생, 문항) 상태를 다루도록 설계:
+
+- 학생/문항 ID는 정수로 인턴(intern)하고, 상태는 array 모듈의 열(column) 배열에 저장
+  (상태당 약 30바이트 + 키 조회 dict)
+- 학생별 최소 힙: 항목은 (due << 32 | 상태 번호) 정수 하나
+  → 다음 N개 조회는 O(N log n), 갱신은 새 항목 push 후 옛 항목은 꺼낼 때 버림(lazy deletion)
+- 스냅샷: 배열을 그대로 바이너리로 저장/복원 (tmp + os.replace)
+"""
+
+import os
+import sys
+import json
+import heapq
+import threading
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 복습 간격 (일) - 마지막 단계까지 맞히면 완료(mastered)
+REVIEW_STEPS_DAYS = (1, 3, 7, 14, 30)
+DAY_SECONDS = 86400
+MASTERED = -1  # due 값: 더 이상 복습 대상이 아님
+
+SNAPSHOT_MAGIC = "mkm-review-snapshot-v1"
+SNAPSHOT_INTERVAL = float(os.getenv("LEARNING_REVIEW_SNAPSHOT_INTERVAL", "60"))
+
+# 상태 열 이름 → array 타입 코드
+STATE_COLUMNS = (
+    ("student", "I"),
+    ("item", "I"),
+    ("step", "b"),
+    ("due", "q"),
+    ("last_review", "q"),
+    ("reviews", "I"),
+    ("lapses", "I"),
+)
+
+_INDEX_BITS = 32
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+class _Interner:
+    """문자열 ID ↔ 정수 번호"""
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self.names: List[str] = list(names or [])
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def intern(self, name: str) -> int:
+        index = self.ids.get(name)
+        if index is None:
+            index = len(self.names)
+            self.ids[name] = index
+            self.names.append(name)
+        return index
+
+    def get(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+class ReviewScheduler:
+    """학생별 복습 스케줄 (배열 기반 상태 + 학생별 힙)"""
+
+    def __init__(self, steps_days: Tuple[int, ...] = REVIEW_STEPS_DAYS):
+        self.steps = tuple(days * DAY_SECONDS for days in steps_days)
+        self._lock = threading.Lock()
+        # 변경 횟수 (스냅샷을 쓰는 동안 바뀌었는지 확인용)
+        self._changes = 0
+        self._reset()
+
+    def _reset(self):
+        self.students = _Interner()
+        self.items = _Interner()
+        self.columns: Dict[str, array] = {name: array(code) for name, code in STATE_COLUMNS}
+        # (학생 번호 << 32 | 문항 번호) → 상태 번호
+        self._state_index: Dict[int, int] = {}
+        # 학생 번호 → 힙 [(due << 32 | 상태 번호), ...]
+        self._heaps: List[List[int]] = []
+        # 학생 번호 → 힙에 살아 있는(완료되지 않은) 상태 수
+        self._live = array("I")
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.columns["due"])
+
+    def _mark_dirty(self):
+        self.dirty = True
+        self._changes += 1
+
+    # ---- 갱신 ----
+
+    def _state_for(self, student_id: str, item_id: str) -> Tuple[int, bool]:
+        student = self.students.intern(student_id)
+        item = self.items.intern(item_id)
+        if student == len(self._heaps):
+            self._heaps.append([])
+            self._live.append(0)
+        key = student << _INDEX_BITS | item
+        state = self._state_index.get(key)
+        if state is not None:
+            return state, False
+
+        state = len(self)
+        cols = self.columns
+        cols["student"].append(student)
+        cols["item"].append(item)
+        cols["step"].append(0)
+        cols["due"].append(MASTERED)
+        cols["last_review"].append(0)
+        cols["reviews"].append(0)
+        cols["lapses"].append(0)
+        self._state_index[key] = state
+        return state, True
+
+    def _schedule(self, state: int, due: int):
+        cols = self.columns
+        student = cols["student"][state]
+        was_live = cols["due"][state] != MASTERED
+        cols["due"][state] = due
+        if due == MASTERED:
+            if was_live:
+                self._live[student] -= 1
+            return
+        if not was_live:
+            self._live[student] += 1
+        heap = self._heaps[student]
+        heapq.heappush(heap, due << _INDEX_BITS | state)
+        # 버려진 항목이 너무 많이 쌓이면 힙 재구성
+        if len(heap) > 2 * self._live[student] + 64:
+            self._compact(student)
+
+    def _compact(self, student: int):
+        due = self.columns["due"]
+        entries = {entry for entry in self._heaps[student] if due[entry & _INDEX_MASK] == entry >> _INDEX_BITS}
+        heap = list(entries)
+        heapq.heapify(heap)
+        self._heaps[student] = heap
+
+    def add_item(self, student_id: str, item_id: str, learned_at: Optional[float] = None) -> Dict[str, Any]:
+        """처음 학습한 문항 등록 (이미 있으면 그대로) → 1단계 후 복습"""
+        now = int(learned_at if learned_at is not None else time.time())
+        with self._lock:
+            state, created = self._state_for(student_id, item_id)
+            if created:
+                self.columns["last_review"][state] = now
+                self._schedule(state, now + self.steps[0])
+                self._mark_dirty()
+            return self._describe(state, now)
+
+    def record_review(self, student_id: str, item_id: str, correct: bool,
+                      reviewed_at: Optional[float] = None) -> Dict[str, Any]:
+        """복습 결과 반영: 맞히면 다음 단계, 틀리면 1단계로"""
+        now = int(reviewed_at if reviewed_at is not None else time.time())
+        with self._lock:
+            state, created = self._state_for(student_id, item_id)
+            cols = self.columns
+            cols["reviews"][state] += 1
+            cols["last_review"][state] = now
+            if created:
+                # 오답 노트처럼 복습 기록으로 처음 들어오는 문항은 1단계부터 시작
+                step = 0
+            elif correct:
+                step = cols["step"][state] + 1
+            else:
+                cols["lapses"][state] += 1
+                step = 0
+            cols["step"][state] = min(step, len(self.steps))
+            if step >= len(self.steps):
+                self._schedule(state, MASTERED)
+            else:
+                self._schedule(state, now + self.steps[step])
+            self._mark_dirty()
+            return self._describe(state, now)
+
+    # ---- 조회 ----
+
+    def _describe(self, state: int, now: int) -> Dict[str, Any]:
+        cols = self.columns
+        due = cols["due"][state]
+        return {
+            "studentId": self.students.names[cols["student"][state]],
+            "itemId": self.items.names[cols["item"][state]],
+            "step": cols["step"][state],
+            "intervalDays": self.steps[min(cols["step"][state], len(self.steps) - 1)] // DAY_SECONDS,
+            "mastered": due == MASTERED,
+            "dueAt": None if due == MASTERED else _isoformat(due),
+            "overdueSeconds": 0 if due == MASTERED else max(0, now - due),
+            "lastReviewAt": _isoformat(cols["last_review"][state]),
+            "reviewCount": cols["reviews"][state],
+            "lapses": cols["lapses"][state],
+        }
+
+    def due_items(self, student_id: str, limit: int = 20, now: Optional[float] = None,
+                  include_upcoming: bool = False) -> List[Dict[str, Any]]:
+        """복습 시각이 지난 문항을 due 순으로 최대 limit개 (include_upcoming 이면 아직 안 된 것도)"""
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            student = self.students.get(student_id)
+            if student is None or limit <= 0:
+                return []
+            heap = self._heaps[student]
+            due = self.columns["due"]
+            taken: List[int] = []
+            seen = set()
+            while heap and len(taken) < limit:
+                entry = heap[0]
+                state = entry & _INDEX_MASK
+                entry_due = entry >> _INDEX_BITS
+                if due[state] != entry_due or state in seen:
+                    heapq.heappop(heap)  # 옛 항목 폐기
+                    continue
+                if entry_due > now and not include_upcoming:
+                    break
+                taken.append(heapq.heappop(heap))
+                seen.add(state)
+            for entry in taken:
+                heapq.heappush(heap, entry)
+            return [self._describe(entry & _INDEX_MASK, now) for entry in taken]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "students": len(self.students.names),
+                "items": len(self.items.names),
+                "states": len(self),
+                "active": sum(self._live),
+                "heapEntries": sum(len(heap) for heap in self._heaps),
+                "stepsDays": [s // DAY_SECONDS for s in self.steps],
+            }
+
+    # ---- 스냅샷 ----
+
+    def save_snapshot(self, path: Path):
+        """
+        상태 배열을 바이너리 스냅샷으로 저장 (잠금은 배열 복사 동안만)
+
+        dirty 는 파일 교체까지 성공하고 그 사이 변경이 없을 때만 해제합니다 (실패하면 다음 주기에 다시 저장).
+        """
+        with self._lock:
+            columns = {name: array(col.typecode, col) for name, col in self.columns.items()}
+            header = {
+                "magic": SNAPSHOT_MAGIC,
+                "stepsDays": [s // DAY_SECONDS for s in self.steps],
+                "students": list(self.students.names),
+                "items": list(self.items.names),
+                "columns": [[name, col.typecode, len(col)] for name, col in columns.items()],
+                "byteorder": sys.byteorder,
+            }
+            changes = self._changes
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+            f.write(len(header_bytes).to_bytes(8, "little"))
+            f.write(header_bytes)
+            for col in columns.values():
+                col.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._changes == changes:
+                self.dirty = False
+
+    def load_snapshot(self, path: Path) -> bool:
+        """스냅샷 복원 (없으면 False) - 키 조회 dict 와 학생별 힙은 배열에서 다시 만듦"""
+        path = Path(path)
+        if not path.exists():
+            return False
+        with open(path, "rb") as f:
+            header_length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_length).decode("utf-8"))
+            if header.get("magic") != SNAPSHOT_MAGIC:
+                raise ValueError(f"복습 스냅샷 형식이 아닙니다: {path}")
+            columns: Dict[str, array] = {}
+            for name, typecode, length in header["columns"]:
+                col = array(typecode)
+                col.fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    col.byteswap()
+                columns[name] = col
+
+        with self._lock:
+            self._reset()
+            self.steps = tuple(days * DAY_SECONDS for days in header["stepsDays"])
+            self.students = _Interner(header["students"])
+            self.items = _Interner(header["items"])
+            self.columns = columns
+            self._heaps = [[] for _ in self.students.names]
+            self._live = array("I", [0] * len(self.students.names))
+            student_col, item_col, due_col = columns["student"], columns["item"], columns["due"]
+            for state in range(len(due_col)):
+                student = student_col[state]
+                self._state_index[student << _INDEX_BITS | item_col[state]] = state
+                due = due_col[state]
+                if due != MASTERED:
+                    self._heaps[student].append(due << _INDEX_BITS | state)
+                    self._live[student] += 1
+            for heap in self._heaps:
+                heapq.heapify(heap)
+        return True
+
+class SnapshotWriter:
+    """변경이 있을 때만 주기적으로 스냅샷 저장 (백그라운드 스레드)"""
+
+    def __init__(self, scheduler: ReviewScheduler, path: Path, interval: float = SNAPSHOT_INTERVAL):
+        self.scheduler = scheduler
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="review-snapshot", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        if not self.scheduler.dirty:
+            return
+        try:
+            self.scheduler.save_snapshot(self.path)
+        except OSError as e:
+            logger.error(f"❌ 복습 스냅샷 저장 실패: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+def _isoformat(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat()
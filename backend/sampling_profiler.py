@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운영 중인 API 프로세스 진단용 샘플링 프로파일러 (외부 라이브러리 없이)
+
+- CPU: 별도 스레드가 sys._current_frames() 로 모든 스레드의 스택을 일정 Hz로 샘플링
+  → flamegraph.pl / speedscope 에 바로 넣을 수 있는 collapsed stack 텍스트
+- 메모리: tracemalloc 을 지정 시간 동안 켠 뒤 할당 위치 상위 N개
+
+샘플링 스레드만 GIL을 잠깐씩 잡으므로 100Hz 기준 오버헤드는 1~2% 수준입니다.
+한 번에 하나의 프로파일만 실행합니다.
+"""
+
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HZ = 100
+MAX_HZ = 1000
+MAX_SECONDS = 60.0
+MAX_STACK_DEPTH = 128
+TRACEMALLOC_FRAMES = 16
+
+_profile_lock = threading.Lock()
+
+class ProfilerBusy(RuntimeError):
+    """다른 프로파일이 이미 실행 중"""
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # 같은 함수는 한 칸으로 모이도록 정의 시작 줄을 사용, collapsed 형식의 구분자(;)는 치환
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+def _collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":"))
+    return ";".join(reversed(labels))
+
+def sample_stacks(seconds: float, hz: int = DEFAULT_HZ) -> Dict[str, Any]:
+    """
+    seconds 동안 hz 간격으로 모든 스레드 스택 샘플링 (호출한 스레드에서 실행)
+
+    반환: {"samples": 샘플 수, "stacks": {collapsed stack: 횟수}, ...}
+    """
+    interval = 1.0 / hz
+    own_id = threading.get_ident()
+    stacks: Counter = Counter()
+    samples = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    next_tick = started
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stacks[_collapse(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+        samples += 1
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # 밀린 틱은 건너뜀 (따라잡으려 연달아 샘플링하지 않음)
+            next_tick = time.perf_counter()
+
+    return {
+        "samples": samples,
+        "hz": hz,
+        "seconds": round(time.perf_counter() - started, 3),
+        "stacks": dict(stacks.most_common()),
+    }
+
+def collapsed_text(stacks: Dict[str, int]) -> str:
+    """flamegraph.pl 입력 형식 ("a;b;c 횟수" 한 줄씩)"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+
+def allocation_top(seconds: float, top: int = 20) -> Dict[str, Any]:
+    """
+    seconds 동안 tracemalloc 으로 할당 추적 후 할당 위치(traceback) 상위 top 개
+
+    이미 tracemalloc 이 켜져 있으면 그대로 두고, 여기서 켠 경우에만 끝나고 끕니다.
+    """
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        time.sleep(seconds)
+        snapshot = tracemalloc.take_snapshot()
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        # 샘플링 스레드 자신의 할당 제외
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    statistics = snapshot.statistics("traceback")
+    allocations: List[Dict[str, Any]] = []
+    for stat in statistics[:top]:
+        allocations.append({
+            "sizeBytes": stat.size,
+            "count": stat.count,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)],
+        })
+    return {
+        "seconds": seconds,
+        "tracedBytes": traced_current,
+        "peakBytes": traced_peak,
+        "totalBytes": sum(stat.size for stat in statistics),
+        "top": allocations,
+    }
+
+def run_profile(seconds: float, hz: int = DEFAULT_HZ, allocations: bool = False,
+                top: int = 20) -> Dict[str, Any]:
+    """
+    CPU 스택 샘플링 (+ 선택적으로 같은 구간의 할당 추적) 실행
+
+    동시에 두 번 실행하면 ProfilerBusy. 블로킹 함수이므로 이벤트 루프 밖(스레드)에서 호출하세요.
+    """
+    if not 0 < seconds <= MAX_SECONDS:
+        raise ValueError(f"seconds 는 0 초과 {MAX_SECONDS} 이하여야 합니다")
+    if not 1 <= hz <= MAX_HZ:
+        raise ValueError(f"hz 는 1 이상 {MAX_HZ} 이하여야 합니다")
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("이미 프로파일이 실행 중입니다")
+    try:
+        logger.info(f"🔍 프로파일 시작: {seconds}s, {hz}Hz, allocations={allocations}")
+        result: Dict[str, Any] = {}
+        allocation_thread: Optional[threading.Thread] = None
+        if allocations:
+            def trace():
+                result["allocations"] = allocation_top(seconds, top)
+            allocation_thread = threading.Thread(target=trace, name="profiler-tracemalloc", daemon=True)
+            allocation_thread.start()
+        result["cpu"] = sample_stacks(seconds, hz)
+        if allocation_thread is not None:
+            allocation_thread.join()
+        logger.info(f"✅ 프로파일 완료: 샘플 {result['cpu']['samples']}개, 스택 {len(result['cpu']['stacks'])}종")
+        return result
+    finally:
+        _profile_lock.release()
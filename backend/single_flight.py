@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동일 요청 합치기 (single-flight, asyncio)
+
+같은 키의 호출이 진행 중이면 새로 실행하지 않고 진행 중인 결과를 함께 기다립니다.
+(한 반 학생들이 같은 단원을 열 때 거의 동시에 들어오는 같은 검색 → 저장소 스캔 1회)
+
+- 실행은 별도 Task 로 돌리므로 처음 요청한 클라이언트가 끊겨도 나머지는 결과를 받습니다.
+- 결과 객체는 기다린 모든 호출이 공유하므로 호출 측에서 수정하면 안 됩니다.
+- 완료되면 바로 키를 지우므로 캐시가 아닙니다 (끝난 뒤 들어온 요청은 다시 실행).
+"""
+
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, Hashable, TypeVar
+import logging
+
+from metrics import SINGLE_FLIGHT_EXECUTIONS, SINGLE_FLIGHT_COALESCED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """키별로 진행 중인 실행을 하나만 두는 합치기 그룹"""
+
+    def __init__(self, name: str):
+        self.name = name
+        # 키 → [실행 Task, 기다리는 호출 수]
+        self._inflight: Dict[Hashable, list] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        entry = self._inflight.get(key)
+        if entry is not None:
+            entry[1] += 1
+            self.coalesced += 1
+            SINGLE_FLIGHT_COALESCED.inc(1, self.name)
+        else:
+            task = asyncio.ensure_future(fn())
+            entry = self._inflight[key] = [task, 1]
+            self.executions += 1
+            SINGLE_FLIGHT_EXECUTIONS.inc(1, self.name)
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        # 기다리던 호출이 취소돼도 공유 실행은 계속
+        return await asyncio.shield(entry[0])
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        entry = self._inflight.pop(key, None)
+        if not task.cancelled():
+            # 모든 호출이 취소된 경우에도 "예외를 꺼내지 않음" 경고가 남지 않도록
+            task.exception()
+        waiters = entry[1] if entry else 1
+        if waiters > 1:
+            self.max_waiters = max(self.max_waiters, waiters)
+            logger.info(f"🔗 {self.name} 요청 합침: {waiters}건이 1회 실행 공유")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescedRatio": round(self.coalesced / total, 4) if total else 0.0,
+            "maxWaiters": self.max_waiters,
+            "inFlight": len(self._inflight),
+        }
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 저장소 (SQLite + FTS5)
+
+LEARNING_STORE_BACKEND=sqlite 로 선택합니다. 외부 서비스 없이 VPS 한 대에서
+내구성 있는 저장과 인덱스 기반 검색을 제공합니다.
+
+- WAL 저널 모드: 쓰기 중에도 읽기 연결이 막히지 않음
+- writer 스레드 1개가 대기 중인 레코드를 한 트랜잭션으로 커밋 (group commit)
+- subject / grade / difficulty / constitution 인덱스 컬럼
+- FTS5 trigram 토크나이저로 topic/content 부분 문자열 검색
+  (3글자 미만 질의나 FTS5 미지원 SQLite는 LIKE 로 대체)
+
+검색 매칭/정렬 규칙은 파일 백엔드(LearningContentStore.search)와 같습니다.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+import logging
+
+from learning_content_store import (
+    ContentStoreBase, LEARNING_CONTENT_STORAGE, FILTER_FIELDS, GROUP_COMMIT_MAX_RECORDS,
+    STATUS_CREATED, STATUS_UPDATED, STATUS_UNCHANGED, content_id_for, content_digest
+)
+from metrics import Timer, SEARCH_STAGE_SECONDS, SEARCH_ITEMS_SCANNED, SEARCH_BYTES_READ, SEARCH_QUERIES, SEARCH_RESULTS
+
+logger = logging.getLogger(__name__)
+
+SQLITE_DB_FILENAME = "learning_content.db"
+# trigram 토크나이저가 매칭할 수 있는 최소 질의 길이
+FTS_MIN_QUERY_LENGTH = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL DEFAULT '',
+    grade TEXT NOT NULL DEFAULT '',
+    difficulty TEXT NOT NULL DEFAULT '',
+    constitution TEXT NOT NULL DEFAULT '',
+    topic TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    digest TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contents_subject ON contents(subject);
+CREATE INDEX IF NOT EXISTS idx_contents_grade ON contents(grade);
+CREATE INDEX IF NOT EXISTS idx_contents_difficulty ON contents(difficulty);
+CREATE INDEX IF NOT EXISTS idx_contents_constitution ON contents(constitution);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contents_fts USING fts5(
+    topic, content, content='contents', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS contents_ai AFTER INSERT ON contents BEGIN
+    INSERT INTO contents_fts(rowid, topic, content) VALUES (new.rowid, new.topic, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS contents_ad AFTER DELETE ON contents BEGIN
+    INSERT INTO contents_fts(contents_fts, rowid, topic, content) VALUES ('delete', old.rowid, old.topic, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS contents_au AFTER UPDATE ON contents BEGIN
+    INSERT INTO contents_fts(contents_fts, rowid, topic, content) VALUES ('delete', old.rowid, old.topic, old.content);
+    INSERT INTO contents_fts(rowid, topic, content) VALUES (new.rowid, new.topic, new.content);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO contents (id, subject, grade, difficulty, constitution, topic, content, digest, body, created_at, updated_at)
+VALUES (:id, :subject, :grade, :difficulty, :constitution, :topic, :content, :digest, :body, :created_at, :updated_at)
+ON CONFLICT(id) DO UPDATE SET
+    subject = excluded.subject, grade = excluded.grade, difficulty = excluded.difficulty,
+    constitution = excluded.constitution, topic = excluded.topic, content = excluded.content,
+    digest = excluded.digest, body = excluded.body, updated_at = excluded.updated_at
+"""
+
+# 정렬은 파일 백엔드와 같음: 제목 포함 여부, 본문 길이 순
+ORDER_SQL = " ORDER BY instr(lower(c.topic), lower(:query)) > 0 DESC, length(c.content) DESC LIMIT :limit"
+
+def _column(value: Any) -> str:
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _sql_case_safe(query: str) -> bool:
+    """SQLite lower()(ASCII만 변환)와 str.lower() 결과가 같은 질의인지"""
+    return all(ch.isascii() or ch.lower() == ch.upper() for ch in query)
+
+class SqliteContentStore(ContentStoreBase):
+    """학습 콘텐츠 저장소 (SQLite + FTS5)"""
+
+    def __init__(self, db_path: Optional[Path] = None, storage_dir: Optional[Path] = None):
+        if db_path is None:
+            db_path = os.getenv("LEARNING_STORE_DB_PATH") or \
+                Path(storage_dir or LEARNING_CONTENT_STORAGE) / SQLITE_DB_FILENAME
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # FTS5 또는 trigram 토크나이저(SQLite 3.34+)가 없는 빌드
+            logger.warning(f"FTS5 trigram 사용 불가, LIKE 검색으로 대체: {e}")
+            self.fts_enabled = False
+
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 (WAL 모드라 읽기 연결끼리, 읽기/쓰기 간 동시 실행 가능)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # ---- 쓰기 ----
+
+    def submit(self, content_data: Dict[str, Any]) -> Future:
+        """
+        학습 콘텐츠 저장 요청
+
+        Returns:
+            (content_id, 상태) 를 결과로 갖는 Future (트랜잭션 커밋 후 완료)
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("저장소가 닫혔습니다.")
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="sqlite-store-writer", daemon=True)
+                self._writer.start()
+            self._queue.put((content_data, future))
+        return future
+
+    def _writer_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < GROUP_COMMIT_MAX_RECORDS:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            entries = [entry for entry in batch if entry is not None]
+            if entries:
+                self._commit(conn, entries)
+            if None in batch:
+                return
+
+    def _commit(self, conn: sqlite3.Connection, entries: List[Tuple[Dict[str, Any], Future]]):
+        """대기 중인 레코드를 한 트랜잭션으로 커밋 (fsync 1회)"""
+        results: List[Tuple[str, str]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for content_data, _future in entries:
+                content_id = content_id_for(content_data)
+                digest = content_digest(content_data)
+                row = conn.execute("SELECT digest, created_at FROM contents WHERE id = ?", (content_id,)).fetchone()
+                if row and row[0] == digest:
+                    results.append((content_id, STATUS_UNCHANGED))
+                    continue
+
+                now = datetime.now().isoformat()
+                content_data["id"] = content_id
+                content_data["createdAt"] = (row[1] if row else None) or now
+                content_data["updatedAt"] = now
+                conn.execute(UPSERT_SQL, {
+                    "id": content_id,
+                    "subject": _column(content_data.get("subject")),
+                    "grade": _column(content_data.get("grade")),
+                    "difficulty": _column(content_data.get("difficulty")),
+                    "constitution": _column(content_data.get("constitution")),
+                    "topic": _column(content_data.get("topic")),
+                    "content": _column(content_data.get("content")),
+                    "digest": digest,
+                    "body": json.dumps(content_data, ensure_ascii=False, default=str),
+                    "created_at": content_data["createdAt"],
+                    "updated_at": now,
+                })
+                results.append((content_id, STATUS_UPDATED if row else STATUS_CREATED))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"학습 콘텐츠 커밋 실패: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in entries:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(entries, results):
+            future.set_result(result)
+
+    def pending_writes(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        """대기 중인 쓰기를 커밋하고 연결 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+    # ---- 읽기 ----
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM contents").fetchone()[0]
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        for (body,) in self._connect().execute("SELECT body FROM contents ORDER BY rowid"):
+            yield json.loads(body)
+
+    def search(self, query: str, subject: Optional[str] = None, limit: int = 10,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """학습 콘텐츠 검색 (FTS5 trigram, 짧은 질의는 LIKE)"""
+        conditions: List[str] = []
+        params: Dict[str, Any] = {"query": query, "limit": limit}
+
+        if subject:
+            conditions.append("c.subject = :subject")
+            params["subject"] = subject
+        for field, value in (filters or {}).items():
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"지원하지 않는 필터: {field}")
+            conditions.append(f"c.{field} = :{field}")
+            params[field] = value
+
+        sql_ordered = _sql_case_safe(query)
+        if not query:
+            source = "contents c"
+            path = "scan"
+        elif self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH:
+            source = "contents_fts f JOIN contents c ON c.rowid = f.rowid"
+            conditions.append("contents_fts MATCH :match")
+            params["match"] = '"' + query.replace('"', '""') + '"'
+            path = "fts"
+        else:
+            source = "contents c"
+            path = "like" if sql_ordered else "scan"
+            if sql_ordered:
+                conditions.append("(c.topic LIKE :pattern ESCAPE '\\' OR c.content LIKE :pattern ESCAPE '\\')")
+                params["pattern"] = _like_pattern(query)
+
+        sql = f"SELECT c.body FROM {source}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        SEARCH_QUERIES.inc(1, "sqlite", path)
+        if sql_ordered:
+            # 매칭/정렬 모두 SQL에서 처리 가능한 질의는 LIMIT 까지 DB에서
+            with Timer(SEARCH_STAGE_SECONDS, "sqlite", "query"):
+                rows = self._connect().execute(sql + ORDER_SQL, params).fetchall()
+            with Timer(SEARCH_STAGE_SECONDS, "sqlite", "decode"):
+                results = [json.loads(body) for (body,) in rows]
+            SEARCH_ITEMS_SCANNED.inc(len(rows), "sqlite")
+            SEARCH_BYTES_READ.inc(sum(len(body) for (body,) in rows), "sqlite")
+            SEARCH_RESULTS.inc(len(results), "sqlite")
+            return results
+
+        # 비ASCII 대소문자가 있는 질의: 후보를 Python 규칙으로 다시 거른 뒤 정렬
+        results = []
+        scanned = 0
+        bytes_read = 0
+        with Timer(SEARCH_STAGE_SECONDS, "sqlite", "scan"):
+            for (body,) in self._connect().execute(sql, params):
+                scanned += 1
+                bytes_read += len(body)
+                content = json.loads(body)
+                if query.lower() in content.get('topic', '').lower() or \
+                   query.lower() in content.get('content', '').lower():
+                    results.append(content)
+        with Timer(SEARCH_STAGE_SECONDS, "sqlite", "rank"):
+            ranked = self._rank(results, query, limit)
+        SEARCH_ITEMS_SCANNED.inc(scanned, "sqlite")
+        SEARCH_BYTES_READ.inc(bytes_read, "sqlite")
+        SEARCH_RESULTS.inc(len(ranked), "sqlite")
+        return ranked
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고정 카탈로그 응답 (체질별 학습 스타일, 암기 기법 등)
+
+서버 시작 시 한 번만 직렬화/압축해 두고 요청마다 바이트를 그대로 돌려줍니다.
+
+- 인코딩별 강한 ETag (본문 해시 + 인코딩 접미사)
+- If-None-Match 가 맞으면 304 (본문 없음)
+- Accept-Encoding 협상: br > gzip > identity (압축본이 더 작을 때만)
+- Cache-Control: public, max-age (LEARNING_STATIC_MAX_AGE, 기본 600초)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from compression import negotiate_encoding
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_MAX_AGE = int(os.getenv("LEARNING_STATIC_MAX_AGE", "600"))
+
+# 선호 순서 (앞쪽이 우선) - 최고 품질 brotli 를 미리 만들어 두므로 br 우선
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+ETAG_SUFFIX = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _matching_etag(if_none_match: Optional[str], etags: List[str]) -> Optional[str]:
+    """If-None-Match 와 맞는 ETag (약한 비교: W/ 접두사 무시)"""
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etags[0]
+    candidates = set()
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        candidates.add(tag[2:] if tag.startswith("W/") else tag)
+    return next((etag for etag in etags if etag in candidates), None)
+
+class StaticResponse:
+    """미리 직렬화/압축한 JSON 응답"""
+
+    def __init__(self, payload: Any, max_age: int = STATIC_MAX_AGE):
+        body = _dumps(payload)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        # 인코딩 → (본문, ETag)
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, f'"{digest}"')}
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                self.variants[encoding] = (data, f'"{digest}{ETAG_SUFFIX[encoding]}"')
+
+        self.etags = [etag for _, etag in self.variants.values()]
+        self.cache_control = f"public, max-age={max_age}"
+
+    def respond(self, request: Request) -> Response:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), list(self.variants), ENCODING_PREFERENCE)
+        body, etag = self.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+        matched = _matching_etag(request.headers.get("if-none-match"), self.etags)
+        if matched:
+            # 클라이언트가 가진 표현(인코딩)의 ETag로 응답
+            return Response(status_code=304, headers={**headers, "ETag": matched})
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -22,6 +22,13 @@ from datetime import datetime
 import logging
 import os
 
+from import_runner import post_with_retry
+
+# 백엔드 공용 모듈 (커리큘럼 인덱스)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from curriculum_index import CurriculumIndex, get_curriculum_index
+from exam_analyzer import CURRICULUM_MAP_PATH, load_exam_analysis_table, lookup_unit_analysis
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -43,73 +50,19 @@ logger.info(f"[Athena Generator] Gemma3 URL: {GEMMA3_URL}")
 # 포트 충돌 방지: Sentinel API(8003)와 분리하여 학습 콘텐츠 API는 8004 포트 사용
 LEARNING_API_BASE = os.getenv("LEARNING_API_BASE") or "http://148.230.97.246:8004"
 
-def load_curriculum_map() -> Dict[str, Any]:
-    """커리큘럼 맵 로드"""
-    map_path = Path("learning-content/curriculum/curriculum_map.json")
+def load_curriculum_index() -> Optional[CurriculumIndex]:
+    """커리큘럼 인덱스 로드 (파일이 바뀌지 않으면 캐시된 인덱스 재사용)"""
+    index = get_curriculum_index(CURRICULUM_MAP_PATH)
     
-    if not map_path.exists():
+    if index is None:
         logger.error("커리큘럼 맵이 없습니다. 먼저 build_curriculum_map.py를 실행하세요.")
-        return {}
-    
-    with open(map_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def load_exam_metadata() -> List[Dict[str, Any]]:
-    """기출문제 메타데이터 로드"""
-    metadata_path = Path("learning-content/kice-exams/metadata/exam_metadata.json")
-    
-    if not metadata_path.exists():
-        logger.warning("기출문제 메타데이터가 없습니다. download_kice_exams.py를 실행하세요.")
-        return []
     
-    with open(metadata_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return index
 
-def analyze_exam_structure(exam_text: str, subject: str) -> Dict[str, Any]:
-    """
-    기출문제 구조 분석
-    
-    Args:
-        exam_text: 기출문제 텍스트
-        subject: 과목 (math 또는 english)
-    
-    Returns:
-        문제 구조 분석 결과 (난이도, 논리 구조, 유형 등)
-    """
-    # 간단한 분석 (실제로는 더 정교한 분석 필요)
-    analysis = {
-        "difficulty": "medium",  # easy, medium, hard
-        "logic_level": 0.5,  # L 차원 (0.0 ~ 1.0)
-        "knowledge_level": 0.5,  # K 차원
-        "problem_type": "standard",  # standard, reasoning, application
-        "key_concepts": []
-    }
-    
-    # 수학 문제 분석
-    if subject == "math":
-        # 고난도 문제 키워드
-        if any(keyword in exam_text for keyword in ["증명", "최댓값", "최솟값", "극값", "적분", "미분"]):
-            analysis["difficulty"] = "hard"
-            analysis["logic_level"] = 0.8
-        
-        # 개념 추출 (간단한 예시)
-        if "이차함수" in exam_text:
-            analysis["key_concepts"].append("이차함수")
-        if "삼각함수" in exam_text:
-            analysis["key_concepts"].append("삼각함수")
-    
-    # 영어 문제 분석
-    elif subject == "english":
-        # 고난도 문제 키워드
-        if any(keyword in exam_text for keyword in ["infer", "imply", "suggest", "추론"]):
-            analysis["difficulty"] = "hard"
-            analysis["logic_level"] = 0.7
-        
-        # 문법 개념 추출
-        if "가정법" in exam_text or "subjunctive" in exam_text.lower():
-            analysis["key_concepts"].append("가정법")
-    
-    return analysis
+def load_curriculum_map() -> Dict[str, Any]:
+    """커리큘럼 맵 로드"""
+    index = load_curriculum_index()
+    return index.curriculum_map if index else {}
 
 def generate_problem_with_gemini(
     curriculum_unit: Dict[str, Any],
@@ -304,7 +257,7 @@ def save_problem_to_api(problem_data: Dict[str, Any]) -> bool:
             "updatedAt": problem_data.get("createdAt")
         }
         
-        response = requests.post(
+        response = post_with_retry(
             f"{LEARNING_API_BASE}/api/v1/learning/store",
             json=content_data,  # 백엔드 API는 content_data를 직접 받음
             headers={"Content-Type": "application/json"},
@@ -349,35 +302,31 @@ def generate_problems_for_curriculum(
     """
     logger.info(f"문제 생성 시작: {grade} {subject}")
     
-    # 커리큘럼 맵 로드
-    curriculum_map = load_curriculum_map()
+    # 커리큘럼 인덱스 로드
+    curriculum_index = load_curriculum_index()
     
-    if not curriculum_map or "subjects" not in curriculum_map:
+    if curriculum_index is None:
         logger.error("커리큘럼 맵을 로드할 수 없습니다.")
         return []
     
-    grade_data = curriculum_map.get("subjects", {}).get(subject, {}).get(grade, {})
-    units = grade_data.get("units", [])
+    units = curriculum_index.grade_units(subject, grade)
     
     if not units:
         logger.warning(f"{grade} {subject} 커리큘럼이 없습니다.")
         return []
     
-    # 기출문제 분석 (선택적)
-    exam_metadata = load_exam_metadata()
-    exam_analysis = None
-    if exam_metadata:
-        # 해당 과목의 최근 기출문제 분석 (간단한 예시)
-        recent_exams = [e for e in exam_metadata if e.get("subject") == subject][:5]
-        if recent_exams:
-            # 실제로는 기출문제 텍스트를 분석해야 함
-            exam_analysis = {"logic_level": 0.7, "knowledge_level": 0.6}
+    # 기출문제 분석표 (캐시된 단원별 통계, 없으면 None)
+    exam_table = load_exam_analysis_table(curriculum_index.curriculum_map)
+    if not exam_table:
+        logger.warning("기출문제 분석표가 없습니다. download_kice_exams.py --download --extract 를 실행하세요.")
     
     generated_problems = []
     
     for unit in units:
         logger.info(f"  - 단원: {unit.get('unit', 'Unknown')}")
         
+        exam_analysis = lookup_unit_analysis(exam_table, subject, unit.get("unit", ""))
+        
         for i in range(num_problems_per_unit):
             # 난이도 다양화
             difficulty = ["easy", "medium", "hard"][i % 3]
@@ -409,9 +358,7 @@ def main():
     logger.info("=" * 60)
     
     # 커리큘럼 맵 확인
-    curriculum_map = load_curriculum_map()
-    if not curriculum_map:
-        logger.error("커리큘럼 맵이 없습니다. 먼저 build_curriculum_map.py를 실행하세요.")
+    if load_curriculum_index() is None:
         return
     
     # 문제 생성 (예시: 중2 수학)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 응답 압축 벤치마크 (대역폭 / 지연 시간)
+
+/api/v1/learning/search 응답과 같은 형태(한글 본문 JSON)를 인코딩/레벨별로 압축해
+크기, 압축/해제 시간, 링크 대역폭별 예상 전송 시간을 비교합니다.
+
+- 인코딩: gzip 1/6/9, br 1/5/11, zstd 1/3/9/19 (설치된 라이브러리만)
+- 예상 지연 = 압축 + 전송(크기 / 대역폭) + 해제
+- 미들웨어: CompressionMiddleware 를 직접 호출한 요청당 비용 (캐시 적중 포함)
+- NDJSON: 줄 단위 flush 스트리밍 압축 vs 한 번에 압축한 크기
+
+사용 예:
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py --sizes 10 50 200 --bandwidth-mbps 5 20 100 --output compression.json
+"""
+
+import sys
+import json
+import zlib
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Tuple
+import logging
+
+from benchmark_serialization import stored_items, stdlib_render, time_per_call
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from compression import (
+    CompressionMiddleware, StreamCompressor, available_encodings, compress_bytes,
+    brotli, zstandard, GZIP_LEVEL, BROTLI_QUALITY, ZSTD_LEVEL,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ENCODING_LEVELS = {
+    "gzip": ("gzip_level", [1, 6, 9]),
+    "br": ("brotli_quality", [1, 5, 11]),
+    "zstd": ("zstd_level", [1, 3, 9, 19]),
+}
+DEFAULT_LEVELS = {"gzip": GZIP_LEVEL, "br": BROTLI_QUALITY, "zstd": ZSTD_LEVEL}
+
+def decompressor(encoding: str) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        return lambda data: zlib.decompress(data, 47)
+    if encoding == "br":
+        return brotli.decompress
+    # 스트리밍 압축 결과에는 원본 크기가 없으므로 decompressobj 사용
+    return lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+def transfer_ms(size: int, bandwidth_mbps: float) -> float:
+    return size * 8 / (bandwidth_mbps * 1_000_000) * 1000
+
+def benchmark_encodings(body: bytes, bandwidths: List[float], min_seconds: float) -> List[Dict[str, Any]]:
+    rows = [{
+        "encoding": "identity",
+        "level": None,
+        "bytes": len(body),
+        "ratio": 1.0,
+        "compressUs": 0.0,
+        "decompressUs": 0.0,
+        "latencyMs": {str(bw): round(transfer_ms(len(body), bw), 3) for bw in bandwidths},
+    }]
+    for encoding in available_encodings():
+        if encoding == "identity":
+            continue
+        option, levels = ENCODING_LEVELS[encoding]
+        decompress = decompressor(encoding)
+        for level in levels:
+            compressed = compress_bytes(body, encoding, **{option: level})
+            assert decompress(compressed) == body
+            compress_us = time_per_call(lambda: compress_bytes(body, encoding, **{option: level}), min_seconds)
+            decompress_us = time_per_call(lambda: decompress(compressed), min_seconds)
+            rows.append({
+                "encoding": encoding,
+                "level": level,
+                "bytes": len(compressed),
+                "ratio": round(len(body) / len(compressed), 2),
+                "compressUs": round(compress_us, 1),
+                "decompressUs": round(decompress_us, 1),
+                "latencyMs": {
+                    str(bw): round((compress_us + decompress_us) / 1000 + transfer_ms(len(compressed), bw), 3)
+                    for bw in bandwidths
+                },
+            })
+    return rows
+
+def _asgi_app(body: bytes, headers: List[Tuple[bytes, bytes]]):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+def benchmark_middleware(body: bytes, min_seconds: float) -> Dict[str, Any]:
+    """미들웨어를 거친 요청당 비용 (동적 응답 / 캐시 가능한 응답)"""
+    loop = asyncio.new_event_loop()
+    results: Dict[str, Any] = {}
+
+    async def noop_send(message):
+        pass
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    json_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    apps = {
+        "dynamic": _asgi_app(body, json_headers),
+        "cacheable": _asgi_app(body, json_headers + [(b"etag", b'"bench"'), (b"cache-control", b"public, max-age=600")]),
+    }
+    try:
+        for encoding in available_encodings():
+            scope = {"type": "http", "headers": [(b"accept-encoding", encoding.encode())]}
+            for name, app in apps.items():
+                middleware = CompressionMiddleware(app)
+                us = time_per_call(lambda: loop.run_until_complete(middleware(scope, receive, noop_send)), min_seconds)
+                results[f"{encoding}.{name}"] = round(us, 1)
+    finally:
+        loop.close()
+    return results
+
+def benchmark_ndjson(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """줄 단위 flush 스트리밍 압축 크기 vs 한 번에 압축한 크기"""
+    lines = [stdlib_render(item) + b"\n" for item in items]
+    whole = b"".join(lines)
+    results: Dict[str, Any] = {"identity": len(whole)}
+    for encoding in available_encodings():
+        if encoding == "identity":
+            continue
+        compressor = StreamCompressor(encoding)
+        streamed = sum(len(compressor.compress(line, flush=True)) for line in lines) + len(compressor.finish())
+        results[encoding] = {
+            "streamedBytes": streamed,
+            "oneShotBytes": len(compress_bytes(whole, encoding)),
+            "defaultLevel": DEFAULT_LEVELS[encoding],
+        }
+    return results
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="검색 응답 압축 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 50, 200], help="검색 응답 결과 수")
+    parser.add_argument("--bandwidth-mbps", nargs="+", type=float, default=[5.0, 20.0, 100.0], help="링크 대역폭 (Mbps)")
+    parser.add_argument("--min-seconds", type=float, default=0.3, help="케이스별 최소 측정 시간")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "encodings": [e for e in available_encodings() if e != "identity"],
+        "bandwidthMbps": args.bandwidth_mbps,
+        "searchResponse": {},
+    }
+    if brotli is None or zstandard is None:
+        logger.warning("⚠️ brotli/zstandard 미설치 - 설치된 인코딩만 측정합니다")
+
+    for size in args.sizes:
+        items = stored_items(size)
+        body = stdlib_render({"results": items})
+        logger.info(f"결과 {size}개: {len(body):,} bytes")
+        report["searchResponse"][str(size)] = {
+            "bytes": len(body),
+            "encodings": benchmark_encodings(body, args.bandwidth_mbps, args.min_seconds),
+            "middlewareUs": benchmark_middleware(body, args.min_seconds),
+            "ndjson": benchmark_ndjson(items),
+        }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"✅ 결과 저장: {args.output}")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+콘텐츠 수집 파이프라인 종단 벤치마크 (로컬 스텁 대상, 오프라인)
+
+local_api_stub.py 스텁 서버를 띄우고 실제 스크립트 코드를 그대로 돌려
+단계별 items/sec 와 꼬리 지연을 측정합니다.
+
+- generate:  athena_generator (Ollama /api/generate → /api/v1/learning/store 건별 저장)
+- vectorize: vectorize_learning_content (/api/v1/vectorize)
+- import:    import_runner.run_import 합성 EBS 형식 샤드 (/api/v1/learning/store/batch)
+- import_ebs: import_ebs_content 의 실제 EBS 교과과정 샤드
+
+각 단계는 클라이언트 측 호출 지연(generate/vectorize)과 스텁 측 라우트별 처리 시간을 함께 보고합니다.
+스크립트의 API 주소(모듈 상수)는 실행 중에만 스텁 주소로 바꿉니다.
+
+사용 예:
+    python scripts/benchmark_ingest_pipeline.py
+    python scripts/benchmark_ingest_pipeline.py --problems 200 --import-items 50000 --workers 4 --output ingest.json
+    python scripts/benchmark_ingest_pipeline.py --latency-ms generate=1500 --error-rate 0.05
+    python scripts/benchmark_ingest_pipeline.py --stub-url http://127.0.0.1:18004
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+import logging
+
+import requests
+
+from synthetic_learning_content import iter_synthetic_items, TOPIC_WORDS, CONSTITUTIONS, DIFFICULTIES
+from benchmark_learning_store import percentile
+from local_api_stub import LocalApiStub, add_stub_arguments, config_from_args
+from import_runner import ImportShard, run_import
+import athena_generator
+import vectorize_learning_content
+import import_ebs_content
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+STAGES = ["generate", "vectorize", "import", "import_ebs"]
+
+def _latency_summary(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "meanMs": round(statistics.mean(values), 3),
+        "p50Ms": round(percentile(values, 50), 3),
+        "p95Ms": round(percentile(values, 95), 3),
+        "p99Ms": round(percentile(values, 99), 3),
+        "maxMs": round(max(values), 3),
+    }
+
+def _stub_stats(stub_url: str) -> Dict[str, Any]:
+    return requests.get(f"{stub_url}/stub/stats", timeout=10).json()["routes"]
+
+def _reset_stub(stub_url: str):
+    requests.post(f"{stub_url}/stub/reset", timeout=10)
+
+def _timed_map(fn: Callable[[Any], Any], inputs: List[Any], concurrency: int) -> List[tuple]:
+    """[(결과, 지연 ms)] - concurrency 개 스레드로 실행"""
+    def call(value):
+        started = time.perf_counter()
+        result = fn(value)
+        return result, (time.perf_counter() - started) * 1000
+
+    if concurrency <= 1:
+        return [call(value) for value in inputs]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(call, inputs))
+
+def stage_generate(count: int, concurrency: int) -> Dict[str, Any]:
+    """athena_generator: 문제 생성 + 건별 저장"""
+    rng = random.Random(5)
+    requests_ = []
+    for _ in range(count):
+        unit = rng.choice(TOPIC_WORDS["math"])
+        requests_.append(({"unit": unit, "topics": [unit] + rng.sample(TOPIC_WORDS["math"], 2)},
+                          rng.choice(CONSTITUTIONS), rng.choice(DIFFICULTIES)))
+
+    def generate(args):
+        unit, constitution, difficulty = args
+        return athena_generator.generate_problem_with_gemma3(unit, None, constitution, difficulty)
+
+    started = time.perf_counter()
+    generated = _timed_map(generate, requests_, concurrency)
+    problems = [{**problem, "subject": "math"} for problem, _ in generated if problem]
+    saved = _timed_map(athena_generator.save_problem_to_api, problems, concurrency)
+    elapsed = time.perf_counter() - started
+    return {
+        "items": count,
+        "generated": len(problems),
+        "saved": sum(1 for ok, _ in saved if ok),
+        "seconds": round(elapsed, 3),
+        "itemsPerSecond": round(count / elapsed, 2),
+        "client": {
+            "generate": _latency_summary([ms for _, ms in generated]),
+            "store": _latency_summary([ms for _, ms in saved]),
+        },
+        "problems": problems,
+    }
+
+def stage_vectorize(items: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    """vectorize_learning_content: 항목별 4D 벡터화"""
+    def vectorize(item):
+        return vectorize_learning_content.vectorize_content(item["content"], item["subject"], item["topic"])
+
+    started = time.perf_counter()
+    results = _timed_map(vectorize, items, concurrency)
+    elapsed = time.perf_counter() - started
+    return {
+        "items": len(items),
+        "seconds": round(elapsed, 3),
+        "itemsPerSecond": round(len(items) / elapsed, 2) if elapsed else None,
+        "client": {"vectorize": _latency_summary([ms for _, ms in results])},
+    }
+
+def stage_import(shards: List[ImportShard], stub_url: str, workers: int, batch_size: int,
+                 report_dir: Path, source: str) -> Dict[str, Any]:
+    """import_runner: 샤드 → 배치 저장"""
+    report = run_import(source, shards, stub_url, workers=workers, batch_size=batch_size,
+                        report_path=report_dir / f"{source}.json")
+    return {key: report[key] for key in (
+        "items", "saved", "failed", "failedShards", "workers", "batchSize", "elapsedSeconds",
+        "itemsPerSecond", "bytesPerSecond"
+    )}
+
+def _point_scripts_at(stub_url: str):
+    # 모듈 상수로 정해진 VPS 주소를 스텁으로 (이 프로세스에서만)
+    athena_generator.GEMMA3_URL = stub_url
+    athena_generator.LEARNING_API_BASE = stub_url
+    vectorize_learning_content.VECTORIZE_API = f"{stub_url}/api/v1/vectorize"
+    import_ebs_content.API_BASE = stub_url
+    for name in ("athena_generator", "vectorize_learning_content", "import_runner"):
+        # 항목마다 찍히는 INFO 로그가 측정을 왜곡하지 않도록
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+def run(args, stub_url: str) -> Dict[str, Any]:
+    _point_scripts_at(stub_url)
+    stages: Dict[str, Any] = {}
+    corpus: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="ingest-bench-") as tmp:
+        for stage in args.stages:
+            logger.info(f"▶ 단계: {stage}")
+            _reset_stub(stub_url)
+            if stage == "generate":
+                result = stage_generate(args.problems, args.concurrency)
+                corpus = [
+                    {"subject": p["subject"], "topic": p["unit"], "content": p["problem"]}
+                    for p in result.pop("problems")
+                ]
+            elif stage == "vectorize":
+                items = corpus or list(iter_synthetic_items(args.vectorize_items, shape="mixed"))
+                result = stage_vectorize(items, args.concurrency)
+            elif stage == "import":
+                per_shard = max(1, args.import_items // args.shards)
+                shards = [
+                    ImportShard(f"synthetic.{i}", iter_synthetic_items, (per_shard, 100 + i, "ebs"))
+                    for i in range(args.shards)
+                ]
+                result = stage_import(shards, stub_url, args.workers, args.batch_size, Path(tmp), "bench_synthetic")
+            else:
+                shards = [
+                    ImportShard(f"{subject}.{grade}", import_ebs_content.iter_ebs_contents, (grade, subject))
+                    for subject, curriculum in import_ebs_content.EBS_CURRICULA.items()
+                    for grade in curriculum
+                ]
+                result = stage_import(shards, stub_url, args.workers, args.batch_size, Path(tmp), "bench_ebs")
+            result["stub"] = _stub_stats(stub_url)
+            stages[stage] = result
+            logger.info(f"✅ {stage}: {result.get('itemsPerSecond')} items/s")
+    return stages
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="콘텐츠 수집 파이프라인 종단 벤치마크")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--problems", type=int, default=50, help="generate 단계 문제 수")
+    parser.add_argument("--vectorize-items", type=int, default=500, help="generate 없이 vectorize 만 돌릴 때 항목 수")
+    parser.add_argument("--import-items", type=int, default=10000, help="import 단계 합성 항목 수")
+    parser.add_argument("--shards", type=int, default=8, help="import 단계 샤드 수")
+    parser.add_argument("--workers", type=int, default=1, help="임포트 워커 프로세스 수")
+    parser.add_argument("--batch-size", type=int, default=100, help="임포트 배치 크기")
+    parser.add_argument("--concurrency", type=int, default=1, help="generate/vectorize 동시 호출 수 (스크립트 기본은 1)")
+    parser.add_argument("--stub-url", help="이미 실행 중인 스텁 주소 (없으면 이 프로세스에서 실행)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = config_from_args(args)
+    if args.stub_url:
+        stages = run(args, args.stub_url.rstrip("/"))
+    else:
+        with LocalApiStub(config) as stub:
+            logger.info(f"🧪 스텁 서버: {stub.base_url}")
+            stages = run(args, stub.base_url)
+
+    report = {
+        "stub": args.stub_url or "in-process",
+        "latencyMs": config.latency_ms,
+        "jitter": config.jitter,
+        "errorRate": config.error_rate,
+        "concurrency": args.concurrency,
+        "stages": stages,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"✅ 결과 저장: {args.output}")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
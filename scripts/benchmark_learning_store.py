@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 저장소 백엔드 벤치마크 (file / sqlite / packed)
+
+EBS 임포트·생성 문제 형식의 합성 코퍼스(기본 1k, 10k, 100k, 1M개)를 임시 디렉토리에 저장한 뒤
+크기 × 백엔드마다 다음을 측정해 JSON으로 출력합니다. (--output 결과끼리 비교해 회귀 확인)
+
+- 쓰기: 처리량, 디스크 사용량
+- 콜드 스타트: 저장소 열기(복구 포함) 시간, 첫 검색 시간
+- 검색: 질의 유형별 mean / p50 / p95 / p99
+- 메모리: 열기 + 첫 검색의 Python 힙(tracemalloc) 증가량/피크, 프로세스 RSS
+
+packed 는 .mkmc 압축 포맷(convert_content_format.py)을 mmap으로 여는 읽기 전용 인덱스입니다.
+1M개 file 백엔드는 JSON 파일 100만 개를 만들므로 디스크/시간이 많이 듭니다.
+
+사용 예:
+    python scripts/benchmark_learning_store.py
+    python scripts/benchmark_learning_store.py --sizes 1000 10000 --backends sqlite packed --output store_bench.json
+    python scripts/benchmark_learning_store.py --count 20000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+import statistics
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator
+import logging
+
+# 백엔드 공용 모듈 (저장소)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from learning_content_store import create_content_store, ContentStoreBase
+from content_format import write_packed_content
+
+from synthetic_learning_content import iter_synthetic_items, SHAPES
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BACKENDS = ["file", "sqlite", "packed"]
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+# 쓰기 시 한 번에 제출해 두는 최대 건수 (1M개 Future를 한꺼번에 들고 있지 않도록)
+SUBMIT_WINDOW = 10000
+
+# (이름, 질의, 과목) - 2글자(LIKE 경로), 3글자 이상(FTS 경로), 영문, 없는 단어
+SEARCH_CASES = [
+    ("short_ko", "확률", None),
+    ("long_ko", "이차함수", None),
+    ("long_ko_subject", "이차함수", "math"),
+    ("ascii", "grammar", None),
+    ("miss", "존재하지않는단어", None),
+]
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def rss_bytes() -> Optional[int]:
+    """현재 프로세스 RSS (Linux /proc 기준, 없으면 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def disk_bytes(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+class _PackedBackend:
+    """packed(.mkmc) 를 저장소와 같은 방식(search)으로 측정하기 위한 얇은 래퍼"""
+
+    def __init__(self, path: Path):
+        self.reader = ContentStoreBase.open_packed(path)
+
+    def search(self, query: str, subject: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        return ContentStoreBase.search_packed(self.reader, query, subject=subject, limit=limit)
+
+    def close(self):
+        self.reader.close()
+
+def _write(backend: str, items: Iterator[Dict[str, Any]], target: Path) -> int:
+    if backend == "packed":
+        return write_packed_content(items, target)
+
+    store = create_content_store(backend, target)
+    count = 0
+    pending = []
+    for item in items:
+        pending.append(store.submit(item))
+        count += 1
+        if len(pending) >= SUBMIT_WINDOW:
+            for future in pending:
+                future.result()
+            pending = []
+    for future in pending:
+        future.result()
+    store.close()
+    return count
+
+def _open(backend: str, target: Path):
+    if backend == "packed":
+        return _PackedBackend(target)
+    return create_content_store(backend, target)
+
+def _cold_start(backend: str, target: Path) -> Dict[str, Any]:
+    """열기(복구 포함) + 첫 검색 시간"""
+    started = time.perf_counter()
+    store = _open(backend, target)
+    opened = time.perf_counter()
+    store.search(SEARCH_CASES[1][1], limit=10)
+    finished = time.perf_counter()
+    store.close()
+    return {
+        "openMs": round((opened - started) * 1000, 2),
+        "firstSearchMs": round((finished - opened) * 1000, 2),
+        "totalMs": round((finished - started) * 1000, 2),
+    }
+
+def _memory(backend: str, target: Path) -> Dict[str, Any]:
+    """열기 + 첫 검색 동안의 Python 힙 (tracemalloc 때문에 시간 측정과 분리해서 실행)"""
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    try:
+        store = _open(backend, target)
+        opened, _ = tracemalloc.get_traced_memory()
+        store.search(SEARCH_CASES[1][1], limit=10)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_after = rss_bytes()
+    store.close()
+    return {
+        "openHeapBytes": opened,
+        "retainedHeapBytes": retained,
+        "searchPeakHeapBytes": peak,
+        "rssDeltaBytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+    }
+
+def _searches(store, repeat: int) -> Dict[str, Any]:
+    searches = {}
+    for name, query, subject in SEARCH_CASES:
+        timings = []
+        hits = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = len(store.search(query, subject=subject, limit=10))
+            timings.append((time.perf_counter() - started) * 1000)
+        searches[name] = {
+            "query": query,
+            "subject": subject,
+            "hits": hits,
+            "meanMs": round(statistics.mean(timings), 3),
+            "p50Ms": round(percentile(timings, 50), 3),
+            "p95Ms": round(percentile(timings, 95), 3),
+            "p99Ms": round(percentile(timings, 99), 3),
+        }
+    return searches
+
+def benchmark_backend(backend: str, count: int, repeat: int, work_dir: Path, shape: str = "mixed",
+                      seed: int = 42) -> Dict[str, Any]:
+    target = work_dir / (f"{backend}.mkmc" if backend == "packed" else backend)
+    result: Dict[str, Any] = {"backend": backend, "items": count}
+
+    # 쓰기: 창 단위로 제출한 뒤 커밋 대기 (group commit 포함)
+    started = time.perf_counter()
+    written = _write(backend, iter_synthetic_items(count, seed, shape), target)
+    elapsed = time.perf_counter() - started
+    result["write"] = {
+        "seconds": round(elapsed, 3),
+        "itemsPerSecond": round(written / elapsed, 1) if elapsed else None,
+        "diskBytes": disk_bytes(target),
+    }
+
+    # 재시작 후 첫 검색 (열기 + 복구 + 첫 쿼리), 메모리는 별도 실행
+    result["coldStart"] = _cold_start(backend, target)
+    result["memory"] = _memory(backend, target)
+
+    store = _open(backend, target)
+    try:
+        result["search"] = _searches(store, repeat)
+    finally:
+        store.close()
+    return result
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="학습 콘텐츠 저장소 백엔드 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="코퍼스 크기 목록")
+    parser.add_argument("--count", type=int, help="크기 하나만 측정 (--sizes 대신)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--shape", choices=SHAPES, default="mixed", help="합성 콘텐츠 형식")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="검색 반복 횟수")
+    parser.add_argument("--work-dir", type=Path, help="저장 위치 (기본: 임시 디렉토리, 측정 후 삭제)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    sizes = [args.count] if args.count else args.sizes
+    results = []
+    with tempfile.TemporaryDirectory(prefix="store-bench-", dir=args.work_dir) as tmp:
+        for count in sizes:
+            for backend in args.backends:
+                logger.info(f"벤치마크: {backend} ({count}개)")
+                run_dir = Path(tmp) / str(count)
+                run_dir.mkdir(exist_ok=True)
+                results.append(benchmark_backend(backend, count, args.repeat, run_dir, args.shape, args.seed))
+
+    report = {
+        "sizes": sizes,
+        "shape": args.shape,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"✅ 결과 저장: {args.output}")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 응답 직렬화 / 일괄 저장 요청 파싱 마이크로 벤치마크
+
+- 검색 응답: FastAPI 기본 경로(jsonable_encoder + json.dumps) vs orjson vs pydantic 모델 dump_json
+- 일괄 저장 요청: json.loads vs orjson.loads (+ pydantic 항목 검증)
+
+설치되지 않은 라이브러리 항목은 건너뜁니다.
+
+사용 예:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --sizes 10 100 500 --output serialization.json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+import logging
+
+from synthetic_learning_content import synthetic_items
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+try:
+    from pydantic import TypeAdapter
+    from learning_models import LearningContentItem, LearningSearchResponse
+except ImportError:
+    TypeAdapter = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def stored_items(count: int) -> List[Dict[str, Any]]:
+    """저장소에서 읽은 것과 같은 형태 (id/createdAt/updatedAt 포함)"""
+    items = synthetic_items(count)
+    for i, item in enumerate(items):
+        item.update({"id": f"{i:032x}", "createdAt": "2026-01-20T12:00:00", "updatedAt": "2026-01-20T12:00:00"})
+    return items
+
+def time_per_call(fn: Callable[[], Any], min_seconds: float) -> float:
+    """호출당 평균 시간 (마이크로초)"""
+    fn()
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+
+def stdlib_render(payload: Any) -> bytes:
+    # fastapi.responses.JSONResponse.render 와 같은 옵션
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def search_response_cases(payload: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    cases: Dict[str, Callable[[], Any]] = {}
+    if jsonable_encoder is not None:
+        cases["fastapi_default"] = lambda: stdlib_render(jsonable_encoder(payload))
+    cases["json_dumps"] = lambda: stdlib_render(payload)
+    if TypeAdapter is not None:
+        adapter = TypeAdapter(LearningSearchResponse)
+        model = adapter.validate_python(payload)
+        cases["pydantic_dump_json"] = lambda: adapter.dump_json(model)
+    if orjson is not None:
+        cases["orjson"] = lambda: orjson.dumps(payload)
+    return cases
+
+def batch_parse_cases(raw: bytes) -> Dict[str, Callable[[], Any]]:
+    cases: Dict[str, Callable[[], Any]] = {"json_loads": lambda: json.loads(raw)}
+    if orjson is not None:
+        cases["orjson_loads"] = lambda: orjson.loads(raw)
+    if TypeAdapter is not None:
+        loads = orjson.loads if orjson is not None else json.loads
+        cases["orjson_loads_validate" if orjson is not None else "json_loads_validate"] = \
+            lambda: [LearningContentItem.model_validate(item) for item in loads(raw)["items"]]
+    return cases
+
+def run_cases(cases: Dict[str, Callable[[], Any]], baseline: str, min_seconds: float) -> Dict[str, Any]:
+    timings = {name: time_per_call(fn, min_seconds) for name, fn in cases.items()}
+    base = timings.get(baseline)
+    return {
+        name: {"microseconds": round(us, 1), "speedup": round(base / us, 2) if base else None}
+        for name, us in timings.items()
+    }
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="직렬화 마이크로 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 50, 200], help="검색 응답 결과 수")
+    parser.add_argument("--batch-size", type=int, default=500, help="일괄 저장 요청 항목 수")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="케이스별 최소 측정 시간")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    baseline = "fastapi_default" if jsonable_encoder is not None else "json_dumps"
+    report: Dict[str, Any] = {
+        "libraries": {"orjson": orjson is not None, "fastapi": jsonable_encoder is not None, "pydantic": TypeAdapter is not None},
+        "searchResponse": {},
+    }
+
+    for size in args.sizes:
+        payload = {"results": stored_items(size)}
+        report["searchResponse"][str(size)] = {
+            "bytes": len(stdlib_render(payload)),
+            "cases": run_cases(search_response_cases(payload), baseline, args.min_seconds),
+        }
+
+    raw = stdlib_render({"items": synthetic_items(args.batch_size)})
+    report["batchRequest"] = {
+        "items": args.batch_size,
+        "bytes": len(raw),
+        "cases": run_cases(batch_parse_cases(raw), "json_loads", args.min_seconds),
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"✅ 결과 저장: {args.output}")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
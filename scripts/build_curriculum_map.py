@@ -19,7 +19,11 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import logging
 import re
+import os
 import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -161,78 +165,112 @@ STANDARD_CURRICULUM = {
     }
 }
 
-def scrape_ebs_curriculum_tree(url: str, subject: str, grade: str) -> List[Dict[str, Any]]:
+# 수집 계획: (과목, 학년, EBS URL 키)
+CURRICULUM_PLAN = [
+    (subject, grade, f"{subject}_{'middle' if grade.startswith('중') else 'high'}")
+    for subject in ["math", "english"]
+    for grade in ["중1", "중2", "중3", "고1", "고2"]
+]
+
+def fetch_curriculum_source(url: str) -> Optional[str]:
+    """커리큘럼 페이지 HTML 수집 (실패 시 None)"""
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=15)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        logger.warning(f"EBS 커리큘럼 수집 실패 ({url}): {e}")
+        return None
+
+def fetch_curriculum_sources(urls: List[str]) -> Dict[str, Optional[str]]:
     """
-    EBS 목차에서 커리큘럼 트리 구조 추출
+    URL 중복 제거 후 호스트별 병렬 수집
     
-    Args:
-        url: EBS 커리큘럼 페이지 URL
-        subject: 과목 (math 또는 english)
-        grade: 학년 (중1, 중2, 중3, 고1, 고2)
-    
-    Returns:
-        커리큘럼 트리 구조 (단원-주제 리스트)
+    같은 호스트에는 REQUEST_DELAY 간격으로 순차 요청하고,
+    서로 다른 호스트는 동시에 수집합니다.
     """
-    logger.info(f"EBS 커리큘럼 수집: {grade} {subject}")
+    by_host: Dict[str, List[str]] = {}
+    for url in dict.fromkeys(urls):
+        by_host.setdefault(urlparse(url).netloc, []).append(url)
     
-    try:
-        time.sleep(REQUEST_DELAY)
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        curriculum_tree = []
-        
-        # EBS 목차 구조 파싱 (실제 구조에 맞게 수정 필요)
-        # 예시: .curriculum-tree, .chapter-list 등
-        chapters = soup.select('.chapter, .unit, .curriculum-item')
-        
-        for chapter in chapters:
-            try:
-                # 단원명 추출
-                unit_name = chapter.select_one('.title, h3, h4, .name')
-                if not unit_name:
-                    continue
-                
-                unit_title = unit_name.get_text().strip()
-                
-                # 주제(토픽) 추출
-                topics = []
-                topic_elements = chapter.select('.topic, .lesson, .section')
-                for topic_elem in topic_elements:
-                    topic_title = topic_elem.get_text().strip()
-                    if topic_title:
-                        topics.append(topic_title)
-                
-                if not topics:
-                    # 주제가 없으면 단원명만 사용
-                    topics = [unit_title]
-                
-                curriculum_tree.append({
-                    "unit": unit_title,
-                    "topics": topics
-                })
-                
-            except Exception as e:
-                logger.warning(f"단원 파싱 실패: {e}")
+    def fetch_host(host_urls: List[str]) -> Dict[str, Optional[str]]:
+        results = {}
+        for i, url in enumerate(host_urls):
+            if i:
+                time.sleep(REQUEST_DELAY)
+            results[url] = fetch_curriculum_source(url)
+        return results
+    
+    sources: Dict[str, Optional[str]] = {}
+    if not by_host:
+        return sources
+    with ThreadPoolExecutor(max_workers=len(by_host)) as executor:
+        for results in executor.map(fetch_host, by_host.values()):
+            sources.update(results)
+    return sources
+
+def parse_ebs_curriculum_tree(html: str) -> List[Dict[str, Any]]:
+    """EBS 목차 HTML에서 단원-주제 트리 추출 (구조를 찾지 못하면 빈 리스트)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    curriculum_tree = []
+    
+    # EBS 목차 구조 파싱 (실제 구조에 맞게 수정 필요)
+    # 예시: .curriculum-tree, .chapter-list 등
+    chapters = soup.select('.chapter, .unit, .curriculum-item')
+    
+    for chapter in chapters:
+        try:
+            # 단원명 추출
+            unit_name = chapter.select_one('.title, h3, h4, .name')
+            if not unit_name:
                 continue
-        
-        if not curriculum_tree:
-            # EBS에서 수집 실패 시 표준 교육과정 사용
-            logger.warning(f"EBS 수집 실패, 표준 교육과정 사용: {grade} {subject}")
-            return STANDARD_CURRICULUM.get(subject, {}).get(grade, [])
-        
-        logger.info(f"✅ {len(curriculum_tree)}개 단원 수집 완료")
-        return curriculum_tree
-        
-    except Exception as e:
-        logger.warning(f"EBS 커리큘럼 수집 실패 ({url}): {e}, 표준 교육과정 사용")
-        return STANDARD_CURRICULUM.get(subject, {}).get(grade, [])
+            
+            unit_title = unit_name.get_text().strip()
+            
+            # 주제(토픽) 추출
+            topics = []
+            topic_elements = chapter.select('.topic, .lesson, .section')
+            for topic_elem in topic_elements:
+                topic_title = topic_elem.get_text().strip()
+                if topic_title:
+                    topics.append(topic_title)
+            
+            if not topics:
+                # 주제가 없으면 단원명만 사용
+                topics = [unit_title]
+            
+            curriculum_tree.append({
+                "unit": unit_title,
+                "topics": topics
+            })
+            
+        except Exception as e:
+            logger.warning(f"단원 파싱 실패: {e}")
+            continue
+    
+    return curriculum_tree
 
-def build_curriculum_map() -> Dict[str, Any]:
+def _grade_entry(subject: str, grade: str, curriculum_tree: List[Dict[str, Any]], source_url: str) -> Dict[str, Any]:
+    return {
+        "grade": grade,
+        "subject": subject,
+        "units": curriculum_tree,
+        "totalUnits": len(curriculum_tree),
+        "totalTopics": sum(len(unit.get("topics", [])) for unit in curriculum_tree),
+        "sourceUrl": source_url
+    }
+
+def build_curriculum_map(previous_map: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     전체 커리큘럼 맵 구축
     
+    같은 URL은 한 번만 수집/파싱하여 여러 학년이 결과를 공유합니다.
+    이전 맵(previous_map)이 있으면 원본 HTML 해시가 바뀌지 않은 URL의 학년은 이전 결과를 재사용하고,
+    재사용할 수 없는 학년(해시 변경, 이전 맵에 없는 학년)만 파싱합니다.
+    
+    Args:
+        previous_map: 이전에 저장한 커리큘럼 맵 (증분 갱신용)
+    
     Returns:
         전체 커리큘럼 맵 (JSON 구조)
     """
@@ -240,6 +278,10 @@ def build_curriculum_map() -> Dict[str, Any]:
     logger.info("커리큘럼 맵 구축 시작")
     logger.info("=" * 60)
     
+    previous_map = previous_map or {}
+    previous_sources = previous_map.get("sources", {})
+    previous_subjects = previous_map.get("subjects", {})
+    
     curriculum_map = {
         "version": "1.0",
         "createdAt": datetime.now().isoformat(),
@@ -247,52 +289,59 @@ def build_curriculum_map() -> Dict[str, Any]:
         "subjects": {
             "math": {},
             "english": {}
-        }
+        },
+        "sources": {}
     }
     
-    # 수학 커리큘럼 수집
-    logger.info("\n📐 수학 커리큘럼 수집 시작...")
-    for grade in ["중1", "중2", "중3", "고1", "고2"]:
-        logger.info(f"  - {grade} 수학...")
-        
-        # EBS URL 선택
-        if grade.startswith("중"):
-            url = EBS_CURRICULUM_URLS["math_middle"]
-        else:
-            url = EBS_CURRICULUM_URLS["math_high"]
+    # 1. 고유 URL 병렬 수집
+    urls = [EBS_CURRICULUM_URLS[url_key] for _, _, url_key in CURRICULUM_PLAN]
+    logger.info(f"\n🌐 EBS 목차 수집: {len(CURRICULUM_PLAN)}개 학년, 고유 URL {len(set(urls))}개")
+    html_by_url = fetch_curriculum_sources(urls)
+    
+    # 2. URL별 변경 여부 판단
+    changed_urls = set()
+    for url, html in html_by_url.items():
+        if html is None:
+            # 수집 실패: 이전 해시 유지 (이전 학년 데이터 재사용)
+            if url in previous_sources:
+                curriculum_map["sources"][url] = previous_sources[url]
+            continue
         
-        # 커리큘럼 트리 수집
-        curriculum_tree = scrape_ebs_curriculum_tree(url, "math", grade)
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        curriculum_map["sources"][url] = {"sha256": digest, "fetchedAt": datetime.now().isoformat()}
+        if previous_sources.get(url, {}).get("sha256") == digest:
+            curriculum_map["sources"][url]["fetchedAt"] = previous_sources[url].get("fetchedAt")
+            continue
         
-        curriculum_map["subjects"]["math"][grade] = {
-            "grade": grade,
-            "subject": "math",
-            "units": curriculum_tree,
-            "totalUnits": len(curriculum_tree),
-            "totalTopics": sum(len(unit.get("topics", [])) for unit in curriculum_tree)
-        }
+        changed_urls.add(url)
     
-    # 영어 커리큘럼 수집
-    logger.info("\n📖 영어 커리큘럼 수집 시작...")
-    for grade in ["중1", "중2", "중3", "고1", "고2"]:
-        logger.info(f"  - {grade} 영어...")
+    # 3. 학년별 트리 구성 (재사용할 수 없는 학년이 있는 URL만 1회 파싱)
+    parsed_by_url: Dict[str, List[Dict[str, Any]]] = {}
+    reused = 0
+    for subject, grade, url_key in CURRICULUM_PLAN:
+        url = EBS_CURRICULUM_URLS[url_key]
+        previous_entry = previous_subjects.get(subject, {}).get(grade)
         
-        # EBS URL 선택
-        if grade.startswith("중"):
-            url = EBS_CURRICULUM_URLS["english_middle"]
-        else:
-            url = EBS_CURRICULUM_URLS["english_high"]
+        if url not in changed_urls and previous_entry and previous_entry.get("sourceUrl") == url:
+            curriculum_map["subjects"][subject][grade] = previous_entry
+            reused += 1
+            continue
         
-        # 커리큘럼 트리 수집
-        curriculum_tree = scrape_ebs_curriculum_tree(url, "english", grade)
+        html = html_by_url.get(url)
+        if html is not None and url not in parsed_by_url:
+            parsed_by_url[url] = parse_ebs_curriculum_tree(html)
+        curriculum_tree = parsed_by_url.get(url) or []
+        if curriculum_tree:
+            logger.info(f"  ✅ {grade} {subject}: {len(curriculum_tree)}개 단원 수집")
+        else:
+            # EBS에서 수집/파싱 실패 시 표준 교육과정 사용
+            reason = "EBS 수집 실패" if html is None else "EBS 목차 파싱 결과 없음"
+            logger.warning(f"  {reason}, 표준 교육과정 사용: {grade} {subject}")
+            curriculum_tree = STANDARD_CURRICULUM.get(subject, {}).get(grade, [])
         
-        curriculum_map["subjects"]["english"][grade] = {
-            "grade": grade,
-            "subject": "english",
-            "units": curriculum_tree,
-            "totalUnits": len(curriculum_tree),
-            "totalTopics": sum(len(unit.get("topics", [])) for unit in curriculum_tree)
-        }
+        curriculum_map["subjects"][subject][grade] = _grade_entry(subject, grade, curriculum_tree, url)
+    
+    logger.info(f"  재사용 {reused}개 학년, 재파싱 {len(CURRICULUM_PLAN) - reused}개 학년")
     
     # 통계 계산
     total_units = sum(
@@ -323,25 +372,48 @@ def build_curriculum_map() -> Dict[str, Any]:
     
     return curriculum_map
 
+def load_previous_curriculum_map(output_path: Path) -> Dict[str, Any]:
+    """이전 커리큘럼 맵 로드 (없거나 손상된 경우 빈 dict)"""
+    if not output_path.exists():
+        return {}
+    try:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"이전 커리큘럼 맵 로드 실패, 전체 재구축: {e}")
+        return {}
+
 def save_curriculum_map(curriculum_map: Dict[str, Any], output_path: Path):
     """커리큘럼 맵을 JSON 파일로 저장"""
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
+    # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(curriculum_map, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
     
     logger.info(f"✅ 커리큘럼 맵 저장 완료: {output_path}")
 
 def main():
     """메인 함수"""
-    # 커리큘럼 맵 구축
-    curriculum_map = build_curriculum_map()
-    
     # 저장 경로
     output_dir = Path("learning-content/curriculum")
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / "curriculum_map.json"
     
+    # 커리큘럼 맵 구축 (이전 맵 기준 증분 갱신)
+    previous_map = load_previous_curriculum_map(output_path)
+    curriculum_map = build_curriculum_map(previous_map)
+    
+    # 변경이 없으면 파일을 다시 쓰지 않음 (다른 프로세스의 인덱스 캐시 유지)
+    if previous_map and previous_map.get("subjects") == curriculum_map["subjects"] \
+            and previous_map.get("sources") == curriculum_map["sources"]:
+        logger.info("✅ 커리큘럼 변경 없음, 저장 생략")
+        return
+    
     # 저장
     save_curriculum_map(curriculum_map, output_path)
     
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 포맷 변환 스크립트
+
+들여쓰기 JSON(생성 문제, 벡터화 결과, 저장소 파일) ↔ .mkmc 압축 바이너리 포맷 변환
+
+사용 예:
+    python scripts/convert_content_format.py to-packed learning-content/generated-problems -o corpus.mkmc
+    python scripts/convert_content_format.py to-json corpus.mkmc -o corpus.json
+    python scripts/convert_content_format.py info corpus.mkmc
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator
+import logging
+
+# 백엔드 공용 모듈 (압축 포맷)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from content_format import PackedContentReader, write_packed_content, read_json_content
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def iter_json_inputs(inputs: List[Path]) -> Iterator[Dict[str, Any]]:
+    """JSON 파일/디렉토리에서 콘텐츠 레코드 순회 (디렉토리는 *.json 전체)"""
+    for input_path in inputs:
+        files = sorted(input_path.glob("*.json")) if input_path.is_dir() else [input_path]
+        for json_file in files:
+            try:
+                yield from read_json_content(json_file)
+            except Exception as e:
+                logger.warning(f"파일 읽기 실패 ({json_file}): {e}")
+
+def input_size(inputs: List[Path]) -> int:
+    total = 0
+    for input_path in inputs:
+        files = input_path.glob("*.json") if input_path.is_dir() else [input_path]
+        total += sum(f.stat().st_size for f in files if f.exists())
+    return total
+
+def to_packed(args: argparse.Namespace) -> int:
+    count = write_packed_content(iter_json_inputs(args.inputs), args.output)
+    json_size = input_size(args.inputs)
+    packed_size = args.output.stat().st_size
+    ratio = packed_size / json_size if json_size else 0
+    logger.info(f"✅ 변환 완료: {count}개 레코드, JSON {json_size:,}B → .mkmc {packed_size:,}B ({ratio:.0%})")
+    return 0
+
+def to_json(args: argparse.Namespace) -> int:
+    with PackedContentReader(args.inputs[0]) as reader:
+        items = list(reader)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    logger.info(f"✅ 변환 완료: {len(items)}개 레코드 → {args.output}")
+    return 0
+
+def info(args: argparse.Namespace) -> int:
+    with PackedContentReader(args.inputs[0]) as reader:
+        # 벡터가 없는 레코드는 NaN으로 저장됨 (NaN != NaN)
+        vectorized = sum(1 for row in reader.vectors.tolist() if row[0] == row[0]) if len(reader) else 0
+        summary = {
+            "path": str(reader.path),
+            "records": len(reader),
+            "bytes": reader.path.stat().st_size,
+            "vectorized": vectorized,
+            "subjects": reader.meta.get("subjects", []),
+            "difficulties": reader.meta.get("difficulties", []),
+        }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="학습 콘텐츠 JSON ↔ .mkmc 변환")
+    parser.add_argument("command", choices=["to-packed", "to-json", "info"])
+    parser.add_argument("inputs", nargs="+", type=Path, help="입력 파일/디렉토리")
+    parser.add_argument("-o", "--output", type=Path, help="출력 경로")
+    args = parser.parse_args(argv)
+
+    if args.command != "info" and not args.output:
+        parser.error("-o/--output 이 필요합니다.")
+
+    return {"to-packed": to_packed, "to-json": to_json, "info": info}[args.command](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
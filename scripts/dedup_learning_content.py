@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 저장소 중복 정리 스크립트
+
+예전 저장소는 저장 시각으로 ID를 만들어, 임포터를 다시 실행할 때마다 같은 콘텐츠가
+새 파일로 쌓였습니다. 이 스크립트는 저장소의 JSON 파일을 콘텐츠 해시 ID로 묶어
+그룹마다 파일 1개만 남깁니다.
+
+- 남기는 본문: 그룹에서 updatedAt 이 가장 늦은 레코드
+- createdAt: 그룹에서 가장 이른 값
+- 파일명/ID: LearningContentStore 와 같은 결정적 ID
+
+기본은 변경 없이 결과만 출력(dry-run)하며, --apply 를 주면 실제로 정리합니다.
+API 서버는 해시 인덱스를 메모리에 들고 있으므로 정리 후 재시작하세요.
+
+사용 예:
+    python scripts/dedup_learning_content.py /var/www/mkm-study/learning-content
+    python scripts/dedup_learning_content.py /var/www/mkm-study/learning-content --apply
+"""
+
+import sys
+import json
+import os
+import argparse
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+# 백엔드 공용 모듈 (저장소 ID 규칙)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from learning_content_store import LEARNING_CONTENT_STORAGE, content_id_for
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ContentFile:
+    """정리 판단에 필요한 파일 정보 (본문은 들고 있지 않고 합칠 때 최신 파일만 다시 읽음)"""
+    path: Path
+    record_id: Optional[str]
+    updated_at: str
+    created_at: Optional[str]
+
+def _read_content(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def group_content_files(storage_dir: Path) -> Tuple[Dict[str, List[ContentFile]], int]:
+    """
+    저장소 파일을 콘텐츠 해시 ID로 묶기
+
+    Returns:
+        (ID → [파일 정보], 읽기 실패 파일 수)
+    """
+    groups: Dict[str, List[ContentFile]] = {}
+    unreadable = 0
+    for json_file in sorted(storage_dir.glob("*.json")):
+        try:
+            content = _read_content(json_file)
+        except Exception as e:
+            logger.warning(f"파일 읽기 실패 ({json_file}): {e}")
+            unreadable += 1
+            continue
+        if not isinstance(content, dict):
+            continue
+        created_at = content.get("createdAt")
+        groups.setdefault(content_id_for(content), []).append(ContentFile(
+            json_file, content.get("id"), str(content.get("updatedAt") or ""),
+            str(created_at) if created_at else None
+        ))
+    return groups, unreadable
+
+def merge_group(content_id: str, files: List[ContentFile]) -> Dict[str, Any]:
+    """그룹을 레코드 1개로 합치기 (최신 본문 + 최초 createdAt)"""
+    latest = max(files, key=lambda f: f.updated_at)
+    created = [f.created_at for f in files if f.created_at]
+    merged = _read_content(latest.path)
+    merged["id"] = content_id
+    if created:
+        merged["createdAt"] = min(created)
+    return merged
+
+def write_content(path: Path, content: Dict[str, Any]):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def dedup_storage(storage_dir: Path, apply: bool = False) -> Dict[str, Any]:
+    """
+    저장소 중복 정리
+
+    Args:
+        storage_dir: 학습 콘텐츠 저장 디렉토리
+        apply: False면 변경 없이 집계만
+
+    Returns:
+        정리 결과 요약
+    """
+    groups, unreadable = group_content_files(storage_dir)
+    summary = {
+        "storageDir": str(storage_dir),
+        "applied": apply,
+        "files": sum(len(files) for files in groups.values()),
+        "unreadable": unreadable,
+        "contents": len(groups),
+        "duplicateGroups": 0,
+        "removedFiles": 0,
+        "rewrittenFiles": 0,
+    }
+
+    for content_id, files in groups.items():
+        target = storage_dir / f"{content_id}.json"
+        if len(files) == 1 and files[0].path == target and files[0].record_id == content_id:
+            continue
+
+        if len(files) > 1:
+            summary["duplicateGroups"] += 1
+        stale = [f.path for f in files if f.path != target]
+        summary["rewrittenFiles"] += 1
+        summary["removedFiles"] += len(stale)
+
+        if apply:
+            # 새 파일을 먼저 쓴 뒤 나머지를 지우므로 중간에 멈춰도 콘텐츠는 남음
+            write_content(target, merge_group(content_id, files))
+            for path in stale:
+                path.unlink()
+
+    return summary
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="학습 콘텐츠 저장소 중복 정리")
+    parser.add_argument("storage_dir", nargs="?", type=Path, default=LEARNING_CONTENT_STORAGE,
+                        help="학습 콘텐츠 저장 디렉토리")
+    parser.add_argument("--apply", action="store_true", help="실제로 파일을 정리 (기본: dry-run)")
+    args = parser.parse_args(argv)
+
+    if not args.storage_dir.is_dir():
+        logger.error(f"디렉토리가 없습니다: {args.storage_dir}")
+        return 1
+
+    summary = dedup_storage(args.storage_dir, apply=args.apply)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    if args.apply:
+        logger.info(f"✅ 중복 정리 완료: 파일 {summary['files']}개 → {summary['contents']}개")
+    else:
+        logger.info(f"dry-run: 파일 {summary['removedFiles']}개 삭제 예정 (--apply 로 실행)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
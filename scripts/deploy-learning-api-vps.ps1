@@ -17,6 +17,8 @@ $VPS_HOST = "148.230.97.246"
 $VPS_USER = "root"  # 실제 사용자명으로 변경 필요
 $VPS_BACKEND_DIR = "/var/www/mkm-study/backend"
 $VPS_LEARNING_DIR = "/var/www/mkm-study/learning-content"
+# 학습 콘텐츠 저장소 백엔드: file (JSON 파일) 또는 sqlite (SQLite + FTS5)
+$LEARNING_STORE_BACKEND = if ($env:LEARNING_STORE_BACKEND) { $env:LEARNING_STORE_BACKEND } else { "file" }
 
 # 로컬 경로 (현재 디렉토리 기준)
 $SCRIPT_DIR = Split-Path -Parent $MyInvocation.MyCommand.Path
@@ -66,10 +68,12 @@ if ($USE_SSH_KEY) {
 
 # 파일 전송
 Write-Host "📤 파일 전송 중..." -ForegroundColor Cyan
+# learning_content_api.py가 import하는 backend/ 모듈 전체 전송
+$LOCAL_FILES = Get-ChildItem -Path $LOCAL_BACKEND -Filter "*.py" | ForEach-Object { $_.FullName }
 if ($USE_SSH_KEY) {
-    scp -i $SSH_KEY $LOCAL_SCRIPT "$VPS_USER@${VPS_HOST}:$VPS_BACKEND_DIR/"
+    scp -i $SSH_KEY @LOCAL_FILES "$VPS_USER@${VPS_HOST}:$VPS_BACKEND_DIR/"
 } else {
-    scp $LOCAL_SCRIPT "$VPS_USER@${VPS_HOST}:$VPS_BACKEND_DIR/"
+    scp @LOCAL_FILES "$VPS_USER@${VPS_HOST}:$VPS_BACKEND_DIR/"
 }
 
 Write-Host "✅ 파일 전송 완료" -ForegroundColor Green
@@ -78,7 +82,7 @@ Write-Host "✅ 파일 전송 완료" -ForegroundColor Green
 Write-Host "🔧 VPS에서 의존성 설치 중..." -ForegroundColor Cyan
 $installCmd = @"
 cd $VPS_BACKEND_DIR
-pip3 install fastapi uvicorn pydantic --quiet
+pip3 install fastapi uvicorn 'pydantic>=2' orjson brotli zstandard numpy --quiet
 "@
 
 if ($USE_SSH_KEY) {
@@ -94,6 +98,7 @@ Write-Host "🚀 API 서버 시작 중 (포트 8004)..." -ForegroundColor Cyan
 $startCmd = @"
 cd $VPS_BACKEND_DIR
 export LEARNING_API_PORT=8004
+export LEARNING_STORE_BACKEND=$LEARNING_STORE_BACKEND
 nohup python3 learning_content_api.py > learning_api.log 2>&1 &
 echo `$!
 "@
@@ -10,10 +10,15 @@
 """
 
 import sys
+import os
 import json
 import requests
+import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import logging
 import time
@@ -30,7 +35,7 @@ HEADERS = {
     'Accept-Language': 'ko-KR,ko;q=0.9',
 }
 
-# 요청 딜레이
+# 요청 딜레이 (다운로드 워커 전체 합산 기준)
 REQUEST_DELAY = 2.0  # 2초 간격
 
 # 평가원 기출문제 URL (실제 URL 확인 필요)
@@ -44,22 +49,48 @@ KICE_EXAM_URLS = {
 # 최근 N년치 기출문제 수집
 YEARS_TO_COLLECT = 10  # 최근 10년
 
+# 파이프라인 기본값
+DEFAULT_OUTPUT_BASE = Path("learning-content/kice-exams")
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_EXTRACT_WORKERS = 2
+
+class RateLimiter:
+    """요청 시작 간격 제한 (스레드 공용)"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+# 동시 다운로드 워커가 여러 개여도 평가원 서버에는 REQUEST_DELAY 간격으로만 요청
+_download_limiter = RateLimiter(REQUEST_DELAY)
+
 def download_pdf(url: str, save_path: Path) -> bool:
-    """PDF 파일 다운로드"""
+    """PDF 파일 다운로드 (.part 파일에 받은 뒤 완료되면 이름 변경 → 중단된 파일을 완료로 보지 않음)"""
+    part_path = save_path.with_name(save_path.name + ".part")
     try:
-        time.sleep(REQUEST_DELAY)
-        response = requests.get(url, headers=HEADERS, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        _download_limiter.wait()
+        with requests.get(url, headers=HEADERS, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+        os.replace(part_path, save_path)
         
         logger.info(f"✅ PDF 다운로드 완료: {save_path.name}")
         return True
         
     except Exception as e:
         logger.error(f"❌ PDF 다운로드 실패 ({url}): {e}")
+        part_path.unlink(missing_ok=True)
         return False
 
 def extract_exam_metadata(html_content: str) -> List[Dict[str, Any]]:
@@ -154,6 +185,11 @@ def scrape_kice_exams(exam_type: str = "수능") -> List[Dict[str, Any]]:
         logger.error(f"❌ 기출문제 수집 실패: {e}")
         return []
 
+def exam_pdf_filename(exam: Dict[str, Any]) -> str:
+    """기출문제 메타데이터로 PDF 파일명 생성"""
+    filename = f"{exam['year']}_{exam['exam_type']}_{exam['subject']}_{exam['title'][:20]}.pdf"
+    return re.sub(r'[<>:"/\\|?*]', '_', filename)  # 파일명에 사용 불가 문자 제거
+
 def download_exam_pdfs(exams: List[Dict[str, Any]], output_dir: Path):
     """기출문제 PDF 다운로드"""
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -166,8 +202,7 @@ def download_exam_pdfs(exams: List[Dict[str, Any]], output_dir: Path):
             continue
         
         # 파일명 생성
-        filename = f"{exam['year']}_{exam['exam_type']}_{exam['subject']}_{exam['title'][:20]}.pdf"
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)  # 파일명에 사용 불가 문자 제거
+        filename = exam_pdf_filename(exam)
         
         save_path = output_dir / filename
         
@@ -209,6 +244,17 @@ def convert_pdf_to_text(pdf_path: Path) -> str:
         logger.error(f"PDF 변환 실패 ({pdf_path}): {e}")
         return ""
 
+def extract_exam_text(pdf_path: Path, output_dir: Path) -> Optional[Path]:
+    """PDF 1개를 텍스트 파일로 변환 (실패 시 None)"""
+    text = convert_pdf_to_text(pdf_path)
+    if not text:
+        return None
+    
+    text_file = output_dir / f"{pdf_path.stem}.txt"
+    with open(text_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return text_file
+
 def process_exam_pdfs(pdf_dir: Path, output_dir: Path):
     """기출문제 PDF를 텍스트로 변환하여 저장"""
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -220,14 +266,7 @@ def process_exam_pdfs(pdf_dir: Path, output_dir: Path):
     
     for pdf_file in pdf_files:
         try:
-            text = convert_pdf_to_text(pdf_file)
-            
-            if text:
-                # 텍스트 파일로 저장
-                text_file = output_dir / f"{pdf_file.stem}.txt"
-                with open(text_file, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                
+            if extract_exam_text(pdf_file, output_dir):
                 converted += 1
                 logger.info(f"✅ 변환 완료: {pdf_file.name}")
             else:
@@ -238,48 +277,222 @@ def process_exam_pdfs(pdf_dir: Path, output_dir: Path):
     
     logger.info(f"\n변환 완료: {converted}/{len(pdf_files)}개")
 
-def main():
-    """메인 함수"""
-    logger.info("=" * 60)
-    logger.info("수능/모의고사 기출문제 다운로더")
-    logger.info("=" * 60)
-    
-    # 출력 디렉토리
-    output_base = Path("learning-content/kice-exams")
-    pdf_dir = output_base / "pdfs"
-    text_dir = output_base / "texts"
-    metadata_dir = output_base / "metadata"
-    
-    # 기출문제 수집
+def collect_exam_metadata(exam_types: List[str], metadata_dir: Path) -> List[Dict[str, Any]]:
+    """시험 유형별 기출문제 메타데이터 수집 후 저장"""
     all_exams = []
     
-    for exam_type in ["수능", "모의고사"]:
+    for exam_type in exam_types:
         exams = scrape_kice_exams(exam_type)
         all_exams.extend(exams)
     
-    # 메타데이터 저장
     metadata_dir.mkdir(parents=True, exist_ok=True)
     metadata_path = metadata_dir / "exam_metadata.json"
     with open(metadata_path, 'w', encoding='utf-8') as f:
         json.dump(all_exams, f, ensure_ascii=False, indent=2)
     
     logger.info(f"✅ 메타데이터 저장 완료: {len(all_exams)}개")
+    return all_exams
+
+def load_saved_exam_metadata(metadata_dir: Path) -> List[Dict[str, Any]]:
+    """이전 실행에서 저장한 메타데이터 로드"""
+    metadata_path = metadata_dir / "exam_metadata.json"
+    if not metadata_path.exists():
+        logger.warning(f"저장된 메타데이터가 없습니다: {metadata_path}")
+        return []
     
-    # PDF 다운로드 (선택적)
-    user_input = input("\nPDF 다운로드를 진행하시겠습니까? (y/n): ").strip().lower()
-    if user_input == 'y':
-        download_exam_pdfs(all_exams, pdf_dir)
-        
-        # PDF를 텍스트로 변환 (선택적)
-        user_input2 = input("\nPDF를 텍스트로 변환하시겠습니까? (y/n): ").strip().lower()
-        if user_input2 == 'y':
-            process_exam_pdfs(pdf_dir, text_dir)
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_pipeline(
+    output_base: Path = DEFAULT_OUTPUT_BASE,
+    exam_types: Optional[List[str]] = None,
+    fetch_metadata: bool = True,
+    download: bool = False,
+    extract: bool = False,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    기출문제 수집 파이프라인 (비대화형)
+    
+    메타데이터 → 다운로드 → 텍스트 변환 단계를 큐로 연결하여,
+    다운로드가 끝난 PDF는 나머지 다운로드를 기다리지 않고 바로 변환합니다.
+    
+    Args:
+        output_base: 출력 루트 디렉토리 (pdfs/, texts/, metadata/ 생성)
+        exam_types: 수집할 시험 유형 (기본: 수능, 모의고사)
+        fetch_metadata: False면 저장된 메타데이터 재사용
+        download: PDF 다운로드 단계 실행 여부
+        extract: 텍스트 변환 단계 실행 여부
+        download_workers: 동시 다운로드 수
+        extract_workers: 동시 변환 수
+        limit: 처리할 최대 시험 수 (None이면 전체)
+    
+    Returns:
+        실행 요약 (단계별 건수, 소요 시간, 실패 목록)
+    """
+    started = time.time()
+    pdf_dir = output_base / "pdfs"
+    text_dir = output_base / "texts"
+    metadata_dir = output_base / "metadata"
+    exam_types = exam_types or ["수능", "모의고사"]
+    
+    summary: Dict[str, Any] = {
+        "startedAt": datetime.now().isoformat(),
+        "outputBase": str(output_base),
+        "stages": {
+            "metadata": {"enabled": fetch_metadata, "exams": 0},
+            "download": {"enabled": download, "downloaded": 0, "skipped": 0, "failed": 0},
+            "extract": {"enabled": extract, "converted": 0, "failed": 0},
+        },
+        "failures": [],
+    }
+    
+    # 1단계: 메타데이터
+    stage_started = time.time()
+    if fetch_metadata:
+        exams = collect_exam_metadata(exam_types, metadata_dir)
+    else:
+        exams = load_saved_exam_metadata(metadata_dir)
+    if limit is not None:
+        exams = exams[:limit]
+    summary["stages"]["metadata"]["exams"] = len(exams)
+    summary["stages"]["metadata"]["seconds"] = round(time.time() - stage_started, 3)
+    
+    if not download and not extract:
+        summary["finishedAt"] = datetime.now().isoformat()
+        summary["seconds"] = round(time.time() - started, 3)
+        return summary
+    
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+    text_dir.mkdir(parents=True, exist_ok=True)
+    
+    # 다운로드 → 변환 큐 (None은 종료 신호)
+    pdf_queue: "queue.Queue[Optional[Path]]" = queue.Queue(maxsize=max(1, extract_workers) * 4)
+    lock = threading.Lock()
+    
+    def record(stage: str, key: str, failure: Optional[Tuple[str, str]] = None):
+        with lock:
+            summary["stages"][stage][key] += 1
+            if failure:
+                summary["failures"].append({"stage": stage, "item": failure[0], "error": failure[1]})
+    
+    def extract_worker():
+        while True:
+            pdf_path = pdf_queue.get()
+            try:
+                if pdf_path is None:
+                    return
+                text_path = text_dir / f"{pdf_path.stem}.txt"
+                if text_path.exists():
+                    continue
+                try:
+                    if extract_exam_text(pdf_path, text_dir):
+                        record("extract", "converted")
+                        logger.info(f"✅ 변환 완료: {pdf_path.name}")
+                    else:
+                        record("extract", "failed", (pdf_path.name, "텍스트 추출 실패"))
+                except Exception as e:
+                    record("extract", "failed", (pdf_path.name, str(e)))
+            finally:
+                pdf_queue.task_done()
+    
+    def download_one(exam: Dict[str, Any]):
+        if not exam.get("pdf_url"):
+            return
+        save_path = pdf_dir / exam_pdf_filename(exam)
+        if save_path.exists():
+            record("download", "skipped")
+        elif not download:
+            return
+        elif download_pdf(exam["pdf_url"], save_path):
+            record("download", "downloaded")
+        else:
+            record("download", "failed", (exam["pdf_url"], "다운로드 실패"))
+            return
+        if extract:
+            pdf_queue.put(save_path)
+    
+    extractors = []
+    if extract:
+        for _ in range(max(1, extract_workers)):
+            thread = threading.Thread(target=extract_worker, daemon=True)
+            thread.start()
+            extractors.append(thread)
+    
+    stage_started = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, download_workers)) as executor:
+        list(executor.map(download_one, exams))
+    summary["stages"]["download"]["seconds"] = round(time.time() - stage_started, 3)
+    # 변환은 다운로드와 겹쳐 진행되므로 여기서는 다운로드 이후 남은 변환 시간만 측정
+    stage_started = time.time()
+    
+    if extract and not download:
+        # 다운로드 없이 변환만 요청된 경우: 기존 PDF 중 메타데이터에 없는 파일도 변환
+        queued = {pdf_dir / exam_pdf_filename(e) for e in exams if e.get("pdf_url")}
+        for pdf_path in sorted(pdf_dir.glob("*.pdf")):
+            if pdf_path not in queued:
+                pdf_queue.put(pdf_path)
+    
+    for _ in extractors:
+        pdf_queue.put(None)
+    for thread in extractors:
+        thread.join()
+    summary["stages"]["extract"]["seconds"] = round(time.time() - stage_started, 3)
+    
+    summary["finishedAt"] = datetime.now().isoformat()
+    summary["seconds"] = round(time.time() - started, 3)
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="수능/모의고사 기출문제 수집 파이프라인")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_BASE, help="출력 루트 디렉토리")
+    parser.add_argument("--exam-types", nargs="+", default=["수능", "모의고사"], choices=list(KICE_EXAM_URLS), help="수집할 시험 유형")
+    parser.add_argument("--skip-metadata", action="store_true", help="메타데이터 수집 생략 (저장된 메타데이터 사용)")
+    parser.add_argument("--download", action="store_true", help="PDF 다운로드 실행")
+    parser.add_argument("--extract", action="store_true", help="PDF 텍스트 변환 실행")
+    parser.add_argument("--download-workers", type=int, default=DEFAULT_DOWNLOAD_WORKERS, help="동시 다운로드 수")
+    parser.add_argument("--extract-workers", type=int, default=DEFAULT_EXTRACT_WORKERS, help="동시 변환 수")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 시험 수")
+    parser.add_argument("--summary", type=Path, default=None, help="실행 요약 JSON 저장 경로 (기본: 표준 출력)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """메인 함수"""
+    args = parse_args(argv)
+    
+    logger.info("=" * 60)
+    logger.info("수능/모의고사 기출문제 다운로더")
+    logger.info("=" * 60)
+    
+    summary = run_pipeline(
+        output_base=args.output_dir,
+        exam_types=args.exam_types,
+        fetch_metadata=not args.skip_metadata,
+        download=args.download,
+        extract=args.extract,
+        download_workers=args.download_workers,
+        extract_workers=args.extract_workers,
+        limit=args.limit
+    )
+    
+    summary_json = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary:
+        args.summary.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(summary_json)
+        logger.info(f"✅ 실행 요약 저장: {args.summary}")
+    else:
+        print(summary_json)
     
     logger.info("\n🎯 다음 단계:")
     logger.info("1. 기출문제 메타데이터 확인: learning-content/kice-exams/metadata/exam_metadata.json")
     logger.info("2. Athena Generator 구축: 기출문제를 분석하여 문제 생성 프롬프트 작성")
     logger.info("3. 합성 문제 생성: 커리큘럼 맵 + 기출문제 분석 → 맞춤형 문제 생성")
+    
+    return 0 if not summary["failures"] else 1
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔎 기출문제 분석 엔진
+
+kice-exams/texts/*.txt 기출문제 텍스트를 문항 단위로 나누고,
+커리큘럼 맵 개념 어휘로 만든 Aho-Corasick 오토마톤으로 한 번에 스캔하여
+단원별 난이도 / 논리(L) / 지식(K) 통계를 계산합니다.
+
+결과는 analysis/exam_analysis_table.json 에 캐시되며,
+Athena Generator는 (과목, 단원) 키로 O(1) 조회합니다.
+"""
+
+import sys
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from datetime import datetime
+import logging
+
+# 백엔드 공용 모듈 (커리큘럼 인덱스)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from curriculum_index import get_curriculum_index
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 경로 설정
+CURRICULUM_MAP_PATH = Path("learning-content/curriculum/curriculum_map.json")
+EXAM_TEXT_DIR = Path("learning-content/kice-exams/texts")
+ANALYSIS_TABLE_PATH = Path("learning-content/kice-exams/analysis/exam_analysis_table.json")
+
+ANALYSIS_TABLE_VERSION = 1
+
+# 고난도(논리) 표지어 - 기존 생성기 키워드 + 추가 표현
+LOGIC_MARKERS = {
+    "math": ["증명", "최댓값", "최솟값", "극값", "적분", "미분", "모든 실수", "만족시키는", "귀납"],
+    "english": ["infer", "imply", "suggest", "추론", "빈칸", "순서", "요지", "주장"],
+}
+
+# 배점 표기 → 난이도 (평가원 시험지는 문항마다 [2점]/[3점]/[4점] 표기)
+POINT_DIFFICULTY = {"2": "easy", "3": "medium", "4": "hard"}
+POINT_PATTERN = re.compile(r'\[\s*([234])\s*점\s*\]')
+
+# 문항 번호 (줄 맨 앞의 "1." / "12)" 형태)
+QUESTION_PATTERN = re.compile(r'(?m)^\s*(\d{1,2})\s*[.)]\s+')
+
+DIFFICULTY_SCORE = {"easy": 0.0, "medium": 0.5, "hard": 1.0}
+
+class AhoCorasick:
+    """다중 패턴 문자열 검색 오토마톤 (텍스트 길이에 선형)"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, payload: Any):
+        """패턴 추가 (build() 전에 호출)"""
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), payload))
+        self._built = False
+
+    def build(self):
+        """실패 링크 구성 (BFS)"""
+        queue = deque()
+        for next_node in self._goto[0].values():
+            self._fail[next_node] = 0
+            queue.append(next_node)
+
+        while queue:
+            node = queue.popleft()
+            for ch, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_node] = self._goto[fallback].get(ch, 0)
+                self._outputs[next_node] = self._outputs[next_node] + self._outputs[self._fail[next_node]]
+
+        self._built = True
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """텍스트에서 모든 패턴 매치 (start, end, payload) 반환"""
+        if not self._built:
+            self.build()
+        node = 0
+        for index, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, payload in self._outputs[node]:
+                yield index - length + 1, index + 1, payload
+
+def build_concept_automaton(curriculum_map: Dict[str, Any], subject: Optional[str] = None) -> AhoCorasick:
+    """
+    커리큘럼 맵 단원/주제명과 논리 표지어로 오토마톤 구성
+
+    payload:
+        ("concept", subject, grade, unit, topic)
+        ("logic", subject, marker)
+    """
+    automaton = AhoCorasick()
+
+    for subject_name, grades in curriculum_map.get("subjects", {}).items():
+        if subject and subject_name != subject:
+            continue
+        for grade, grade_data in grades.items():
+            for unit in grade_data.get("units", []):
+                unit_name = unit.get("unit", "")
+                for term in [unit_name] + list(unit.get("topics", [])):
+                    term = term.strip().lower()
+                    if len(term) >= 2:
+                        automaton.add(term, ("concept", subject_name, grade, unit_name, term))
+
+    for subject_name, markers in LOGIC_MARKERS.items():
+        if subject and subject_name != subject:
+            continue
+        for marker in markers:
+            automaton.add(marker.lower(), ("logic", subject_name, marker))
+
+    automaton.build()
+    return automaton
+
+def split_questions(exam_text: str) -> List[str]:
+    """기출문제 텍스트를 문항 단위로 분할 (번호가 없으면 전체를 1문항으로)"""
+    matches = list(QUESTION_PATTERN.finditer(exam_text))
+    if not matches:
+        return [exam_text] if exam_text.strip() else []
+
+    segments = []
+    expected = None
+    starts = []
+    for match in matches:
+        number = int(match.group(1))
+        # 보기 번호 등 잘못 잡힌 번호 제외: 문항 번호는 1씩 증가
+        if expected is None or number == expected:
+            starts.append(match.start())
+            expected = number + 1
+
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(exam_text)
+        segment = exam_text[start:end].strip()
+        if segment:
+            segments.append(segment)
+    return segments
+
+def analyze_question(question_text: str, automaton: AhoCorasick, subject: Optional[str] = None) -> Dict[str, Any]:
+    """
+    문항 1개 분석 (오토마톤 1회 스캔)
+
+    Returns:
+        난이도, 논리/지식 수준, 매칭된 (학년, 단원)별 개념 수
+    """
+    units: Dict[Tuple[str, str, str], int] = {}
+    concepts: List[str] = []
+    concept_matches = []
+    logic_hits = 0
+
+    for start, end, payload in automaton.find(question_text.lower()):
+        if subject and payload[1] != subject:
+            continue
+        if payload[0] == "concept":
+            concept_matches.append((start, end, payload))
+        else:
+            logic_hits += 1
+
+    # 더 긴 개념에 포함된 매치 제외 (예: "이차함수" 안의 "함수")
+    concept_matches.sort(key=lambda m: (m[0], -m[1]))
+    furthest_span = (-1, -1)
+    for start, end, payload in concept_matches:
+        if end <= furthest_span[1] and (start, end) != furthest_span:
+            continue
+        if end > furthest_span[1]:
+            furthest_span = (start, end)
+        key = (payload[1], payload[2], payload[3])
+        units[key] = units.get(key, 0) + 1
+        if payload[4] not in concepts:
+            concepts.append(payload[4])
+
+    point_match = POINT_PATTERN.search(question_text)
+    if point_match:
+        difficulty = POINT_DIFFICULTY[point_match.group(1)]
+    else:
+        difficulty = "hard" if logic_hits else "medium"
+
+    return {
+        "difficulty": difficulty,
+        "logic_level": round(min(1.0, 0.4 + 0.15 * logic_hits + 0.2 * DIFFICULTY_SCORE[difficulty]), 3),
+        "knowledge_level": round(min(1.0, 0.3 + 0.1 * len(concepts)), 3),
+        "key_concepts": concepts,
+        "units": units,
+    }
+
+def exam_subject_from_filename(text_path: Path) -> Optional[str]:
+    """download_kice_exams 파일명 규칙({연도}_{유형}_{과목}_{제목})에서 과목 추출"""
+    parts = text_path.stem.split("_")
+    if len(parts) >= 3 and parts[2] in LOGIC_MARKERS:
+        return parts[2]
+    return None
+
+def _source_signature(paths: List[Path]) -> Dict[str, List[int]]:
+    return {str(p): [p.stat().st_mtime_ns, p.stat().st_size] for p in paths if p.exists()}
+
+def build_exam_analysis_table(
+    curriculum_map: Dict[str, Any],
+    text_dir: Path = EXAM_TEXT_DIR
+) -> Dict[str, Any]:
+    """
+    전체 기출문제 텍스트를 분석하여 단원별 통계표 생성
+
+    Returns:
+        {"units": {"math/이차함수": {...}}, "subjects": {"math": {...}}, ...}
+    """
+    automaton = build_concept_automaton(curriculum_map)
+    text_files = sorted(text_dir.glob("*.txt")) if text_dir.exists() else []
+    logger.info(f"기출문제 분석 시작: {len(text_files)}개 파일")
+
+    unit_acc: Dict[str, Dict[str, Any]] = {}
+    subject_acc: Dict[str, Dict[str, Any]] = {}
+    total_questions = 0
+
+    def accumulate(acc: Dict[str, Any], analysis: Dict[str, Any]):
+        acc["questions"] += 1
+        acc["logic_sum"] += analysis["logic_level"]
+        acc["knowledge_sum"] += analysis["knowledge_level"]
+        acc["distribution"][analysis["difficulty"]] += 1
+
+    def new_acc(**extra) -> Dict[str, Any]:
+        return dict(questions=0, logic_sum=0.0, knowledge_sum=0.0,
+                    distribution={"easy": 0, "medium": 0, "hard": 0}, **extra)
+
+    for text_file in text_files:
+        try:
+            with open(text_file, 'r', encoding='utf-8') as f:
+                exam_text = f.read()
+        except Exception as e:
+            logger.warning(f"기출문제 텍스트 읽기 실패 ({text_file}): {e}")
+            continue
+
+        subject = exam_subject_from_filename(text_file)
+        for question in split_questions(exam_text):
+            analysis = analyze_question(question, automaton, subject)
+            total_questions += 1
+
+            for (subject_name, grade, unit_name) in analysis["units"]:
+                key = f"{subject_name}/{unit_name}"
+                if key not in unit_acc:
+                    unit_acc[key] = new_acc(subject=subject_name, unit=unit_name, grades=[])
+                if grade not in unit_acc[key]["grades"]:
+                    unit_acc[key]["grades"].append(grade)
+                accumulate(unit_acc[key], analysis)
+
+            question_subjects = {s for (s, _, _) in analysis["units"]} or ({subject} if subject else set())
+            for subject_name in question_subjects:
+                subject_acc.setdefault(subject_name, new_acc(subject=subject_name))
+                accumulate(subject_acc[subject_name], analysis)
+
+    def finalize(acc: Dict[str, Any]) -> Dict[str, Any]:
+        count = acc.pop("questions")
+        logic_sum = acc.pop("logic_sum")
+        knowledge_sum = acc.pop("knowledge_sum")
+        distribution = acc.pop("distribution")
+        mean_difficulty = sum(DIFFICULTY_SCORE[k] * v for k, v in distribution.items()) / count
+        acc.update({
+            "questions": count,
+            "logic_level": round(logic_sum / count, 3),
+            "knowledge_level": round(knowledge_sum / count, 3),
+            "difficulty_distribution": distribution,
+            "difficulty": "hard" if mean_difficulty >= 0.67 else "medium" if mean_difficulty >= 0.34 else "easy",
+        })
+        return acc
+
+    table = {
+        "version": ANALYSIS_TABLE_VERSION,
+        "createdAt": datetime.now().isoformat(),
+        "totalExams": len(text_files),
+        "totalQuestions": total_questions,
+        "units": {key: finalize(acc) for key, acc in unit_acc.items()},
+        "subjects": {key: finalize(acc) for key, acc in subject_acc.items()},
+    }
+    logger.info(f"✅ 기출문제 분석 완료: {total_questions}문항, {len(table['units'])}개 단원")
+    return table
+
+def load_exam_analysis_table(
+    curriculum_map: Dict[str, Any],
+    text_dir: Path = EXAM_TEXT_DIR,
+    table_path: Path = ANALYSIS_TABLE_PATH,
+    curriculum_path: Path = CURRICULUM_MAP_PATH
+) -> Dict[str, Any]:
+    """
+    캐시된 분석표 로드 (기출문제 텍스트나 커리큘럼 맵이 바뀌었으면 재계산)
+    """
+    sources = sorted(text_dir.glob("*.txt")) if text_dir.exists() else []
+    signature = _source_signature(sources + [curriculum_path])
+
+    if table_path.exists():
+        try:
+            with open(table_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("version") == ANALYSIS_TABLE_VERSION and cached.get("sources") == signature:
+                return cached
+        except Exception as e:
+            logger.warning(f"분석표 캐시 읽기 실패, 재계산합니다: {e}")
+
+    if not sources:
+        return {}
+
+    table = build_exam_analysis_table(curriculum_map, text_dir)
+    table["sources"] = signature
+
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = table_path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(table_path)
+    return table
+
+def lookup_unit_analysis(table: Dict[str, Any], subject: str, unit_name: str) -> Optional[Dict[str, Any]]:
+    """(과목, 단원) 분석 결과 조회 - 단원 데이터가 없으면 과목 전체 통계 사용"""
+    if not table:
+        return None
+    return table.get("units", {}).get(f"{subject}/{unit_name}") or table.get("subjects", {}).get(subject)
+
+def main():
+    """메인 함수: 분석표 강제 재계산"""
+    curriculum_index = get_curriculum_index(CURRICULUM_MAP_PATH)
+    if curriculum_index is None:
+        logger.error("커리큘럼 맵이 없습니다. 먼저 build_curriculum_map.py를 실행하세요.")
+        return 1
+
+    if ANALYSIS_TABLE_PATH.exists():
+        ANALYSIS_TABLE_PATH.unlink()
+    table = load_exam_analysis_table(curriculum_index.curriculum_map)
+    if not table:
+        logger.warning(f"분석할 기출문제 텍스트가 없습니다: {EXAM_TEXT_DIR}")
+        logger.info("먼저 download_kice_exams.py --download --extract 를 실행하세요.")
+        return 1
+
+    logger.info(f"✅ 분석표 저장 완료: {ANALYSIS_TABLE_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,13 @@ VPS 학습 정보 시스템에 저장합니다.
 """
 
 import sys
-import json
-import requests
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Any, Iterator
 from datetime import datetime
 import logging
 
+from import_runner import ImportShard, run_import
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -147,73 +147,50 @@ EBS_ENGLISH_CURRICULUM = {
     ]
 }
 
-def import_ebs_content(grade: str, subject: str, curriculum: Dict[str, List[Dict[str, Any]]]):
-    """EBS 교과과정 데이터를 API에 저장"""
-    logger.info(f"EBS 데이터 임포트 시작: {grade} {subject}")
-    
-    success_count = 0
-    error_count = 0
-    
-    for chapter_data in curriculum.get(grade, []):
+EBS_CURRICULA = {
+    "math": EBS_MATH_CURRICULUM,
+    "english": EBS_ENGLISH_CURRICULUM,
+}
+
+def iter_ebs_contents(grade: str, subject: str) -> Iterator[Dict[str, Any]]:
+    """EBS 교과과정 학년/과목 1개를 학습 콘텐츠로 변환 (임포트 샤드 로더)"""
+    for chapter_data in EBS_CURRICULA[subject].get(grade, []):
         for section in chapter_data.get("sections", []):
-            try:
-                # 학습 콘텐츠 생성
-                content = {
-                    "subject": subject,
-                    "topic": f"{grade} {chapter_data['title']} - {section['title']}",
-                    "content": section["content"],
-                    "difficulty": chapter_data.get("difficulty", "medium"),
-                    "ebsCurriculum": f"EBS {grade} {subject}",
-                    "keyTopics": chapter_data.get("keyTopics", [])
-                }
-                
-                # API에 저장
-                response = requests.post(
-                    f"{API_BASE}/api/v1/learning/store",
-                    json=content,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    success_count += 1
-                    logger.info(f"✅ 저장 완료: {content['topic']}")
-                else:
-                    error_count += 1
-                    logger.error(f"❌ 저장 실패: {content['topic']} - {response.status_code}")
-                    
-            except Exception as e:
-                error_count += 1
-                logger.error(f"❌ 오류 발생: {section.get('title', 'Unknown')} - {e}")
-    
-    logger.info(f"임포트 완료: 성공 {success_count}개, 실패 {error_count}개")
-    return success_count, error_count
+            yield {
+                "subject": subject,
+                "topic": f"{grade} {chapter_data['title']} - {section['title']}",
+                "content": section["content"],
+                "difficulty": chapter_data.get("difficulty", "medium"),
+                "ebsCurriculum": f"EBS {grade} {subject}",
+                "keyTopics": chapter_data.get("keyTopics", []),
+                # API의 EBS 인덱스 키 (학년, 과목, 단원) + 섹션 순서
+                "grade": grade,
+                "chapter": chapter_data["chapter"],
+                "chapterTitle": chapter_data["title"],
+                "section": section["section"],
+                "sectionTitle": section["title"]
+            }
 
 def main():
     """메인 함수"""
     logger.info("EBS 교과과정 데이터 임포트 시작")
     
-    total_success = 0
-    total_error = 0
-    
-    # 수학 데이터 임포트
-    for grade in ["중1", "중2", "중3", "고1", "고2"]:
-        success, error = import_ebs_content(grade, "math", EBS_MATH_CURRICULUM)
-        total_success += success
-        total_error += error
-    
-    # 영어 데이터 임포트
-    for grade in ["중1", "중2", "고1"]:
-        success, error = import_ebs_content(grade, "english", EBS_ENGLISH_CURRICULUM)
-        total_success += success
-        total_error += error
+    # 과목/학년별 샤드
+    shards = [
+        ImportShard(f"{subject}.{grade}", iter_ebs_contents, (grade, subject))
+        for subject, curriculum in EBS_CURRICULA.items()
+        for grade in curriculum
+    ]
+    report = run_import("ebs", shards, API_BASE)
+    total_success = report["saved"]
+    total_error = report["failed"]
     
     logger.info(f"전체 임포트 완료: 성공 {total_success}개, 실패 {total_error}개")
     
-    if total_error == 0:
+    if total_error == 0 and not report["failedShards"]:
         logger.info("✅ 모든 데이터 임포트 성공!")
     else:
         logger.warning(f"⚠️ 일부 데이터 임포트 실패: {total_error}개")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 임포트 공통 실행기
+
+AI Hub / 공공데이터 / EBS 임포터가 함께 사용합니다.
+
+- 입력을 샤드(파일, ZIP 멤버, API 등) 단위로 나누어 워커 프로세스에 분배
+- 학습 콘텐츠를 묶어서 /api/v1/learning/store/batch 로 저장
+  (배치 엔드포인트가 없는 구버전 서버는 /api/v1/learning/store 로 건별 저장)
+- 진행 중 items/sec, bytes/sec, ETA 로그
+- 종료 시 JSON 실행 리포트 저장 (임포트 처리량 비교/튜닝용)
+- 서버가 429/503 으로 미루면 Retry-After 만큼 기다렸다 재시도 (post_with_retry, 다른 수집 스크립트도 사용)
+
+환경 변수:
+    IMPORT_WORKERS          워커 프로세스 수 (기본: CPU 수, IMPORT_MAX_INGEST_WORKERS 이하)
+    IMPORT_MAX_INGEST_WORKERS  동시에 저장 요청을 보내는 워커 상한
+                            (기본: 4, 서버 LEARNING_MAX_INGEST_IN_FLIGHT 와 맞춤)
+    IMPORT_BATCH_SIZE       배치당 항목 수 (기본: 100)
+    IMPORT_REPORT_DIR       리포트 저장 디렉토리 (기본: learning-content/import-reports)
+    IMPORT_RETRY_DEADLINE   요청 1건의 429/503 재시도를 포기하기까지의 시간 (초, 기본: 600)
+"""
+
+import json
+import os
+import queue
+import random
+import time
+import multiprocessing
+import requests
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "100"))
+DEFAULT_REPORT_DIR = Path(os.getenv("IMPORT_REPORT_DIR", "learning-content/import-reports"))
+PROGRESS_INTERVAL = 5.0  # 진행 로그 간격 (초)
+REQUEST_TIMEOUT = 30
+# 서버 수락 제어(429)/일시 불가(503) 응답은 Retry-After 를 지켜 재시도
+RETRY_STATUSES = (429, 503)
+RETRY_DEADLINE = float(os.getenv("IMPORT_RETRY_DEADLINE", "600"))
+MAX_RETRY_AFTER = 60.0
+# 서버가 동시에 처리하는 ingest 요청 수 이상으로 워커를 띄우면 과부하 429만 늘어남
+MAX_INGEST_WORKERS = int(os.getenv("IMPORT_MAX_INGEST_WORKERS", "4"))
+
+@dataclass
+class ImportShard:
+    """
+    임포트 작업 단위
+
+    loader(*args)는 학습 콘텐츠 dict를 하나씩 반환해야 하며,
+    워커 프로세스로 전달되므로 모듈 최상위 함수여야 합니다 (pickle 가능).
+    size_bytes는 ETA 계산용 입력 크기입니다 (모르면 0).
+    reports_meta가 True면 loader에 meta dict를 키워드 인자로 넘기고, loader가 채운
+    수집 통계(실패 페이지 등)를 샤드 결과의 sourceMeta로 리포트에 남깁니다.
+    """
+    name: str
+    loader: Callable[..., Iterable[Dict[str, Any]]]
+    args: Tuple = ()
+    size_bytes: int = 0
+    reports_meta: bool = False
+
+def default_workers() -> int:
+    return min(int(os.getenv("IMPORT_WORKERS", "0")) or os.cpu_count() or 1, MAX_INGEST_WORKERS)
+
+# 워커 프로세스별 배치 엔드포인트 지원 여부 (None: 아직 모름)
+_batch_supported: Optional[bool] = None
+
+def encode_batch(items: List[Dict[str, Any]]) -> bytes:
+    """배치 저장 요청 본문 (한 번만 직렬화해 전송과 전송 바이트 집계에 함께 사용)"""
+    return json.dumps({"items": items}, ensure_ascii=False).encode("utf-8")
+
+def _retry_delay(response, attempt: int) -> float:
+    try:
+        delay = float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        delay = 2.0 ** attempt
+    # 여러 워커가 같은 순간에 다시 몰리지 않도록 지터
+    return min(MAX_RETRY_AFTER, delay) * random.uniform(1.0, 1.25)
+
+def post_with_retry(url: str, deadline: float = RETRY_DEADLINE, **kwargs) -> requests.Response:
+    """
+    requests.post + 429/503 재시도 (Retry-After 초만큼 대기, 없으면 지수 백오프)
+
+    서버가 미루는 동안은 횟수 제한 없이 재시도하고, deadline 초가 지나면 마지막 응답을 그대로 반환합니다.
+    연결 오류는 호출 측에서 처리합니다.
+    """
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        response = requests.post(url, **kwargs)
+        remaining = give_up_at - time.monotonic()
+        if response.status_code not in RETRY_STATUSES or remaining <= 0:
+            if response.status_code in RETRY_STATUSES:
+                logger.warning(f"⚠️ 재시도 시간 초과 ({deadline:.0f}초): {response.status_code}")
+            return response
+        delay = min(_retry_delay(response, attempt), remaining)
+        attempt += 1
+        logger.info(f"⏳ 서버가 요청을 미룸 ({response.status_code}), {delay:.1f}초 후 재시도 ({attempt}회째)")
+        time.sleep(delay)
+
+def _store_each(api_base: str, items: List[Dict[str, Any]]) -> int:
+    saved = 0
+    for item in items:
+        try:
+            response = post_with_retry(f"{api_base}/api/v1/learning/store", json=item, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 200:
+                saved += 1
+            else:
+                logger.warning(f"⚠️ API 저장 실패: {response.status_code}")
+        except Exception as e:
+            logger.error(f"❌ API 저장 오류: {e}")
+    return saved
+
+def save_batch(api_base: str, items: List[Dict[str, Any]], payload: Optional[bytes] = None) -> int:
+    """
+    학습 콘텐츠 묶음 저장
+
+    Args:
+        payload: encode_batch(items) 결과 (이미 직렬화했으면 넘겨서 재사용)
+
+    Returns:
+        저장에 성공한 항목 수
+    """
+    global _batch_supported
+    if not items:
+        return 0
+
+    if _batch_supported is not False:
+        try:
+            response = post_with_retry(
+                f"{api_base}/api/v1/learning/store/batch",
+                data=payload if payload is not None else encode_batch(items),
+                headers={"Content-Type": "application/json"},
+                timeout=REQUEST_TIMEOUT
+            )
+            if response.status_code in (404, 405):
+                logger.info("배치 저장 엔드포인트가 없어 건별 저장으로 전환합니다.")
+                _batch_supported = False
+            elif response.status_code == 200:
+                _batch_supported = True
+                return int(response.json().get("stored", len(items)))
+            else:
+                logger.warning(f"⚠️ API 배치 저장 실패: {response.status_code}")
+                return 0
+        except Exception as e:
+            logger.error(f"❌ API 배치 저장 오류: {e}")
+            return 0
+
+    return _store_each(api_base, items)
+
+def _run_shard(shard: ImportShard, api_base: str, batch_size: int, progress) -> Dict[str, Any]:
+    """
+    샤드 1개 처리 (워커 프로세스)
+
+    progress 큐로 (샤드 이름, 읽은 수, 저장 수, 전송 바이트) 이벤트를 보냅니다.
+    """
+    started = time.perf_counter()
+    result = {"name": shard.name, "sizeBytes": shard.size_bytes, "items": 0, "saved": 0,
+              "failed": 0, "payloadBytes": 0, "elapsedSeconds": 0.0, "error": None}
+    loader_kwargs: Dict[str, Any] = {}
+    if shard.reports_meta:
+        loader_kwargs["meta"] = result["sourceMeta"] = {}
+
+    def flush(batch: List[Dict[str, Any]]):
+        payload = encode_batch(batch)
+        payload_bytes = len(payload)
+        saved = save_batch(api_base, batch, payload)
+        result["items"] += len(batch)
+        result["saved"] += saved
+        result["failed"] += len(batch) - saved
+        result["payloadBytes"] += payload_bytes
+        progress.put((shard.name, len(batch), saved, payload_bytes))
+
+    batch: List[Dict[str, Any]] = []
+    try:
+        for item in shard.loader(*shard.args, **loader_kwargs):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except Exception as e:
+        logger.error(f"❌ 샤드 처리 오류 ({shard.name}): {e}")
+        result["error"] = str(e)
+
+    result["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+class _ProgressTracker:
+    """메인 프로세스 진행 상황 집계"""
+
+    def __init__(self, shards: List[ImportShard]):
+        self.started = time.perf_counter()
+        self.total_shards = len(shards)
+        self.shard_sizes = {shard.name: shard.size_bytes for shard in shards}
+        self.total_size = sum(self.shard_sizes.values())
+        self.items = 0
+        self.saved = 0
+        self.payload_bytes = 0
+        self.shard_payload: Dict[str, int] = {}
+        self.finished: List[str] = []
+        self.last_log = self.started
+
+    def update(self, event: Tuple[str, int, int, int]):
+        name, items, saved, payload_bytes = event
+        self.items += items
+        self.saved += saved
+        self.payload_bytes += payload_bytes
+        self.shard_payload[name] = self.shard_payload.get(name, 0) + payload_bytes
+
+    def finish(self, name: str):
+        self.finished.append(name)
+
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started, 1e-9)
+
+    def done_fraction(self) -> float:
+        """
+        완료 비율 추정
+
+        입력 크기를 아는 경우 완료 샤드 크기 + 진행 중 샤드의 전송 바이트(입력 크기 상한)로,
+        모르면 완료 샤드 수로 계산합니다.
+        """
+        if not self.total_shards:
+            return 1.0
+        if not self.total_size:
+            return len(self.finished) / self.total_shards
+        done = sum(self.shard_sizes[name] for name in self.finished)
+        finished = set(self.finished)
+        for name, payload in self.shard_payload.items():
+            if name not in finished:
+                done += min(payload, self.shard_sizes.get(name, 0))
+        return min(done / self.total_size, 1.0)
+
+    def eta_seconds(self) -> Optional[float]:
+        fraction = self.done_fraction()
+        if fraction <= 0:
+            return None
+        return self.elapsed() * (1 - fraction) / fraction
+
+    def log(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self.last_log < PROGRESS_INTERVAL:
+            return
+        self.last_log = now
+        elapsed = self.elapsed()
+        eta = self.eta_seconds()
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "--:--:--"
+        logger.info(
+            f"📈 진행: {self.items:,}개 ({self.items / elapsed:,.1f}개/s, "
+            f"{self.payload_bytes / elapsed / 1024 / 1024:,.2f} MB/s), "
+            f"샤드 {len(self.finished)}/{self.total_shards}, ETA {eta_text}"
+        )
+
+def _drain(progress, tracker: _ProgressTracker):
+    while True:
+        try:
+            tracker.update(progress.get_nowait())
+        except queue.Empty:
+            return
+
+def save_run_report(report: Dict[str, Any], report_path: Optional[Path] = None) -> Path:
+    if report_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        report_path = DEFAULT_REPORT_DIR / f"{report['source']}_{timestamp}.json"
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report_path
+
+def run_import(
+    source: str,
+    shards: List[ImportShard],
+    api_base: str,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    report_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    샤드 목록을 워커 프로세스로 임포트하고 실행 리포트 반환
+
+    Args:
+        source: 데이터 출처 이름 (리포트 파일명에 사용)
+        shards: 임포트 작업 단위 목록
+        api_base: 학습 콘텐츠 API 주소
+        workers: 워커 프로세스 수 (1이면 현재 프로세스에서 실행)
+        batch_size: 배치당 항목 수
+        report_path: 리포트 저장 경로 (기본: IMPORT_REPORT_DIR/{source}_{시각}.json)
+
+    Returns:
+        실행 리포트 dict (reportPath 포함)
+    """
+    requested = workers or default_workers()
+    if requested > MAX_INGEST_WORKERS:
+        logger.info(f"워커 {requested}개 → {MAX_INGEST_WORKERS}개 (서버 ingest 동시 처리 상한)")
+    workers = max(1, min(requested, MAX_INGEST_WORKERS, len(shards) or 1))
+    started_at = datetime.now().isoformat()
+    tracker = _ProgressTracker(shards)
+    shard_results: List[Dict[str, Any]] = []
+
+    logger.info(f"임포트 시작: {source} (샤드 {len(shards)}개, 워커 {workers}개, 배치 {batch_size}개)")
+
+    if workers == 1:
+        progress = queue.SimpleQueue()
+        for shard in shards:
+            shard_results.append(_run_shard(shard, api_base, batch_size, progress))
+            _drain(progress, tracker)
+            tracker.finish(shard.name)
+            tracker.log()
+    else:
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+            progress = manager.Queue()
+            futures = {
+                executor.submit(_run_shard, shard, api_base, batch_size, progress): shard
+                for shard in shards
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                _drain(progress, tracker)
+                for future in done:
+                    shard = futures[future]
+                    try:
+                        shard_results.append(future.result())
+                    except Exception as e:
+                        logger.error(f"❌ 워커 오류 ({shard.name}): {e}")
+                        shard_results.append({"name": shard.name, "sizeBytes": shard.size_bytes, "items": 0,
+                                              "saved": 0, "failed": 0, "payloadBytes": 0,
+                                              "elapsedSeconds": 0.0, "error": str(e)})
+                    tracker.finish(shard.name)
+                tracker.log()
+            _drain(progress, tracker)
+
+    tracker.log(force=True)
+    elapsed = tracker.elapsed()
+    items = sum(r["items"] for r in shard_results)
+    saved = sum(r["saved"] for r in shard_results)
+    payload_bytes = sum(r["payloadBytes"] for r in shard_results)
+
+    report = {
+        "source": source,
+        "apiBase": api_base,
+        "startedAt": started_at,
+        "finishedAt": datetime.now().isoformat(),
+        "elapsedSeconds": round(elapsed, 3),
+        "workers": workers,
+        "batchSize": batch_size,
+        "shards": len(shards),
+        "failedShards": sum(1 for r in shard_results if r["error"]),
+        "items": items,
+        "saved": saved,
+        "failed": items - saved,
+        "inputBytes": tracker.total_size,
+        "payloadBytes": payload_bytes,
+        "itemsPerSecond": round(items / elapsed, 2),
+        "bytesPerSecond": round(payload_bytes / elapsed, 2),
+        "shardResults": sorted(shard_results, key=lambda r: r["name"]),
+    }
+    report["reportPath"] = str(save_run_report(report, report_path))
+    logger.info(f"📄 실행 리포트 저장: {report['reportPath']}")
+    return report
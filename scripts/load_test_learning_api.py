@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+학습 콘텐츠 API 부하 테스트 (httpx 필요)
+
+실제 FastAPI app 을 프로세스 안에서(ASGI) 구동하거나, 실행 중인 uvicorn(--url)에
+실제와 비슷한 혼합 트래픽을 보냅니다.
+
+- 트래픽: 한국어 질의 검색, 저장, 맞춤 추천, 체질별 스타일, 암기 기법 (--mix 로 비율 조정)
+- open 모드: 응답을 기다리지 않고 목표 RPS로 요청을 발사 (지연은 예정 시각 기준 → coordinated omission 없음)
+- ramp 모드: 동시 사용자 수를 단계별로 늘리며 각 단계를 closed-loop 로 측정
+- 단계/엔드포인트별 처리량, 오류 수, 지연 mean/p50/p95/p99 를 JSON으로 출력
+
+in-process 모드는 LEARNING_CONTENT_DIR 를 임시 디렉토리로 두고 시작 전에 --seed-items 개를 저장합니다.
+모든 요청이 한 클라이언트에서 나가므로 수락 제어(admission_control)는 --admission 을 줄 때만 켭니다.
+(ASGI 안에서는 네트워크/직렬화 전송 비용이 빠지므로 VPS 용량 산정은 --url 로 측정하세요.)
+
+사용 예:
+    python scripts/load_test_learning_api.py open --rps 200 --duration 20
+    python scripts/load_test_learning_api.py ramp --concurrency 1 8 32 64 --stage-seconds 10
+    python scripts/load_test_learning_api.py open --url http://127.0.0.1:8004 --rps 500 --mix search=60,personalized=40
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from synthetic_learning_content import iter_synthetic_items, TOPIC_WORDS, GRADES, CONSTITUTIONS
+from benchmark_learning_store import percentile
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = {"search": 45, "store": 10, "personalized": 20, "constitution": 15, "memory_techniques": 10}
+SEARCH_QUERIES = [word for words in TOPIC_WORDS.values() for word in words] + ["확률과 통계", "함수", "문법", "영어 표현"]
+SEED_BATCH_SIZE = 500
+READY_TIMEOUT = 60.0
+
+# ---- 요청 생성 ----
+
+class TrafficMix:
+    """가중치에 따라 (이름, 메서드, 경로, JSON 본문) 요청을 생성"""
+
+    def __init__(self, weights: Dict[str, int], seed: int = 7):
+        unknown = set(weights) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"알 수 없는 트래픽 종류: {', '.join(sorted(unknown))} ({', '.join(DEFAULT_MIX)})")
+        self.names = [name for name, weight in weights.items() if weight > 0]
+        self.weights = [weights[name] for name in self.names]
+        self.rng = random.Random(seed)
+        self._store_items = iter_synthetic_items(10 ** 9, seed=seed + 1, shape="mixed")
+        self._store_counter = 0
+
+    def next(self) -> Tuple[str, str, str, Optional[Dict[str, Any]]]:
+        name = self.rng.choices(self.names, self.weights)[0]
+        return (name, *getattr(self, f"_{name}")())
+
+    def _search(self):
+        subject = self.rng.choice([None, "math", "english"])
+        return "POST", "/api/v1/learning/search", {
+            "query": self.rng.choice(SEARCH_QUERIES), "subject": subject, "limit": 10
+        }
+
+    def _store(self):
+        item = next(self._store_items)
+        self._store_counter += 1
+        # 같은 본문이면 unchanged 로 끝나므로 매번 새 콘텐츠
+        item["topic"] = f"{item['topic']} load-{os.getpid()}-{self._store_counter}"
+        return "POST", "/api/v1/learning/store", item
+
+    def _personalized(self):
+        return "POST", "/api/v1/learning/personalized", {
+            "constitution": self.rng.choice(CONSTITUTIONS),
+            "subject": self.rng.choice(list(TOPIC_WORDS)),
+            "vector_4d": {field: round(self.rng.random(), 3) for field in ("S", "L", "K", "M")},
+            "grade": self.rng.choice(GRADES),
+            "limit": 10,
+        }
+
+    def _constitution(self):
+        return "GET", f"/api/v1/learning/constitution/{self.rng.choice(CONSTITUTIONS)}", None
+
+    def _memory_techniques(self):
+        return "GET", "/api/v1/learning/memory-techniques", None
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    """"search=60,store=10" → {"search": 60, "store": 10}"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+# ---- 결과 집계 ----
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.dropped = 0
+
+    def record(self, name: str, status: str, seconds: float):
+        self.statuses[name][status] += 1
+        if status.startswith("2"):
+            self.latencies[name].append(seconds * 1000)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        def describe(values: List[float]) -> Dict[str, Any]:
+            if not values:
+                return {"count": 0}
+            return {
+                "count": len(values),
+                "meanMs": round(statistics.mean(values), 3),
+                "p50Ms": round(percentile(values, 50), 3),
+                "p95Ms": round(percentile(values, 95), 3),
+                "p99Ms": round(percentile(values, 99), 3),
+                "maxMs": round(max(values), 3),
+            }
+
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        total = sum(sum(counts.values()) for counts in self.statuses.values())
+        errors = sum(count for counts in self.statuses.values() for status, count in counts.items() if not status.startswith("2"))
+        return {
+            "seconds": round(elapsed, 3),
+            "requests": total,
+            "errors": errors,
+            "dropped": self.dropped,
+            "throughputRps": round((total - errors) / elapsed, 1) if elapsed else None,
+            "latency": describe(all_latencies),
+            "endpoints": {
+                name: {"statuses": dict(self.statuses[name]), **describe(self.latencies[name])}
+                for name in sorted(self.statuses)
+            },
+        }
+
+async def _send(client, recorder: Recorder, request: Tuple[str, str, str, Optional[Dict[str, Any]]],
+                scheduled: float):
+    name, method, path, body = request
+    try:
+        response = await client.request(method, path, json=body)
+        await response.aread()
+        status = str(response.status_code)
+    except Exception as e:
+        status = f"error:{type(e).__name__}"
+    recorder.record(name, status, time.perf_counter() - scheduled)
+
+# ---- 트래픽 형태 ----
+
+async def run_open_loop(client, mix: TrafficMix, rps: float, duration: float, max_in_flight: int,
+                        poisson: bool = False) -> Dict[str, Any]:
+    """목표 RPS로 응답과 무관하게 발사 (in-flight 상한을 넘으면 dropped)"""
+    recorder = Recorder()
+    in_flight: set = set()
+    rng = random.Random(11)
+    started = time.perf_counter()
+    scheduled = started
+    while scheduled - started < duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            recorder.dropped += 1
+        else:
+            task = asyncio.create_task(_send(client, recorder, mix.next(), scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        scheduled += rng.expovariate(rps) if poisson else 1.0 / rps
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    result = recorder.summary(time.perf_counter() - started)
+    result.update({"mode": "open", "targetRps": rps, "poisson": poisson})
+    return result
+
+async def run_closed_stage(client, mix: TrafficMix, concurrency: int, duration: float) -> Dict[str, Any]:
+    """동시 사용자 concurrency 명이 응답을 받자마자 다음 요청"""
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await _send(client, recorder, mix.next(), time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    result = recorder.summary(time.perf_counter() - started)
+    result.update({"mode": "closed", "concurrency": concurrency})
+    return result
+
+# ---- 대상 준비 ----
+
+@asynccontextmanager
+async def _lifespan(app):
+    """ASGI lifespan startup/shutdown 직접 구동 (startup/shutdown 훅 실행)"""
+    receive_queue: asyncio.Queue = asyncio.Queue()
+    send_queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}},
+                                   receive_queue.get, send_queue.put))
+    await receive_queue.put({"type": "lifespan.startup"})
+    message = await send_queue.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"앱 시작 실패: {message}")
+    try:
+        yield
+    finally:
+        await receive_queue.put({"type": "lifespan.shutdown"})
+        await send_queue.get()
+        await task
+
+@asynccontextmanager
+async def open_client(url: Optional[str], timeout: float, data_dir: Optional[Path], admission: bool = False):
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client, None
+        return
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as tmp:
+        os.environ["LEARNING_CONTENT_DIR"] = str(data_dir or tmp)
+        os.environ["LEARNING_ADMISSION_ENABLED"] = "1" if admission else "0"
+        sys.path.insert(0, str(BACKEND_DIR))
+        import learning_content_api as api
+        # 요청마다 남는 INFO 로그가 측정을 왜곡하지 않도록
+        logging.getLogger("learning_content_api").setLevel(logging.WARNING)
+        logging.getLogger("learning_content_store").setLevel(logging.WARNING)
+        transport = httpx.ASGITransport(app=api.app)
+        async with _lifespan(api.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+                yield client, api
+
+async def seed(client, count: int):
+    """검색/추천에 쓸 콘텐츠를 일괄 저장"""
+    items = iter_synthetic_items(count, seed=42, shape="mixed")
+    stored = 0
+    while stored < count:
+        batch = [item for _, item in zip(range(min(SEED_BATCH_SIZE, count - stored)), items)]
+        response = await client.post("/api/v1/learning/store/batch", json={"items": batch})
+        response.raise_for_status()
+        stored += len(batch)
+    logger.info(f"시드 데이터 저장: {stored}개")
+
+async def wait_until_ready(client, api):
+    """추천 인덱스 구축 완료까지 대기 (503 동안은 맞춤 추천이 모두 실패로 집계되므로)"""
+    deadline = time.perf_counter() + READY_TIMEOUT
+    while time.perf_counter() < deadline:
+        if api is not None:
+            if api._recommender.ready.is_set():
+                return
+        else:
+            response = await client.post("/api/v1/learning/personalized", json=TrafficMix({"personalized": 1}).next()[3])
+            if response.status_code != 503:
+                return
+        await asyncio.sleep(0.2)
+    logger.warning("⚠️ 추천 인덱스가 준비되지 않은 채 시작합니다")
+
+async def run(args) -> Dict[str, Any]:
+    mix = TrafficMix(parse_mix(args.mix), seed=args.seed)
+    report: Dict[str, Any] = {
+        "target": args.url or "in-process",
+        "mix": dict(zip(mix.names, mix.weights)),
+        "stages": [],
+    }
+    async with open_client(args.url, args.timeout, args.data_dir, args.admission) as (client, api):
+        if args.seed_items:
+            await seed(client, args.seed_items)
+        await wait_until_ready(client, api)
+        if args.warmup > 0:
+            await run_closed_stage(client, mix, 4, args.warmup)
+
+        if args.mode == "open":
+            for rps in args.rps:
+                logger.info(f"open-loop: {rps} RPS, {args.duration}s")
+                report["stages"].append(await run_open_loop(client, mix, rps, args.duration, args.max_in_flight, args.poisson))
+        else:
+            for concurrency in args.concurrency:
+                logger.info(f"ramp: 동시 {concurrency}, {args.stage_seconds}s")
+                report["stages"].append(await run_closed_stage(client, mix, concurrency, args.stage_seconds))
+    return report
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="학습 콘텐츠 API 부하 테스트")
+    parser.add_argument("mode", choices=["open", "ramp"], help="open: 목표 RPS, ramp: 동시 사용자 단계")
+    parser.add_argument("--url", help="대상 서버 (예: http://127.0.0.1:8004, 없으면 in-process)")
+    parser.add_argument("--rps", type=float, nargs="+", default=[100.0], help="open 모드 목표 RPS (여러 개면 단계별)")
+    parser.add_argument("--duration", type=float, default=10.0, help="open 모드 단계 길이 (초)")
+    parser.add_argument("--poisson", action="store_true", help="도착 간격을 지수분포로 (기본: 균등)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="open 모드 동시 요청 상한")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64], help="ramp 모드 동시 사용자 단계")
+    parser.add_argument("--stage-seconds", type=float, default=10.0, help="ramp 모드 단계 길이 (초)")
+    parser.add_argument("--mix", help=f"트래픽 비율 (기본: {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument("--seed-items", type=int, default=2000, help="시작 전 저장할 콘텐츠 수 (0이면 건너뜀)")
+    parser.add_argument("--data-dir", type=Path, help="in-process 모드 저장 위치 (기본: 임시 디렉토리)")
+    parser.add_argument("--admission", action="store_true", help="in-process 모드에서 클라이언트별 속도 제한/수락 제어 켜기")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 워밍업 (초)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    if httpx is None:
+        logger.error("❌ httpx 가 필요합니다: pip install httpx")
+        return 1
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        logger.info(f"✅ 결과 저장: {args.output}")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 모델/API 스텁 서버 (오프라인 성능 테스트용, 표준 라이브러리만 사용)
+
+VPS(148.230.97.246)의 8003/8004/11434 대신 한 포트에서 다음 엔드포인트를 흉내 냅니다.
+
+- POST /api/generate                 Ollama (stream=false 응답 형식)
+- POST /api/v1/vectorize             4D 벡터화 API (본문 해시 기반 결정적 벡터)
+- POST /api/v1/learning/store        학습 콘텐츠 저장
+- POST /api/v1/learning/store/batch  학습 콘텐츠 일괄 저장
+- GET  /stub/stats                   라우트별 요청 수/상태/처리 시간 (스텁 측 지연 분포)
+- POST /stub/reset                   통계 초기화
+
+라우트별 지연(평균 + 지터)과 오류율을 주입할 수 있습니다.
+일괄 저장은 항목당 지연(--batch-item-ms)이 더해집니다.
+
+사용 예:
+    python scripts/local_api_stub.py --port 18004
+    python scripts/local_api_stub.py --latency-ms generate=800 vectorize=15 store=5 --error-rate 0.02
+"""
+
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 18004
+# 라우트 이름 → 경로
+ROUTES = {
+    "generate": "/api/generate",
+    "vectorize": "/api/v1/vectorize",
+    "store": "/api/v1/learning/store",
+    "store_batch": "/api/v1/learning/store/batch",
+}
+# 라우트별 기본 지연 (ms) - 대략 VPS 실측 수준
+DEFAULT_LATENCY_MS = {"generate": 600.0, "vectorize": 10.0, "store": 3.0, "store_batch": 5.0}
+
+class StubConfig:
+    """지연/오류 주입 설정 (실행 중 변경 가능)"""
+
+    def __init__(self, latency_ms: Optional[Dict[str, float]] = None, jitter: float = 0.2,
+                 batch_item_ms: float = 0.2, error_rate: float = 0.0, error_status: int = 500,
+                 seed: int = 3):
+        self.latency_ms = {**DEFAULT_LATENCY_MS, **(latency_ms or {})}
+        # 지터: 평균 대비 표준편차 비율 (정규분포, 0 미만은 0)
+        self.jitter = jitter
+        self.batch_item_ms = batch_item_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, route: str, items: int = 1) -> float:
+        mean = self.latency_ms.get(route, 0.0)
+        with self._lock:
+            value = self._rng.gauss(mean, mean * self.jitter) if mean else 0.0
+        if route == "store_batch":
+            value += self.batch_item_ms * items
+        return max(0.0, value) / 1000
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+class StubStats:
+    """라우트별 상태 코드 수와 처리 시간 (ms)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+            self.latencies: Dict[str, List[float]] = defaultdict(list)
+            self.items: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, status: int, seconds: float, items: int = 1):
+        with self._lock:
+            self.statuses[route][status] += 1
+            self.latencies[route].append(seconds * 1000)
+            self.items[route] += items
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for route, counts in self.statuses.items():
+                ordered = sorted(self.latencies[route])
+                pick = lambda pct: round(ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))], 3)
+                result[route] = {
+                    "requests": sum(counts.values()),
+                    "items": self.items[route],
+                    "statuses": {str(status): count for status, count in counts.items()},
+                    "p50Ms": pick(50),
+                    "p95Ms": pick(95),
+                    "p99Ms": pick(99),
+                }
+            return result
+
+def _vector_for(text: str) -> Dict[str, float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    raw = [digest[i] + 1 for i in range(4)]
+    total = sum(raw)
+    return {field: round(value / total, 4) for field, value in zip(("S", "L", "K", "M"), raw)}
+
+def _content_id(item: Dict[str, Any]) -> str:
+    key = "\x1f".join(str(item.get(field, "")) for field in ("subject", "topic", "content"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+def _generate_response(body: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = str(body.get("prompt", ""))
+    return {
+        "model": body.get("model", "stub"),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "response": f"1. 문제\n(스텁) {prompt[:60]}\n2. 정답\n42\n3. 풀이\n조건을 정리하면 답은 42입니다.",
+        "done": True,
+        "eval_count": 64,
+    }
+
+def _handle(route: str, body: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """(응답 본문, 처리한 항목 수)"""
+    if route == "generate":
+        return _generate_response(body), 1
+    if route == "vectorize":
+        return {"vector_4d": _vector_for(str(body.get("text", "")))}, 1
+    if route == "store":
+        return {"success": True, "content_id": _content_id(body), "status": "created"}, 1
+    items = body.get("items", [])
+    content_ids = [_content_id(item) for item in items]
+    return {
+        "success": True,
+        "stored": len(content_ids),
+        "content_ids": content_ids,
+        "statuses": {"created": len(content_ids), "updated": 0, "unchanged": 0},
+        "errors": [],
+    }, len(items)
+
+def make_handler(config: StubConfig, stats: StubStats):
+    paths = {path: route for route, path in ROUTES.items()}
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status: int, payload: Dict[str, Any]):
+            raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            if self.path == "/stub/stats":
+                self._reply(200, {"routes": stats.snapshot()})
+            else:
+                self._reply(404, {"detail": "Not Found"})
+
+        def do_POST(self):
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if self.path == "/stub/reset":
+                stats.reset()
+                self._reply(200, {"reset": True})
+                return
+            route = paths.get(self.path.split("?", 1)[0])
+            if route is None:
+                self._reply(404, {"detail": "Not Found"})
+                return
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                self._reply(400, {"detail": "invalid JSON"})
+                stats.record(route, 400, time.perf_counter() - started)
+                return
+
+            payload, items = _handle(route, body)
+            time.sleep(config.delay(route, items))
+            status = config.error_status if config.should_fail() else 200
+            if status != 200:
+                payload = {"detail": "injected error"}
+            self._reply(status, payload)
+            stats.record(route, status, time.perf_counter() - started, items)
+
+    return StubHandler
+
+class LocalApiStub:
+    """백그라운드 스레드에서 도는 스텁 서버 (with 문 사용 가능)"""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.config, self.stats))
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalApiStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="local-api-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "LocalApiStub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def parse_latency(values: Optional[List[str]]) -> Dict[str, float]:
+    """["generate=800", "store=5"] → {"generate": 800.0, "store": 5.0}"""
+    latency = {}
+    for value in values or []:
+        route, _, ms = value.partition("=")
+        if route not in ROUTES:
+            raise ValueError(f"알 수 없는 라우트: {route} ({', '.join(ROUTES)})")
+        latency[route] = float(ms)
+    return latency
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    """스텁 설정 인자 (벤치마크 스크립트와 공유)"""
+    parser.add_argument("--latency-ms", nargs="*", metavar="ROUTE=MS",
+                        help=f"라우트별 평균 지연 (기본: {' '.join(f'{k}={v:g}' for k, v in DEFAULT_LATENCY_MS.items())})")
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연 표준편차 / 평균")
+    parser.add_argument("--batch-item-ms", type=float, default=0.2, help="일괄 저장 항목당 추가 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=500, help="주입할 오류 상태 코드")
+
+def config_from_args(args) -> StubConfig:
+    return StubConfig(parse_latency(args.latency_ms), args.jitter, args.batch_item_ms,
+                      args.error_rate, args.error_status)
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="로컬 모델/API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    stub = LocalApiStub(config_from_args(args), args.host, args.port)
+    logger.info(f"🧪 스텁 서버 시작: {stub.base_url} (지연 {stub.config.latency_ms}, 오류율 {args.error_rate})")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,13 +11,14 @@ AI Hub(aihub.or.kr)에서 교육 관련 데이터셋을 다운로드하고
 
 import sys
 import json
-import requests
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterator, TextIO, Tuple
 from datetime import datetime
 import logging
+import io
 import zipfile
-import shutil
+
+from import_runner import ImportShard, run_import
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -47,30 +48,199 @@ AIHUB_DATASETS = {
     }
 }
 
-def load_aihub_json_file(file_path: Path) -> List[Dict[str, Any]]:
-    """AI Hub JSON 파일 로드"""
+# 항목 리스트가 들어있는 최상위 키 (AI Hub 데이터셋마다 다름)
+AIHUB_ITEM_KEYS = ['data', 'items', 'results', 'questions', 'qa_pairs']
+
+# 스트리밍 파서 읽기 단위
+STREAM_CHUNK_SIZE = 1 << 16  # 64KB
+
+class JsonItemStream:
+    """
+    증분 JSON 파서 (ijson 방식)
+    
+    파일을 청크 단위로 읽으면서 json.JSONDecoder.raw_decode로 값 하나씩 디코딩합니다.
+    버퍼에는 현재 디코딩 중인 값만 남으므로, 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+    
+    def __init__(self, fp: TextIO, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """버퍼에 청크 추가 (이미 소비한 앞부분은 버림)"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """공백을 건너뛰고 다음 문자 반환 (파일 끝이면 빈 문자열)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise json.JSONDecodeError(f"'{ch}' 필요", self.buf, self.pos)
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """다음 JSON 값 하나 디코딩"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # 숫자가 청크 경계에서 잘렸을 수 있으므로 (예: "-15" | ".5") 구분 문자가 보일 때만 확정
+                truncated = end == len(self.buf) or (
+                    isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and self.buf[end] in "0123456789.eE+-"
+                )
+                if not truncated or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # 큰 값은 읽기 단위를 늘려 재시도 횟수를 줄임
+            self._fill(max(self.chunk_size, len(self.buf) - self.pos))
+    
+    def iter_array(self) -> Iterator[Any]:
+        """현재 위치의 배열 원소를 하나씩 반환"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            if ch == ']':
+                self.pos += 1
+                return
+            self.expect(',')
+
+def iter_json_items(fp: TextIO, item_keys: List[str] = AIHUB_ITEM_KEYS) -> Iterator[Any]:
+    """
+    JSON 스트림에서 항목을 하나씩 반환
+    
+    - 최상위가 배열이면 원소
+    - 최상위가 객체이면 처음 나오는 item_keys 키의 배열 원소 (배열이 아니면 값 1개)
+    - 해당 키가 없으면 객체 전체 1개
+    """
+    stream = JsonItemStream(fp)
+    first = stream.peek()
+    
+    if first == '[':
+        yield from stream.iter_array()
+        return
+    if first != '{':
+        if first:
+            stream.value()  # 스칼라 최상위 값은 항목 없음
+        return
+    
+    stream.expect('{')
+    found = False
+    first_pair = True
+    others: Dict[str, Any] = {}
+    while stream.peek() != '}':
+        if not first_pair:
+            stream.expect(',')
+        first_pair = False
+        key = stream.value()
+        stream.expect(':')
+        if not found and key in item_keys:
+            found = True
+            others.clear()
+            if stream.peek() == '[':
+                yield from stream.iter_array()
+            else:
+                yield stream.value()
+            continue
+        value = stream.value()
+        if not found:
+            others[key] = value
+    
+    if not found:
+        yield others
+
+# 처리 단위: (파일 경로, ZIP 내부 멤버 이름 또는 None, 압축 해제 크기)
+AihubSource = Tuple[Path, Optional[str], int]
+
+def _iter_aihub_stream(fp: TextIO, label: str) -> Iterator[Dict[str, Any]]:
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 리스트인 경우 그대로 반환, 딕셔너리인 경우 리스트로 변환
-        if isinstance(data, list):
-            return data
-        elif isinstance(data, dict):
-            # 일반적으로 'data', 'items', 'results' 등의 키를 가짐
-            for key in ['data', 'items', 'results', 'questions', 'qa_pairs']:
-                if key in data:
-                    return data[key] if isinstance(data[key], list) else [data[key]]
-            return [data]
-        else:
-            return []
-            
+        for item in iter_json_items(fp):
+            if isinstance(item, dict):
+                yield item
     except json.JSONDecodeError as e:
-        logger.error(f"JSON 파싱 오류 ({file_path}): {e}")
-        return []
+        logger.error(f"JSON 파싱 오류 ({label}): {e.msg} (위치 {e.pos})")
     except Exception as e:
+        logger.error(f"파일 로드 오류 ({label}): {e}")
+
+def iter_aihub_json_file(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """AI Hub JSON 파일에서 항목을 하나씩 반환 (파일 전체를 메모리에 올리지 않음)"""
+    try:
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            yield from _iter_aihub_stream(f, str(file_path))
+    except OSError as e:
         logger.error(f"파일 로드 오류 ({file_path}): {e}")
-        return []
+
+def _display_member_name(member: str) -> str:
+    """Windows에서 만든 ZIP은 파일명이 cp949인데 zipfile은 cp437로 디코딩하므로 로그용으로 복원"""
+    try:
+        return member.encode('cp437').decode('cp949')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return member
+
+def iter_aihub_zip_member(zip_path: Path, member: str) -> Iterator[Dict[str, Any]]:
+    """ZIP 내부 JSON 멤버를 압축 해제 없이 스트리밍"""
+    label = f"{zip_path.name}:{_display_member_name(member)}"
+    try:
+        with zipfile.ZipFile(zip_path) as archive, archive.open(member) as raw:
+            yield from _iter_aihub_stream(io.TextIOWrapper(raw, encoding='utf-8-sig'), label)
+    except (OSError, zipfile.BadZipFile, KeyError) as e:
+        logger.error(f"ZIP 멤버 로드 오류 ({label}): {e}")
+
+def find_aihub_sources(data_dir: Path) -> List[AihubSource]:
+    """디렉토리의 JSON 파일과 ZIP 아카이브 내부 JSON 멤버 목록"""
+    sources: List[AihubSource] = [(path, None, path.stat().st_size) for path in sorted(data_dir.glob("**/*.json"))]
+    
+    for zip_path in sorted(data_dir.glob("**/*.zip")):
+        try:
+            with zipfile.ZipFile(zip_path) as archive:
+                # 크기(ETA 계산용)도 목록을 읽을 때 함께 기록 (샤드마다 아카이브를 다시 열지 않도록)
+                members = [
+                    (info.filename, info.file_size) for info in archive.infolist()
+                    if not info.is_dir()
+                    and info.filename.lower().endswith(".json")
+                    and not info.filename.startswith("__MACOSX/")
+                ]
+        except zipfile.BadZipFile as e:
+            logger.error(f"ZIP 파일 오류 ({zip_path}): {e}")
+            continue
+        sources.extend((zip_path, member, size) for member, size in members)
+    
+    return sources
+
+def iter_aihub_source(path: Path, member: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    if member is None:
+        return iter_aihub_json_file(path)
+    return iter_aihub_zip_member(path, member)
+
+def load_aihub_json_file(file_path: Path) -> List[Dict[str, Any]]:
+    """AI Hub JSON 파일 로드"""
+    return list(iter_aihub_json_file(file_path))
 
 def process_qa_data(qa_item: Dict[str, Any]) -> Dict[str, Any]:
     """질의응답 데이터를 학습 콘텐츠 형식으로 변환"""
@@ -116,77 +286,57 @@ def process_math_data(math_item: Dict[str, Any]) -> Dict[str, Any]:
         "updatedAt": datetime.now().isoformat()
     }
 
-def save_to_api(content_data: Dict[str, Any]) -> bool:
-    """수집한 데이터를 VPS API에 저장"""
-    try:
-        response = requests.post(
-            f"{API_BASE}/api/v1/learning/store",
-            json=content_data,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            return True
-        else:
-            logger.warning(f"⚠️ API 저장 실패: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"❌ API 저장 오류: {e}")
-        return False
+def convert_aihub_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """AI Hub 항목을 데이터 타입에 따라 학습 콘텐츠 형식으로 변환"""
+    if 'question' in item or '질문' in item or 'Q' in item:
+        # 질의응답 데이터
+        return process_qa_data(item)
+    elif 'problem' in item or '문제' in item:
+        # 수학 문항 데이터
+        return process_math_data(item)
+    else:
+        # 일반 데이터
+        return {
+            "subject": item.get('subject', 'general'),
+            "topic": item.get('title', item.get('topic', 'Unknown')),
+            "content": str(item.get('content', item.get('text', ''))),
+            "difficulty": item.get('difficulty', 'medium'),
+            "ebsCurriculum": "AI Hub",
+            "keyTopics": item.get('keywords', []),
+            "createdAt": datetime.now().isoformat(),
+            "updatedAt": datetime.now().isoformat()
+        }
 
-def process_aihub_directory(data_dir: Path) -> int:
-    """AI Hub 데이터 디렉토리 처리"""
+def iter_aihub_source_contents(path: Path, member: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """JSON 파일 또는 ZIP 멤버 1개를 학습 콘텐츠로 변환 (임포트 샤드 로더)"""
+    for item in iter_aihub_source(path, member):
+        yield convert_aihub_item(item)
+
+def _source_shard(source: AihubSource) -> ImportShard:
+    path, member, size = source
+    if member is None:
+        return ImportShard(str(path), iter_aihub_source_contents, (path, None), size)
+    return ImportShard(f"{path}:{_display_member_name(member)}", iter_aihub_source_contents, (path, member), size)
+
+def process_aihub_directory(data_dir: Path, workers: Optional[int] = None) -> Dict[str, Any]:
+    """AI Hub 데이터 디렉토리 처리 (JSON 파일 + ZIP 아카이브, 프로세스 병렬)"""
     logger.info(f"AI Hub 데이터 디렉토리 처리: {data_dir}")
     
     if not data_dir.exists():
         logger.warning(f"디렉토리가 없습니다: {data_dir}")
-        return 0
-    
-    saved_count = 0
+        return {}
     
-    # JSON 파일 찾기
-    json_files = list(data_dir.glob("**/*.json"))
+    # JSON 파일 / ZIP 내부 JSON 찾기
+    sources = find_aihub_sources(data_dir)
     
-    if not json_files:
+    if not sources:
         logger.warning("JSON 파일을 찾을 수 없습니다.")
-        return 0
+        return {}
     
-    logger.info(f"{len(json_files)}개 JSON 파일 발견")
+    logger.info(f"{len(sources)}개 JSON 소스 발견")
     
-    for json_file in json_files:
-        logger.info(f"처리 중: {json_file.name}")
-        
-        data = load_aihub_json_file(json_file)
-        
-        if not data:
-            continue
-        
-        for item in data:
-            # 데이터 타입에 따라 처리
-            if 'question' in item or '질문' in item or 'Q' in item:
-                # 질의응답 데이터
-                content_data = process_qa_data(item)
-            elif 'problem' in item or '문제' in item:
-                # 수학 문항 데이터
-                content_data = process_math_data(item)
-            else:
-                # 일반 데이터
-                content_data = {
-                    "subject": item.get('subject', 'general'),
-                    "topic": item.get('title', item.get('topic', 'Unknown')),
-                    "content": str(item.get('content', item.get('text', ''))),
-                    "difficulty": item.get('difficulty', 'medium'),
-                    "ebsCurriculum": "AI Hub",
-                    "keyTopics": item.get('keywords', []),
-                    "createdAt": datetime.now().isoformat(),
-                    "updatedAt": datetime.now().isoformat()
-                }
-            
-            if save_to_api(content_data):
-                saved_count += 1
-    
-    return saved_count
+    shards = [_source_shard(source) for source in sources]
+    return run_import("aihub", shards, API_BASE, workers=workers)
 
 def main():
     """메인 함수"""
@@ -204,7 +354,7 @@ def main():
     logger.info("3. 다음 데이터셋 다운로드:")
     for key, dataset in AIHUB_DATASETS.items():
         logger.info(f"   - {dataset['name']}: {dataset['url']}")
-    logger.info(f"4. 다운로드한 파일을 {aihub_data_dir} 디렉토리에 압축 해제")
+    logger.info(f"4. 다운로드한 ZIP 파일을 {aihub_data_dir} 디렉토리에 복사 (압축 해제 불필요)")
     logger.info("5. 이 스크립트를 다시 실행하여 데이터 처리\n")
     
     # 데이터 디렉토리 확인
@@ -214,10 +364,11 @@ def main():
         return
     
     # 데이터 처리
-    saved_count = process_aihub_directory(aihub_data_dir)
+    report = process_aihub_directory(aihub_data_dir)
     
     logger.info("\n" + "=" * 60)
-    logger.info(f"✅ AI Hub 데이터 처리 완료: {saved_count}개 항목 저장")
+    logger.info(f"✅ AI Hub 데이터 처리 완료: {report.get('saved', 0)}개 항목 저장 "
+                f"({report.get('itemsPerSecond', 0)}개/s)")
     logger.info("=" * 60)
 
 if __name__ == "__main__":
@@ -21,6 +21,8 @@ import logging
 import hashlib
 import re
 
+from import_runner import post_with_retry
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -259,7 +261,7 @@ def scrape_public_data_portal(api_key: Optional[str] = None) -> List[Dict[str, A
 def save_to_api(content_data: Dict[str, Any]) -> bool:
     """수집한 데이터를 VPS API에 저장"""
     try:
-        response = requests.post(
+        response = post_with_retry(
             f"{API_BASE}/api/v1/learning/store",
             json=content_data,
             timeout=10
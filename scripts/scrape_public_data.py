@@ -10,58 +10,98 @@
 """
 
 import sys
+import io
+import os
 import json
+import math
+import time
+import itertools
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, BinaryIO, Tuple
 from datetime import datetime
 import logging
 import xml.etree.ElementTree as ET
 
+from import_runner import ImportShard, run_import
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # API 설정
 API_BASE = "http://148.230.97.246:8003"
 
+# 페이지 수집 설정 (포털 API별 호출 한도에 맞게 조정)
+PUBLIC_DATA_ROWS_PER_PAGE = int(os.getenv("PUBLIC_DATA_ROWS_PER_PAGE", "100"))
+PUBLIC_DATA_CONCURRENCY = int(os.getenv("PUBLIC_DATA_CONCURRENCY", "4"))
+PUBLIC_DATA_RATE_LIMIT = float(os.getenv("PUBLIC_DATA_RATE_LIMIT", "5"))  # 초당 요청 수
+# 실패한 페이지(요청/파싱 오류, resultCode != "00") 재시도 횟수와 첫 대기 시간 (초, 재시도마다 2배)
+PUBLIC_DATA_PAGE_RETRIES = int(os.getenv("PUBLIC_DATA_PAGE_RETRIES", "3"))
+PUBLIC_DATA_RETRY_BACKOFF = 2.0
+# totalCount 가 없는 API 에서 연속으로 이만큼 페이지를 못 가져오면 수집 중단
+PUBLIC_DATA_MAX_CONSECUTIVE_FAILURES = 3
+
 # 공공데이터포털 추천 데이터셋
 PUBLIC_DATA_APIS = {
     "교육과정정보": {
         "name": "교육과정 정보",
         "description": "초중고 교육과정 정보",
-        "api_url_template": "http://apis.data.go.kr/1383000/교육과정정보?serviceKey={api_key}&pageNo=1&numOfRows=100",
+        "api_url_template": "http://apis.data.go.kr/1383000/교육과정정보?serviceKey={api_key}&pageNo={page_no}&numOfRows={num_of_rows}",
         "format": "xml"  # 또는 "json"
     },
     "학교기본정보": {
         "name": "학교 기본 정보",
         "description": "전국 학교 정보",
-        "api_url_template": "http://apis.data.go.kr/1383000/학교기본정보?serviceKey={api_key}&pageNo=1&numOfRows=100",
+        "api_url_template": "http://apis.data.go.kr/1383000/학교기본정보?serviceKey={api_key}&pageNo={page_no}&numOfRows={num_of_rows}",
         "format": "xml"
     },
     "교과용도서목록": {
         "name": "교과용 도서 목록",
         "description": "교과서 목록 정보",
-        "api_url_template": "http://apis.data.go.kr/1383000/교과용도서목록?serviceKey={api_key}&pageNo=1&numOfRows=100",
+        "api_url_template": "http://apis.data.go.kr/1383000/교과용도서목록?serviceKey={api_key}&pageNo={page_no}&numOfRows={num_of_rows}",
         "format": "xml"
     }
 }
 
+class RateLimiter:
+    """요청 시작 간격 제한 (스레드 공용)"""
+    
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+def iter_xml_items(source: BinaryIO, meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    XML 응답 스트리밍 파싱 (<item> 이 닫힐 때마다 반환)
+    
+    Args:
+        source: 바이너리 파일 객체 (응답 스트림 등)
+        meta: totalCount / resultCode / resultMsg 를 기록할 dict
+    """
+    meta = meta if meta is not None else {}
+    # 공공데이터포털 XML 구조: <response><header/><body><items><item>...</item></items><totalCount/></body></response>
+    for _event, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag == "item":
+            yield {child.tag: child.text for child in elem}
+            elem.clear()
+        elif elem.tag in ("totalCount", "resultCode", "resultMsg"):
+            meta[elem.tag] = elem.text
+
 def parse_xml_response(xml_text: str) -> List[Dict[str, Any]]:
     """XML 응답 파싱"""
     try:
-        root = ET.fromstring(xml_text)
-        items = []
-        
-        # 공공데이터포털 XML 구조에 맞게 파싱
-        # 일반적으로 <items><item>...</item></items> 구조
-        for item in root.findall('.//item'):
-            item_dict = {}
-            for child in item:
-                item_dict[child.tag] = child.text
-            items.append(item_dict)
-        
-        return items
-        
+        return list(iter_xml_items(io.BytesIO(xml_text.encode("utf-8"))))
     except ET.ParseError as e:
         logger.error(f"XML 파싱 오류: {e}")
         return []
@@ -69,48 +109,175 @@ def parse_xml_response(xml_text: str) -> List[Dict[str, Any]]:
         logger.error(f"XML 처리 오류: {e}")
         return []
 
-def fetch_public_data(api_name: str, api_key: str) -> List[Dict[str, Any]]:
+def _json_items(data: Dict[str, Any], meta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    body = data.get('response', {}).get('body', {})
+    meta["totalCount"] = body.get('totalCount')
+    items = body.get('items') or data.get('items') or []
+    if isinstance(items, dict):
+        # {"items": {"item": [...]}} 형태 (건수 1개면 dict)
+        items = items.get('item', [])
+    return [items] if isinstance(items, dict) else items
+
+def iter_public_page(
+    api_name: str,
+    api_key: str,
+    page_no: int,
+    num_of_rows: int,
+    limiter: RateLimiter,
+    meta: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    """API 한 페이지 스트리밍 수집 (totalCount 등은 meta에 기록)"""
+    api_info = PUBLIC_DATA_APIS[api_name]
+    api_url = api_info["api_url_template"].format(api_key=api_key, page_no=page_no, num_of_rows=num_of_rows)
+    
+    limiter.wait()
+    with requests.get(api_url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        if api_info["format"] == "xml":
+            response.raw.decode_content = True
+            yield from iter_xml_items(response.raw, meta)
+        else:
+            # JSON 형식
+            yield from _json_items(response.json(), meta)
+
+def _fetch_page(
+    api_name: str,
+    api_key: str,
+    page_no: int,
+    num_of_rows: int,
+    limiter: RateLimiter,
+    meta: Optional[Dict[str, Any]] = None
+) -> Optional[List[Dict[str, Any]]]:
     """
-    공공데이터포털 API에서 데이터 수집
+    페이지 1개 수집 (실패하면 지수 백오프로 재시도)
     
-    Args:
-        api_name: API 이름 (PUBLIC_DATA_APIS의 키)
-        api_key: 공공데이터포털 API 키
+    요청/파싱 오류와 resultCode 가 "00" 이 아닌 응답(호출 한도 초과 등)을 실패로 봅니다.
+    재시도를 다 써도 실패하면 None 을 반환합니다 (빈 페이지 [] 와 구분).
+    """
+    meta = meta if meta is not None else {}
+    error = ""
+    for attempt in range(PUBLIC_DATA_PAGE_RETRIES + 1):
+        meta.pop("resultCode", None)
+        meta.pop("resultMsg", None)
+        try:
+            items = list(iter_public_page(api_name, api_key, page_no, num_of_rows, limiter, meta))
+            if meta.get("resultCode") in (None, "00"):
+                return items
+            error = f"API 응답 오류 {meta.get('resultCode')} {meta.get('resultMsg') or ''}".strip()
+        except (requests.exceptions.RequestException, ET.ParseError, ValueError) as e:
+            error = str(e)
+        if attempt < PUBLIC_DATA_PAGE_RETRIES:
+            delay = PUBLIC_DATA_RETRY_BACKOFF * 2 ** attempt
+            logger.warning(f"⚠️ 페이지 수집 실패 ({api_name} {page_no}페이지): {error}, {delay:.0f}초 후 재시도 ({attempt + 1}/{PUBLIC_DATA_PAGE_RETRIES})")
+            time.sleep(delay)
+    logger.error(f"❌ 페이지 수집 실패 ({api_name} {page_no}페이지, 재시도 {PUBLIC_DATA_PAGE_RETRIES}회 후): {error}")
+    return None
+
+def _fetch_numbered_page(api_name: str, api_key: str, page_no: int, num_of_rows: int,
+                         limiter: RateLimiter) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+    return page_no, _fetch_page(api_name, api_key, page_no, num_of_rows, limiter)
+
+def iter_public_data(
+    api_name: str,
+    api_key: str,
+    num_of_rows: int = PUBLIC_DATA_ROWS_PER_PAGE,
+    concurrency: int = PUBLIC_DATA_CONCURRENCY,
+    rate_limit: float = PUBLIC_DATA_RATE_LIMIT,
+    stats: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    공공데이터포털 API 전체 페이지 수집 (항목을 하나씩 반환)
     
-    Returns:
-        수집된 데이터 리스트
+    1페이지로 totalCount를 확인한 뒤, 나머지 페이지를
+    rate_limit(초당 요청 수) 안에서 concurrency개씩 동시에 가져옵니다.
+    메모리에는 진행 중인 페이지(최대 concurrency × 2개)만 올라갑니다.
+    
+    Args:
+        stats: totalCount / collected / failedPages(재시도 후에도 실패한 페이지 번호)를 기록할 dict
     """
+    stats = stats if stats is not None else {}
+    stats.update({"totalCount": None, "collected": 0, "failedPages": []})
     if api_name not in PUBLIC_DATA_APIS:
         logger.error(f"알 수 없는 API: {api_name}")
-        return []
+        return
     
     api_info = PUBLIC_DATA_APIS[api_name]
-    api_url = api_info["api_url_template"].format(api_key=api_key)
+    limiter = RateLimiter(rate_limit)
+    meta: Dict[str, Any] = {}
     
     logger.info(f"공공데이터 수집 시작: {api_info['name']}")
     
+    first_page = _fetch_page(api_name, api_key, 1, num_of_rows, limiter, meta)
+    if first_page is None:
+        stats["failedPages"].append(1)
+        return
+    stats["collected"] = len(first_page)
+    yield from first_page
+    
     try:
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        
-        if api_info["format"] == "xml":
-            items = parse_xml_response(response.text)
-        else:
-            # JSON 형식
-            data = response.json()
-            items = data.get('response', {}).get('body', {}).get('items', [])
-            if not items:
-                items = data.get('items', [])
-        
-        logger.info(f"✅ {len(items)}개 항목 수집 완료")
-        return items
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ API 요청 실패: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"❌ 데이터 수집 실패: {e}")
-        return []
+        total_count = int(meta.get("totalCount") or 0)
+    except (TypeError, ValueError):
+        total_count = 0
+    stats["totalCount"] = total_count or None
+    
+    collected = len(first_page)
+    if total_count:
+        pages = iter(range(2, math.ceil(total_count / num_of_rows) + 1))
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            # 진행 중인 페이지 수를 제한해 메모리 사용량을 일정하게 유지
+            pending = set()
+            for page_no in itertools.islice(pages, max(1, concurrency) * 2):
+                pending.add(executor.submit(_fetch_numbered_page, api_name, api_key, page_no, num_of_rows, limiter))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_no, page_items = future.result()
+                    if page_items is None:
+                        stats["failedPages"].append(page_no)
+                        page_items = []
+                    collected += len(page_items)
+                    stats["collected"] = collected
+                    yield from page_items
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.add(executor.submit(_fetch_numbered_page, api_name, api_key, next_page, num_of_rows, limiter))
+    elif len(first_page) >= num_of_rows:
+        # totalCount가 없는 API: 덜 찬 페이지가 나올 때까지 순차 수집
+        # (실패한 페이지는 기록하고 건너뜀, 연속으로 실패하면 중단)
+        page_no = 2
+        consecutive_failures = 0
+        while consecutive_failures < PUBLIC_DATA_MAX_CONSECUTIVE_FAILURES:
+            page_items = _fetch_page(api_name, api_key, page_no, num_of_rows, limiter)
+            if page_items is None:
+                stats["failedPages"].append(page_no)
+                consecutive_failures += 1
+                page_no += 1
+                continue
+            consecutive_failures = 0
+            collected += len(page_items)
+            stats["collected"] = collected
+            yield from page_items
+            if len(page_items) < num_of_rows:
+                break
+            page_no += 1
+    
+    stats["failedPages"].sort()
+    logger.info(f"✅ {collected}개 항목 수집 완료" + (f" (totalCount {total_count})" if total_count else ""))
+    if stats["failedPages"] or (total_count and collected < total_count):
+        logger.warning(f"⚠️ 누락: 실패 페이지 {stats['failedPages']}, 수집 {collected}/{total_count or '?'}개")
+
+def fetch_public_data(api_name: str, api_key: str) -> List[Dict[str, Any]]:
+    """
+    공공데이터포털 API에서 데이터 수집
+    
+    Args:
+        api_name: API 이름 (PUBLIC_DATA_APIS의 키)
+        api_key: 공공데이터포털 API 키
+    
+    Returns:
+        수집된 데이터 리스트 (대용량은 iter_public_data 사용)
+    """
+    return list(iter_public_data(api_name, api_key))
 
 def convert_to_learning_content(item: Dict[str, Any], api_name: str) -> Dict[str, Any]:
     """공공데이터를 학습 콘텐츠 형식으로 변환"""
@@ -134,24 +301,10 @@ def convert_to_learning_content(item: Dict[str, Any], api_name: str) -> Dict[str
         "updatedAt": datetime.now().isoformat()
     }
 
-def save_to_api(content_data: Dict[str, Any]) -> bool:
-    """수집한 데이터를 VPS API에 저장"""
-    try:
-        response = requests.post(
-            f"{API_BASE}/api/v1/learning/store",
-            json=content_data,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            return True
-        else:
-            logger.warning(f"⚠️ API 저장 실패: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"❌ API 저장 오류: {e}")
-        return False
+def iter_public_contents(api_name: str, api_key: str, meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """공공데이터 API 1개를 학습 콘텐츠로 변환 (임포트 샤드 로더, 수집 통계는 meta 에 기록)"""
+    for item in iter_public_data(api_name, api_key, stats=meta):
+        yield convert_to_learning_content(item, api_name)
 
 def main():
     """메인 함수"""
@@ -163,7 +316,6 @@ def main():
     api_key = None
     
     # 환경 변수에서 API 키 로드 시도
-    import os
     api_key = os.getenv('PUBLIC_DATA_API_KEY')
     
     if not api_key:
@@ -189,22 +341,20 @@ def main():
     if not api_key:
         return
     
-    total_saved = 0
-    
-    # 각 API에서 데이터 수집
-    for api_name, api_info in PUBLIC_DATA_APIS.items():
-        logger.info(f"\n📊 {api_info['name']} 수집 시작...")
-        
-        items = fetch_public_data(api_name, api_key)
-        
-        for item in items:
-            content_data = convert_to_learning_content(item, api_name)
-            
-            if save_to_api(content_data):
-                total_saved += 1
+    # 각 API에서 데이터 수집 (API별 샤드)
+    shards = [
+        ImportShard(api_name, iter_public_contents, (api_name, api_key), reports_meta=True)
+        for api_name in PUBLIC_DATA_APIS
+    ]
+    report = run_import("public_data", shards, API_BASE)
     
     logger.info("\n" + "=" * 60)
-    logger.info(f"✅ 공공데이터 수집 완료: {total_saved}개 항목 저장")
+    logger.info(f"✅ 공공데이터 수집 완료: {report['saved']}개 항목 저장 ({report['itemsPerSecond']}개/s)")
+    for result in report["shardResults"]:
+        meta = result.get("sourceMeta") or {}
+        if meta.get("failedPages"):
+            logger.warning(f"⚠️ {result['name']}: 실패 페이지 {meta['failedPages']} "
+                           f"(수집 {meta.get('collected')}/{meta.get('totalCount') or '?'}개, 리포트 참고)")
     logger.info("=" * 60)
 
 if __name__ == "__main__":
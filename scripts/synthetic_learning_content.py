@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성 학습 콘텐츠 생성기 (벤치마크/부하 테스트용)
+
+실제 임포터 출력과 비슷한 필드 구성의 콘텐츠를 시드 고정으로 생성합니다.
+
+- generic: 과목/학년/체질이 섞인 일반 콘텐츠
+- ebs: import_ebs_content.py 출력 형식 (학년/단원/섹션 구조, "중1 단원 - 섹션" 주제)
+- generated: athena_generator.py 가 저장하는 생성 문제 형식 (learning-content/generated-problems)
+- mixed: ebs 와 generated 를 반씩
+
+사용 예:
+    python scripts/synthetic_learning_content.py 1000 -o synthetic.json
+    python scripts/synthetic_learning_content.py 1000 --shape mixed -o corpus.json
+"""
+
+import sys
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator
+
+# 과목별 주제어
+TOPIC_WORDS = {
+    "math": ["소인수분해", "정수와 유리수", "일차방정식", "연립방정식", "이차함수", "제곱근", "확률", "삼각비", "다항식", "인수분해"],
+    "english": ["인사 표현", "과거형", "현재완료", "관계대명사", "to부정사", "동명사", "수동태", "가정법", "Grammar", "Vocabulary"],
+}
+FILLER_WORDS = ["개념", "예제", "풀이", "정리", "활용", "문제", "그래프", "공식", "표현", "문장", "reading", "practice"]
+GRADES = ["중1", "중2", "중3", "고1", "고2"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+CONSTITUTIONS = ["태양인", "태음인", "소양인", "소음인"]
+
+SHAPES = ["generic", "ebs", "generated", "mixed"]
+# EBS 섹션 제목/생성 문제 문장 조각
+SECTION_WORDS = ["개념 이해", "기본 예제", "유형 연습", "활용", "심화 문제", "단원 정리"]
+PROBLEM_TEMPLATES = {
+    "math": ["다음 {topic} 문제를 풀어라.", "{topic}의 성질을 이용하여 값을 구하시오.", "그래프를 보고 {topic}에 대해 설명하시오."],
+    "english": ["Choose the sentence that uses {topic} correctly.", "다음 글을 읽고 {topic}에 맞게 고쳐 쓰시오.", "빈칸에 들어갈 알맞은 {topic} 표현은?"],
+}
+
+def _body(rng: random.Random, subject: str, low: int, high: int) -> str:
+    return " ".join(rng.choices(TOPIC_WORDS[subject] + FILLER_WORDS, k=rng.randint(low, high)))
+
+def _ebs_item(rng: random.Random, i: int) -> Dict[str, Any]:
+    subject = rng.choice(list(TOPIC_WORDS))
+    grade = rng.choice(GRADES)
+    chapter = rng.randrange(len(TOPIC_WORDS[subject]))
+    chapter_title = TOPIC_WORDS[subject][chapter]
+    section = rng.randint(1, 12)
+    section_title = f"{chapter_title} {rng.choice(SECTION_WORDS)} {i}"
+    return {
+        "subject": subject,
+        "topic": f"{grade} {chapter_title} - {section_title}",
+        "content": _body(rng, subject, 40, 200),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "ebsCurriculum": f"EBS {grade} {subject}",
+        "keyTopics": [chapter_title] + rng.sample(FILLER_WORDS, 2),
+        "grade": grade,
+        "chapter": chapter + 1,
+        "chapterTitle": chapter_title,
+        "section": section,
+        "sectionTitle": section_title,
+    }
+
+def _generated_item(rng: random.Random, i: int) -> Dict[str, Any]:
+    subject = rng.choice(list(TOPIC_WORDS))
+    topic = rng.choice(TOPIC_WORDS[subject])
+    created_at = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00"
+    problem = rng.choice(PROBLEM_TEMPLATES[subject]).format(topic=topic)
+    return {
+        "subject": subject,
+        "topic": f"{topic} {i}",
+        "content": f"{problem}\n{_body(rng, subject, 10, 60)}",
+        "difficulty": rng.choice(DIFFICULTIES),
+        "ebsCurriculum": "Athena Generator",
+        "keyTopics": [topic] + rng.sample(FILLER_WORDS, 1),
+        "vector_4d": {"S": 0.25, "L": round(rng.random(), 3), "K": round(rng.random(), 3), "M": 0.25},
+        "constitution": rng.choice(CONSTITUTIONS),
+        "createdAt": created_at,
+        "updatedAt": created_at,
+    }
+
+def iter_synthetic_items(count: int, seed: int = 42, shape: str = "generic") -> Iterator[Dict[str, Any]]:
+    if shape not in SHAPES:
+        raise ValueError(f"알 수 없는 형식: {shape} ({', '.join(SHAPES)})")
+    rng = random.Random(seed)
+    if shape != "generic":
+        for i in range(count):
+            ebs = shape == "ebs" or (shape == "mixed" and i % 2 == 0)
+            yield _ebs_item(rng, i) if ebs else _generated_item(rng, i)
+        return
+    for i in range(count):
+        subject = rng.choice(list(TOPIC_WORDS))
+        topic = rng.choice(TOPIC_WORDS[subject])
+        grade = rng.choice(GRADES)
+        body = " ".join(rng.choices(TOPIC_WORDS[subject] + FILLER_WORDS, k=rng.randint(20, 120)))
+        yield {
+            "subject": subject,
+            "topic": f"{topic} {i}",
+            "content": body,
+            "difficulty": rng.choice(DIFFICULTIES),
+            "grade": grade,
+            "ebsCurriculum": f"EBS {grade} {subject}",
+            "keyTopics": [topic] + rng.sample(FILLER_WORDS, 2),
+            "vector_4d": {field: round(rng.random(), 3) for field in ("S", "L", "K", "M")},
+            "constitution": rng.choice(CONSTITUTIONS),
+            "source": "synthetic",
+        }
+
+def synthetic_items(count: int, seed: int = 42, shape: str = "generic") -> List[Dict[str, Any]]:
+    return list(iter_synthetic_items(count, seed, shape))
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="합성 학습 콘텐츠 생성")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--shape", choices=SHAPES, default="generic", help="콘텐츠 형식")
+    parser.add_argument("-o", "--output", type=Path, help="출력 JSON 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(synthetic_items(args.count, args.seed, args.shape), ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,12 +9,17 @@ File-Based Memory System에 저장합니다.
 
 import sys
 import json
+import argparse
 import requests
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 import logging
 
+# 백엔드 공용 모듈 (압축 포맷)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from content_format import PACKED_SUFFIX, write_packed_content
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -59,8 +64,8 @@ def vectorize_content(content: str, subject: str, topic: str) -> Dict[str, float
         logger.error(f"벡터화 오류: {e}, 기본값 사용")
         return {"S": 0.25, "L": 0.25, "K": 0.25, "M": 0.25}
 
-def process_learning_content(content_file: Path):
-    """학습 콘텐츠 파일을 벡터화하여 저장"""
+def process_learning_content(content_file: Path, output_format: str = "json"):
+    """학습 콘텐츠 파일을 벡터화하여 저장 (output_format: json 또는 packed)"""
     logger.info(f"학습 콘텐츠 벡터화 시작: {content_file}")
     
     # 파일 읽기
@@ -91,9 +96,13 @@ def process_learning_content(content_file: Path):
             logger.error(f"❌ 벡터화 실패: {item.get('topic', 'Unknown')} - {e}")
     
     # 벡터화된 데이터 저장
-    output_file = content_file.parent / f"{content_file.stem}_vectorized.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(contents, f, ensure_ascii=False, indent=2)
+    if output_format == "packed":
+        output_file = content_file.parent / f"{content_file.stem}_vectorized{PACKED_SUFFIX}"
+        write_packed_content(contents, output_file)
+    else:
+        output_file = content_file.parent / f"{content_file.stem}_vectorized.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(contents, f, ensure_ascii=False, indent=2)
     
     logger.info(f"벡터화 완료: 성공 {vectorized_count}개, 실패 {error_count}개")
     logger.info(f"출력 파일: {output_file}")
@@ -102,10 +111,18 @@ def process_learning_content(content_file: Path):
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="학습 콘텐츠 4D 벡터화")
+    parser.add_argument("content_dir", nargs="?", type=Path,
+                        default=Path("C:/workspace/projects/mkm/mkm-study20260120/learning-content"),
+                        help="학습 콘텐츠 JSON 디렉토리")
+    parser.add_argument("--format", choices=["json", "packed"], default="json",
+                        help="출력 포맷 (packed: .mkmc 압축 바이너리)")
+    args = parser.parse_args()
+    
     logger.info("학습 콘텐츠 벡터화 시작")
     
-    # 학습 콘텐츠 파일 경로 (예시)
-    content_dir = Path("C:/workspace/projects/mkm/mkm-study20260120/learning-content")
+    # 학습 콘텐츠 파일 경로
+    content_dir = args.content_dir
     content_dir.mkdir(parents=True, exist_ok=True)
     
     # 모든 JSON 파일 처리
@@ -123,7 +140,7 @@ def main():
         if "_vectorized" in json_file.name:
             continue  # 이미 벡터화된 파일은 스킵
         
-        vectorized, errors = process_learning_content(json_file)
+        vectorized, errors = process_learning_content(json_file, args.format)
         total_vectorized += vectorized
         total_errors += errors
     